@@ -0,0 +1,49 @@
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.agent.base_agent import AIAgent
+from src.models.client_pool import ClientPool
+from src.models.fake_llm import FakeChatNVIDIA
+from src.models.llm_model import LLMModel
+
+UPSTREAM_LATENCY = 0.05  # Seconds per request injected by the fake backend
+
+def make_agent(max_concurrency: int) -> AIAgent:
+    client = FakeChatNVIDIA("Hello from the fake backend.", UPSTREAM_LATENCY, 0.0)
+    return AIAgent(LLMModel(client=client, pool=ClientPool(max_concurrency)))
+
+def run_sync(agent: AIAgent, n: int) -> float:
+    """n worker threads handling one request each, all at once"""
+    with ThreadPoolExecutor(n) as pool:
+        start = time.perf_counter()
+        list(pool.map(lambda i: agent.process(f"question {i}"), range(n)))
+    return time.perf_counter() - start
+
+async def run_async(agent: AIAgent, n: int) -> float:
+    """One event loop handling n requests concurrently"""
+    start = time.perf_counter()
+    await asyncio.gather(*(agent.aprocess(f"question {i}") for i in range(n)))
+    return time.perf_counter() - start
+
+def main():
+    print(f"Upstream latency: {UPSTREAM_LATENCY * 1000:.0f} ms")
+    print(f"{'concurrent':>10} {'threads req/s':>14} {'async req/s':>12} {'speedup':>8}")
+    # The first request loads models; keep that out of the timings
+    make_agent(max_concurrency=1).process("warm up")
+    for n in [1, 10, 100]:
+        agent = make_agent(max_concurrency=100)
+        sync_elapsed = run_sync(agent, n)
+        async_elapsed = asyncio.run(run_async(agent, n))
+        sync_rps = n / sync_elapsed
+        async_rps = n / async_elapsed
+        print(f"{n:>10} {sync_rps:>14.1f} {async_rps:>12.1f} {async_rps / sync_rps:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
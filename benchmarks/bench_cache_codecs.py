@@ -0,0 +1,81 @@
+import argparse
+import pickle
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.codecs import Codec, msgpack
+
+def payloads(dim: int):
+    rng = np.random.default_rng(0)
+    return {
+        "response str": "Sure! Here are three ideas for a weekend trip near Lisbon: Sintra, Cascais and Evora. " * 4,
+        "context turns": [
+            {"input": f"Question {i} about the quarterly budget?", "response": f"Here is what I found about item {i}. " * 10}
+            for i in range(5)
+        ],
+        "tool result": {
+            "query": "electric cars", "results": [
+                {"title": f"Result {i}", "url": f"https://example.com/{i}", "content": f"Battery prices fell again in region {i}. " * 8}
+                for i in range(5)
+            ]
+        },
+        f"embedding {dim}": rng.standard_normal(dim).astype(np.float32).tolist(),
+        f"embeddings 32x{dim}": rng.standard_normal((32, dim)).astype(np.float32).tolist(),
+        f"ndarray 32x{dim}": rng.standard_normal((32, dim)).astype(np.float32)  # Decoded zero-copy
+    }
+
+def round_trips(value, decoded, label: str) -> bool:
+    """Exact for structured values; vectors within float16 rounding for the f16 codec"""
+    vector = isinstance(value, np.ndarray) or (isinstance(value, list) and isinstance(value[0], (float, list)))
+    if vector and label.endswith("f16"):
+        return np.allclose(value, decoded, rtol=1e-3, atol=1e-3)
+    if vector:
+        return np.array_equal(value, decoded)
+    return decoded == value
+
+def timed(fn, value, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(value)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Encode/decode time and stored bytes per cache codec")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    codecs = {"pickle": None, "codec": Codec(compression="none", vector_dtype="float32")}
+    codecs["codec f16"] = Codec(compression="none", vector_dtype="float16")
+    for compression in ["zstd", "lz4"]:
+        codec = Codec(compression=compression, vector_dtype="float32", compress_min_bytes=256)
+        if codec._compressor is not None:
+            codecs[f"codec+{compression}"] = codec
+
+    print(f"Structured values use {'msgpack' if msgpack else 'JSON (msgpack not installed)'}")
+    print(f"{'payload':<18} {'codec':<12} {'bytes':>8} {'encode us':>10} {'decode us':>10}")
+    for name, value in payloads(args.dim).items():
+        for label, codec in codecs.items():
+            if codec is None:
+                encode = lambda v: pickle.dumps(v)
+                decode = pickle.loads
+            else:
+                # Lists of floats only take the vector format when asked to
+                encode = lambda v, codec=codec: codec.encode(v, vector=name.startswith("embedding"))
+                decode = codec.decode
+            data = encode(value)
+            decoded = decode(data)
+            assert round_trips(value, decoded, label), f"{label} changed the {name} payload"
+            print(f"{name:<18} {label:<12} {len(data):>8} {timed(encode, value, args.repeat):>10.1f} "
+                  f"{timed(decode, data, args.repeat):>10.1f}")
+        print()
+
+if __name__ == "__main__":
+    main()
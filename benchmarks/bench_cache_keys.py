@@ -0,0 +1,77 @@
+import argparse
+import hashlib
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.cache import CacheManager, cached
+from src.utils.cache_keys import canonical_key
+
+def md5_of_str(prefix, data):
+    """The previous CacheManager.generate_key"""
+    return f"{prefix}:{hashlib.md5(str(data).encode()).hexdigest()}"
+
+def contexts(turns: int, dim: int):
+    rng = np.random.default_rng(0)
+    memory = [
+        (f"question {i} about the quarterly budget and next steps", f"Here is what I found about item {i}. " * 6)
+        for i in range(turns)
+    ]
+    return {
+        "response key": {"model": "mixtral-8x7b-instruct-v0.1", "temperature": 0.7,
+                         "input": "what did we decide about the budget?", "memory": memory[-5:]},
+        "email context": {"intent": "request", "topic": "day off", "recipient_name": "Dana",
+                          "sender_name": "Sam", "content": "Could I take next Friday off? " * 5,
+                          "priority": "normal", "category": "hr"},
+        f"{turns}-turn context": {"user": "sam", "memory": memory, "tools": {"web_search": ["a", "b"]},
+                                  "session": {"started": 1700000000.0, "locale": "en-US"}},
+        f"embedding list {dim}": {"texts": "hello", "vector": rng.standard_normal(dim).tolist()},
+        f"embedding ndarray {dim}": {"texts": "hello", "vector": rng.standard_normal(dim).astype(np.float32)}
+    }
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of deriving cache keys from realistic contexts")
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'context':<22} {'md5(str) us':>12} {'canonical us':>13} {'allow-list us':>14} {'order-stable':>13}")
+    for name, data in contexts(args.turns, args.dim).items():
+        reordered = dict(reversed(list(data.items())))
+        fields = list(data)[:2]
+        stable = canonical_key("k", data) == canonical_key("k", reordered)
+        print(f"{name:<22} {timed(lambda: md5_of_str('k', data), args.repeat):>12.1f} "
+              f"{timed(lambda: canonical_key('k', data), args.repeat):>13.1f} "
+              f"{timed(lambda: canonical_key('k', data, fields), args.repeat):>14.1f} {str(stable):>13}")
+        assert stable, f"{name}: key depends on dict order"
+
+    import fakeredis
+    cache = CacheManager(redis_client=fakeredis.FakeRedis(), invalidation=False)
+    calls = []
+
+    @cached(ttl=60, cache=cache)
+    def lookup(query, context):
+        calls.append(query)
+        return {"answer": query.upper()}
+
+    context = {"tier": "premium", "locale": "en-US"}
+    print(f"\n@cached call, miss then hits: {timed(lambda: lookup('hello', context), args.repeat):.1f} us/call, "
+          f"{len(calls)} real call(s)")
+    lookup("hello", {"locale": "en-US", "tier": "premium"})
+    print(f"Same context in another key order hit the cache: {len(calls) == 1}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.cache import CacheManager
+
+class CountingRedis:
+    """
+    Counts round trips to the server (one per command, one per pipeline
+    execute) and adds a simulated network RTT to each
+    """
+    def __init__(self, client, rtt: float):
+        self.client = client
+        self.rtt = rtt
+        self.round_trips = 0
+
+    def _trip(self):
+        self.round_trips += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+
+    def pipeline(self, *args, **kwargs):
+        pipe = self.client.pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        def counted_execute(*a, **kw):
+            self._trip()
+            return execute(*a, **kw)
+        pipe.execute = counted_execute
+        return pipe
+
+    def scan_iter(self, *args, **kwargs):
+        # Every SCAN page is a round trip; approximate with one per call
+        self._trip()
+        return self.client.scan_iter(*args, **kwargs)
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            self._trip()
+            return attr(*args, **kwargs)
+        return call
+
+def request_keys(request: int, turns: int, embeddings: int, tools: int):
+    """Keys one chat request touches: conversation context, embeddings and tool results"""
+    return (
+        [f"context:{request % 50}:{i}" for i in range(turns)]
+        + [f"embedding:{(request * 7 + i) % 400}" for i in range(embeddings)]
+        + [f"tool:{(request + i) % 30}" for i in range(tools)]
+    )
+
+def one_by_one(cache: CacheManager, keys):
+    found = {key: cache.get(key) for key in keys}
+    for key, value in found.items():
+        if value is None:
+            cache.set(key, {"value": key}, expire_in=600)
+
+def batched(cache: CacheManager, keys):
+    found = cache.get_many(keys)
+    cache.set_many({key: {"value": key} for key in keys if key not in found}, expire_in=600)
+
+def main():
+    parser = argparse.ArgumentParser(description="Redis round trips per request: single-key calls vs MGET/pipelines")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--embeddings", type=int, default=20)
+    parser.add_argument("--tools", type=int, default=3)
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="Simulated network round trip")
+    args = parser.parse_args()
+    import fakeredis
+
+    print(f"{args.requests} requests, each reading {args.turns} context turns, {args.embeddings} embeddings "
+          f"and {args.tools} tool results ({args.rtt_ms} ms RTT, local tier off)")
+    print(f"{'mode':<12} {'round trips/req':>16} {'ms/req':>8}")
+    for label, handler in [("one by one", one_by_one), ("batched", batched)]:
+        client = CountingRedis(fakeredis.FakeRedis(), args.rtt_ms / 1000)
+        cache = CacheManager(redis_client=client, local_entries=0)
+        start = time.perf_counter()
+        for request in range(args.requests):
+            handler(cache, request_keys(request, args.turns, args.embeddings, args.tools))
+        elapsed = time.perf_counter() - start
+        print(f"{label:<12} {client.round_trips / args.requests:>16.1f} {elapsed * 1000 / args.requests:>8.2f}")
+
+    client = CountingRedis(fakeredis.FakeRedis(), 0)
+    cache = CacheManager(redis_client=client, local_entries=0)
+    cache.set_many({f"context:{i}": i for i in range(2000)})
+    cache.set("contextual", 1)
+    client.round_trips = 0
+    deleted = cache.delete_prefix("context:")
+    print(f"\ndelete_prefix('context:') removed {deleted} keys in ~{client.round_trips} round trips; "
+          f"'contextual' kept: {cache.get('contextual') == 1}")
+
+if __name__ == "__main__":
+    main()
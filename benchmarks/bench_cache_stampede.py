@@ -0,0 +1,108 @@
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.config.settings import CACHE_CONFIG
+from src.utils.cache import CacheManager
+from src.utils.codecs import CacheEntry
+
+class Upstream:
+    """An expensive call (LLM answer, web search) that counts how often it runs"""
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return {"answer": "the popular answer", "generated_at": time.time()}
+
+def naive(cache: CacheManager, key: str, upstream: Upstream, ttl: int):
+    """Plain read-through: every concurrent miss calls the upstream"""
+    value = cache.get(key)
+    if value is None:
+        value = upstream()
+        cache.set(key, value, expire_in=ttl)
+    return value
+
+def stampede(nodes, requests: int, call) -> tuple:
+    """Fire requests concurrently, spread over the nodes; returns latency percentiles in ms"""
+    barrier = threading.Barrier(requests)
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(i):
+        node = nodes[i % len(nodes)]
+        barrier.wait()
+        start = time.perf_counter()
+        call(node)
+        with lock:
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(requests)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+def main():
+    parser = argparse.ArgumentParser(description="Upstream calls when concurrent requests hit an expired hot key")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--nodes", type=int, default=4, help="Simulated processes sharing one Redis")
+    parser.add_argument("--latency", type=float, default=0.5, help="Upstream call time in seconds")
+    parser.add_argument("--redis-url", help="Use a real server instead of fakeredis")
+    args = parser.parse_args()
+
+    if args.redis_url:
+        import redis
+        new_client = lambda: redis.Redis.from_url(args.redis_url)
+    else:
+        import fakeredis
+        server = fakeredis.FakeServer()
+        new_client = lambda: fakeredis.FakeRedis(server=server)
+
+    ttl, key = 60, "hot:answer"
+    print(f"{args.requests} concurrent requests over {args.nodes} nodes for an expired key, "
+          f"{args.latency * 1000:.0f} ms upstream")
+    print(f"{'strategy':<36} {'upstream calls':>15} {'p50 ms':>8} {'p99 ms':>8}")
+
+    def run(label, setup, call, lease_ttl=30.0):
+        CACHE_CONFIG["lease_ttl"] = lease_ttl
+        client = new_client()
+        client.flushdb()
+        nodes = [CacheManager(redis_client=new_client(), invalidation=False) for _ in range(args.nodes)]
+        upstream = Upstream(args.latency)
+        setup(nodes[0], upstream)
+        upstream.calls = 0
+        p50, p99 = stampede(nodes, args.requests, lambda node: call(node, upstream))
+        time.sleep(args.latency * 2)  # Let background refreshes land
+        print(f"{label:<36} {upstream.calls:>15} {p50:>8.1f} {p99:>8.1f}")
+        return nodes
+
+    nothing = lambda node, upstream: None
+    run("read-through, no protection", nothing, lambda node, up: naive(node, key, up, ttl))
+    run("single-flight per process", nothing,
+        lambda node, up: node.get_or_compute(key, up, ttl, stale_ttl=0), lease_ttl=0)
+    run("single-flight + Redis lease", nothing,
+        lambda node, up: node.get_or_compute(key, up, ttl, stale_ttl=0))
+
+    def expired(node, upstream):
+        # Written two seconds ago with a one-second TTL, inside a 30 s grace period
+        node.set(key, CacheEntry(upstream(), args.latency, time.time() - 1), expire_in=30)
+    nodes = run("stale-while-revalidate", expired,
+                lambda node, up: node.get_or_compute(key, up, ttl, stale_ttl=30))
+    print(f"\nRecompute stats on one node after the stale run: {nodes[0].stats()['recompute']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.cache import CacheManager
+
+class SlowRedis:
+    """Adds a fixed round-trip time to every command, like a Redis across the network"""
+    def __init__(self, client, rtt: float):
+        self.client = client
+        self.rtt = rtt
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if not callable(attr) or name == "pubsub":
+            return attr
+
+        def call(*args, **kwargs):
+            time.sleep(self.rtt)
+            return attr(*args, **kwargs)
+        return call
+
+def make_clients(args):
+    """Independent clients on one server, one per simulated process"""
+    if args.redis_url:
+        import redis
+        make = lambda: redis.Redis.from_url(args.redis_url)
+    else:
+        import fakeredis
+        server = fakeredis.FakeServer()
+        make = lambda: fakeredis.FakeRedis(server=server)
+    return lambda: SlowRedis(make(), args.rtt_ms / 1000) if args.rtt_ms else make()
+
+def run(cache: CacheManager, keys, reads: int, write_every: int):
+    """Zipf-distributed reads with an occasional write; returns ops/s and read latency percentiles"""
+    latencies = []
+    start = time.perf_counter()
+    for i, key in enumerate(keys[:reads]):
+        if write_every and i % write_every == 0:
+            cache.set(key, {"response": f"updated {i}", "tokens": list(range(50))}, expire_in=600)
+            continue
+        t = time.perf_counter()
+        cache.get(key)
+        latencies.append((time.perf_counter() - t) * 1e6)
+    elapsed = time.perf_counter() - start
+    return reads / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+def check_coherence(new_client) -> bool:
+    """A write on one node must reach another node's local tier through pub/sub"""
+    a = CacheManager(redis_client=new_client(), invalidation=True, local_ttl=600)
+    b = CacheManager(redis_client=new_client(), invalidation=True, local_ttl=600)
+    try:
+        a.set("coherence", "v1")
+        assert b.get("coherence") == "v1"  # Now cached in b's local tier
+        a.set("coherence", "v2")
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if b.get("coherence") == "v2":
+                return True
+            time.sleep(0.01)
+        return False
+    finally:
+        a.close()
+        b.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="CacheManager with and without the in-process LRU tier")
+    parser.add_argument("--redis-url", help="Benchmark a real server instead of fakeredis")
+    parser.add_argument("--rtt-ms", type=float, default=0.2, help="Simulated network round trip per command")
+    parser.add_argument("--keys", type=int, default=5000)
+    parser.add_argument("--reads", type=int, default=20000)
+    parser.add_argument("--zipf", type=float, default=1.2, help="Key popularity skew")
+    parser.add_argument("--write-every", type=int, default=50, help="One write per this many operations")
+    parser.add_argument("--local-entries", type=int, default=1000)
+    args = parser.parse_args()
+
+    new_client = make_clients(args)
+    rng = np.random.default_rng(0)
+    keys = [f"bench:{k % args.keys}" for k in rng.zipf(args.zipf, args.reads)]
+    loader = CacheManager(redis_client=new_client(), local_entries=0)
+    for k in range(args.keys):
+        loader.set(f"bench:{k}", {"response": f"value {k}", "tokens": list(range(50))}, expire_in=600)
+
+    print(f"{args.reads} operations over {args.keys} keys (zipf {args.zipf}), "
+          f"{args.rtt_ms} ms simulated RTT, 1 write per {args.write_every}")
+    print(f"{'tiers':<22} {'ops/s':>9} {'get p50 us':>11} {'get p99 us':>11} {'local hit':>10}")
+    for label, entries in [("redis only", 0), (f"local {args.local_entries} + redis", args.local_entries)]:
+        cache = CacheManager(redis_client=new_client(), local_entries=entries, invalidation=False)
+        throughput, p50, p99 = run(cache, keys, args.reads, args.write_every)
+        stats = cache.stats()
+        local_hit = f"{stats['local']['hit_rate']:.1%}" if stats["local"] else "-"
+        print(f"{label:<22} {throughput:>9.0f} {p50:>11.1f} {p99:>11.1f} {local_hit:>10}")
+    print(f"\nPer-tier stats (two-tier run): {stats}")
+    print(f"Cross-node invalidation over pub/sub: {'ok' if check_coherence(new_client) else 'FAILED'}")
+
+if __name__ == "__main__":
+    main()
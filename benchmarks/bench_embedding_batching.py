@@ -0,0 +1,66 @@
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.config.settings import MODEL_CONFIG, EMBEDDING_CACHE_CONFIG
+from src.models.embedding_batcher import EmbeddingBatcher
+from src.models.embedding_model import EmbeddingModel
+
+TEXTS = [
+    "What's the weather like in Paris tomorrow?",
+    "Write an email to my manager asking for a day off",
+    "Remind me to call mom at 6pm",
+    "I was charged twice for my subscription, can you help?",
+    "Write a short blog post about remote work",
+    "Search for the latest news on electric cars",
+    "Tell me a joke",
+    "How do I reset my password?"
+]
+
+def run_load(embed, clients: int, requests_per_client: int) -> float:
+    """Each client embeds its texts one request at a time; returns texts/s"""
+    def client(index: int):
+        for i in range(requests_per_client):
+            embed(f"{TEXTS[(index + i) % len(TEXTS)]} #{index}-{i}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(client, range(clients)))
+    return clients * requests_per_client / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding throughput with and without dynamic batching")
+    parser.add_argument("--model", default=MODEL_CONFIG["embedding"]["model_name"])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=8, help="Requests per client")
+    parser.add_argument("--batch-sizes", default="1,8,32,64")
+    parser.add_argument("--waits", default="1,5,10", help="max_wait_ms values")
+    args = parser.parse_args()
+    EMBEDDING_CACHE_CONFIG["enabled"] = False  # Measure the encoder, not the embedding cache
+
+    MODEL_CONFIG["embedding"]["model_name"] = args.model
+    model = EmbeddingModel()
+    model.get_embeddings(TEXTS)  # Warm up
+
+    baseline = run_load(model.get_embeddings, args.clients, args.requests)
+    print(f"{args.clients} concurrent clients, {args.requests} requests each")
+    print(f"{'mode':<28} {'texts/s':>9} {'speedup':>8} {'mean batch':>11} {'queue ms':>9}")
+    print(f"{'one forward pass / request':<28} {baseline:>9.1f} {1.0:>7.1f}x {1.0:>11.1f} {0.0:>9.2f}")
+
+    for batch_size in [int(b) for b in args.batch_sizes.split(",")]:
+        for wait in [float(w) for w in args.waits.split(",")]:
+            batcher = EmbeddingBatcher(model, max_batch_size=batch_size, max_wait_ms=wait)
+            throughput = run_load(batcher.get_embeddings, args.clients, args.requests)
+            stats = batcher.stats()
+            label = f"batch {batch_size}, wait {wait:g} ms"
+            print(f"{label:<28} {throughput:>9.1f} {throughput / baseline:>7.1f}x "
+                  f"{stats['mean_batch_size']:>11.1f} {stats['mean_queue_time'] * 1000:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.config.settings import MODEL_CONFIG, EMBEDDING_CACHE_CONFIG
+from src.models.embedding_model import EmbeddingModel
+
+CHAT_TURNS = [
+    "Hi!",
+    "Tell me a joke",
+    "What's the weather like in Paris tomorrow?",
+    "Remind me to call mom at 6pm",
+    "Write an email to my manager asking for a day off next Friday",
+    "I was charged twice for my subscription this month, can you refund one of the payments?",
+    "How do I reset my password if I no longer have access to my recovery email?",
+    "ok thanks",
+    "Can you make it shorter and a bit more formal?",
+    "Search for the latest news on electric cars and summarize the main points"
+]
+
+DOCUMENT_SENTENCES = [
+    "The quarterly report shows revenue growth across all regions.",
+    "Operating costs increased due to new hires in the support team.",
+    "Customer churn fell after the onboarding flow was redesigned.",
+    "The infrastructure migration is scheduled to finish next quarter.",
+    "Several enterprise customers requested single sign-on and audit logs.",
+    "Marketing spend shifted from paid search towards partner programs.",
+    "The mobile app rating improved after the performance release.",
+    "Legal review of the new data processing agreement is ongoing."
+]
+
+def build_corpus(size: int, document_share: float, seed: int = 0):
+    """Chat turns with the occasional uploaded document mixed in, in arrival order"""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        if rng.random() < document_share:
+            sentences = rng.choices(DOCUMENT_SENTENCES, k=rng.randint(20, 60))
+            corpus.append(" ".join(sentences))
+        else:
+            corpus.append(f"{rng.choice(CHAT_TURNS)} ({i})")
+    return corpus
+
+def run(model: EmbeddingModel, corpus, batch_size: int):
+    """Embed the corpus in arrival-order request batches; returns texts/s and token efficiency"""
+    model.real_tokens = model.padded_tokens = 0
+    start = time.perf_counter()
+    results = []
+    for i in range(0, len(corpus), batch_size):
+        results.extend(model.get_embeddings(corpus[i:i + batch_size]))
+    throughput = len(corpus) / (time.perf_counter() - start)
+    return throughput, model.real_tokens / model.padded_tokens, np.asarray(results, dtype=np.float32)
+
+def main():
+    parser = argparse.ArgumentParser(description="Padding waste and throughput with and without length bucketing")
+    parser.add_argument("--model", default=MODEL_CONFIG["embedding"]["model_name"])
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--document-share", type=float, default=0.1, help="Fraction of texts that are documents")
+    parser.add_argument("--batch-size", type=int, default=128, help="Texts per get_embeddings call")
+    args = parser.parse_args()
+    EMBEDDING_CACHE_CONFIG["enabled"] = False  # Measure the encoder, not the embedding cache
+
+    corpus = build_corpus(args.texts, args.document_share)
+    baseline_model = EmbeddingModel({"model_name": args.model, "length_bucketing": False,
+                                     "bucket_size": args.batch_size, "max_batch_tokens": 10**9})
+    bucketed_model = EmbeddingModel({"model_name": args.model, "length_bucketing": True})
+    bucketed_model.model = baseline_model.model  # Same weights, only the batching differs
+    baseline_model.get_embeddings(corpus[:8])  # Warm up
+
+    print(f"{args.model}: {len(corpus)} texts, {args.document_share:.0%} documents, "
+          f"{args.batch_size} texts per call")
+    print(f"{'mode':<34} {'texts/s':>8} {'speedup':>8} {'real/padded tokens':>19}")
+    baseline, baseline_efficiency, expected = run(baseline_model, corpus, args.batch_size)
+    print(f"{'pad to longest in call':<34} {baseline:>8.1f} {1.0:>7.1f}x {baseline_efficiency:>19.1%}")
+
+    bucketed, bucketed_efficiency, actual = run(bucketed_model, corpus, args.batch_size)
+    config = bucketed_model.config
+    label = f"buckets of {config['bucket_size']}, <= {config['max_batch_tokens']} tokens"
+    print(f"{label:<34} {bucketed:>8.1f} {bucketed / baseline:>7.1f}x {bucketed_efficiency:>19.1%}")
+
+    similarity = np.sum(expected * actual, axis=1) / (
+        np.linalg.norm(expected, axis=1) * np.linalg.norm(actual, axis=1))
+    print(f"\nMin cosine similarity to unbucketed output: {similarity.min():.6f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.config.settings import MODEL_CONFIG, EMBEDDING_CACHE_CONFIG
+from src.models.embedding_model import EmbeddingModel
+
+TOPICS = ["billing", "password reset", "shipping delays", "refund policy", "account deletion",
+          "two-factor login", "invoice download", "plan upgrade", "data export", "API limits"]
+
+def corpus(size: int):
+    """Knowledge-base style entries plus the suggestion chips shown on every page"""
+    chips = ["What can you help me with?", "Tell me a joke", "Write an email", "Search the web"]
+    entries = [f"FAQ {i}: how do I handle {TOPICS[i % len(TOPICS)]} for workspace {i // len(TOPICS)}?"
+               for i in range(size)]
+    return chips + entries
+
+def timed_pass(label: str, model: EmbeddingModel, texts, batch_size: int):
+    """Embed the corpus once and print this pass's cost and cache counters"""
+    before = model.cache.stats()
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        model.get_embeddings(texts[i:i + batch_size])
+    ms_per_text = (time.perf_counter() - start) / len(texts) * 1000
+
+    stats = model.cache.stats()
+    memory, disk, misses = (stats[k] - before[k] for k in ("memory_hits", "disk_hits", "misses"))
+    print(f"{label:<24} {ms_per_text:>9.3f} {(memory + disk) / len(texts):>9.1%} {memory:>8} "
+          f"{disk:>8} {misses:>7} {stats['bytes_mapped'] / 2**20:>10.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding cache: cold, warm in-process and fresh-worker cost")
+    parser.add_argument("--model", default=MODEL_CONFIG["embedding"]["model_name"])
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    MODEL_CONFIG["embedding"]["model_name"] = args.model
+    texts = corpus(args.texts)
+
+    if args.worker:
+        # A new process: the memory tier is empty, vectors come from the mapped file
+        model = EmbeddingModel()
+        timed_pass("new worker (mmap)", model, texts, args.batch_size)
+        return
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        EMBEDDING_CACHE_CONFIG["dir"] = Path(cache_dir)
+        model = EmbeddingModel()
+        print(f"{args.model}, {len(texts)} texts, batches of {args.batch_size}")
+        print(f"{'pass':<24} {'ms/text':>9} {'hit rate':>9} {'memory':>8} {'disk':>8} {'misses':>7} {'MiB mapped':>10}")
+        timed_pass("cold (encoder)", model, texts, args.batch_size)
+        timed_pass("warm (memory LRU)", model, texts, args.batch_size)
+        sys.stdout.flush()
+
+        subprocess.run(
+            [sys.executable, __file__, "--worker", "--model", args.model,
+             "--texts", str(args.texts), "--batch-size", str(args.batch_size)],
+            env={**os.environ, "EMBEDDING_CACHE_DIR": cache_dir},
+            check=True
+        )
+        size = sum(f.stat().st_size for f in Path(cache_dir).iterdir())
+        print(f"\nCache files on disk: {size / 2**20:.2f} MiB")
+
+if __name__ == "__main__":
+    main()
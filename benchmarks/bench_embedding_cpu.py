@@ -0,0 +1,116 @@
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.config.settings import MODEL_CONFIG, EMBEDDING_CACHE_CONFIG
+from src.models.embedding_model import EmbeddingModel
+
+# Fixed corpus for the drift check: short and long, chatty and technical
+CORPUS = [
+    "Hi!",
+    "Tell me a joke",
+    "What's the weather like in Paris tomorrow?",
+    "Remind me to call mom at 6pm",
+    "Write an email to my manager asking for a day off next Friday",
+    "I was charged twice for my subscription this month, can you refund one of the payments?",
+    "How do I reset my password if I no longer have access to my recovery email?",
+    "Search for the latest news on electric cars and summarize the main points",
+    "Write a short blog post about the pros and cons of remote work for small teams",
+    "Explain the difference between a process and a thread in operating systems",
+    "What is the time complexity of inserting into a balanced binary search tree?",
+    "Can you translate 'where is the train station' into Spanish?",
+    "My order arrived damaged. The box was crushed and two of the glasses inside were broken.",
+    "Plan a three-day itinerary for Rome with museums in the morning and food tours in the evening",
+    "Draft a polite follow-up to a client who hasn't paid their invoice in 45 days",
+    "Generate ten catchy taglines for a coffee shop that also sells vinyl records",
+    "What are the symptoms of dehydration and when should someone see a doctor?",
+    "Summarize the plot of Pride and Prejudice in two sentences",
+    "ok thanks",
+    "Schedule a meeting with the design team every Tuesday at 10am for the next two months"
+]
+
+MODES = {
+    "torch-fp32": {"backend": "torch", "quantize": False},
+    "torch-int8": {"backend": "torch", "quantize": True},
+    "onnx-fp32": {"backend": "onnx", "quantize": False},
+    "onnx-int8": {"backend": "onnx", "quantize": True}
+}
+
+def cosine(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return np.sum(a * b, axis=1)
+
+def measure(model: EmbeddingModel, rounds: int, batch_size: int):
+    """Median single-text latency (ms) and batched throughput (texts/s)"""
+    model.get_embeddings(CORPUS)  # Warm up
+
+    latencies = []
+    for _ in range(rounds):
+        for text in CORPUS:
+            start = time.perf_counter()
+            model.get_embeddings(text)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    texts = (CORPUS * (batch_size // len(CORPUS) + 1))[:batch_size]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        model.get_embeddings(texts)
+    throughput = rounds * batch_size / (time.perf_counter() - start)
+    return statistics.median(latencies), np.percentile(latencies, 99), throughput
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency, throughput and accuracy drift of embedding CPU modes")
+    parser.add_argument("--model", default=MODEL_CONFIG["embedding"]["model_name"])
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--threads", type=int, default=MODEL_CONFIG["embedding"]["intra_op_threads"],
+                        help="intra-op threads (0 = library default)")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--min-similarity", type=float, default=0.98,
+                        help="Fail if any mode's worst cosine similarity to fp32 is below this")
+    args = parser.parse_args()
+    EMBEDDING_CACHE_CONFIG["enabled"] = False  # Measure the encoder, not the embedding cache
+
+    base = {"model_name": args.model, "intra_op_threads": args.threads}
+    start = time.perf_counter()
+    reference = EmbeddingModel({**base, **MODES["torch-fp32"]})
+    reference_load_time = time.perf_counter() - start
+    expected = np.asarray(reference.get_embeddings(CORPUS), dtype=np.float32)
+
+    print(f"{args.model}, {args.threads or 'default'} intra-op threads, {len(CORPUS)}-text drift corpus")
+    print(f"{'mode':<12} {'load s':>7} {'p50 ms':>7} {'p99 ms':>7} {'texts/s':>8} {'mean cos':>9} {'min cos':>8}")
+
+    failed = []
+    for name in args.modes.split(","):
+        start = time.perf_counter()
+        try:
+            model = reference if name == "torch-fp32" else EmbeddingModel({**base, **MODES[name]})
+        except ImportError as e:
+            print(f"{name:<12} skipped: {str(e)}")
+            continue
+        load_time = reference_load_time if name == "torch-fp32" else time.perf_counter() - start
+
+        similarity = cosine(expected, np.asarray(model.get_embeddings(CORPUS), dtype=np.float32))
+        p50, p99, throughput = measure(model, args.rounds, args.batch_size)
+        print(f"{name:<12} {load_time:>7.2f} {p50:>7.2f} {p99:>7.2f} {throughput:>8.1f} "
+              f"{similarity.mean():>9.4f} {similarity.min():>8.4f}")
+        if similarity.min() < args.min_similarity:
+            failed.append(f"{name}: \"{CORPUS[int(similarity.argmin())]}\" drifted to cosine {similarity.min():.4f}")
+
+    if failed:
+        print(f"\nAccuracy drift below {args.min_similarity}:")
+        for line in failed:
+            print(f"  - {line}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
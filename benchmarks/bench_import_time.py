@@ -0,0 +1,72 @@
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+project_root = Path(__file__).resolve().parent.parent
+BUDGET_FILE = Path(__file__).resolve().parent / "import_budget.json"
+
+def measure(module: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Cold-import a module in a fresh interpreter with -X importtime
+
+    Returns the module's cumulative import time in ms and the cumulative
+    time of every module imported along the way.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=project_root,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative) / 1000
+    return modules[module], modules
+
+def check(module: str, budget: Dict, runs: int) -> List[str]:
+    """Measure a module against its budget and return the violations"""
+    # Best of several runs filters out noise from the rest of the machine
+    samples = [measure(module) for _ in range(runs)]
+    total, modules = min(samples, key=lambda sample: sample[0])
+
+    print(f"{module}: {total:.0f} ms cold import (budget {budget['budget_ms']} ms)")
+    slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[1:11]
+    for name, ms in slowest:
+        print(f"  {ms:>8.1f} ms  {name}")
+
+    violations = []
+    if total > budget["budget_ms"]:
+        violations.append(f"{module} takes {total:.0f} ms to import, budget is {budget['budget_ms']} ms")
+    for name in budget.get("forbidden", []):
+        if name in modules:
+            violations.append(f"{module} imports {name} at startup; import it where the feature is used")
+    return violations
+
+def main():
+    parser = argparse.ArgumentParser(description="Check cold-import time against the budget")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    budgets = json.loads(BUDGET_FILE.read_text())
+    violations = []
+    for module, budget in budgets.items():
+        violations += check(module, budget, args.runs)
+
+    if violations:
+        print("\nImport budget exceeded:")
+        for violation in violations:
+            print(f"  - {violation}")
+        sys.exit(1)
+    print("\nImport budget OK")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.agent.intent_classifier import IntentClassifier
+from src.config.settings import INTENT_CONFIG
+from src.models.embedding_model import EmbeddingModel
+from src.models.llm_model import LLMModel
+
+# Held-out utterances (not in INTENT_EXAMPLES) with their expected tool
+EVAL_SET = [
+    ("Look up reviews of the new iPhone", "web_search"),
+    ("Who won the world cup in 2018?", "web_search"),
+    ("Find recent research papers on transformers", "web_search"),
+    ("Search for cheap flights to Lisbon", "web_search"),
+    ("Write an email to the landlord about the broken heater", "email"),
+    ("Draft an email inviting the team to lunch", "email"),
+    ("Reply to Sarah's email and say I'll be late", "email"),
+    ("Email my professor asking for an extension", "email"),
+    ("My package arrived broken", "customer_support"),
+    ("I can't log into my account", "customer_support"),
+    ("Why was my card declined at checkout?", "customer_support"),
+    ("I want a refund for my last order", "customer_support"),
+    ("Book a call with the design team next Monday", "personal_assist"),
+    ("Remind me to water the plants tonight", "personal_assist"),
+    ("Add 'renew passport' to my to-do list", "personal_assist"),
+    ("Note that the meeting room code is 4521", "personal_assist"),
+    ("Write an Instagram post about our new coffee blend", "content_creator"),
+    ("Create a tweet announcing our webinar", "content_creator"),
+    ("Generate a picture of a cat wearing sunglasses", "content_creator"),
+    ("Suggest hashtags for a travel photo", "content_creator")
+]
+
+def evaluate(name: str, predict) -> None:
+    correct = 0
+    upstream_calls = 0
+    start = time.perf_counter()
+    for text, expected in EVAL_SET:
+        tool, calls = predict(text)
+        correct += tool == expected
+        upstream_calls += calls
+    per_query = (time.perf_counter() - start) / len(EVAL_SET) * 1000
+    print(
+        f"{name:<22} accuracy {correct / len(EVAL_SET):>5.0%}   "
+        f"{per_query:>8.1f} ms/query   {upstream_calls / len(EVAL_SET):.2f} LLM calls/query"
+    )
+
+def main():
+    embedding_model = EmbeddingModel()
+    llm = LLMModel()
+
+    start = time.perf_counter()
+    classifier = IntentClassifier(embedding_model)
+    print(f"Centroids ready in {time.perf_counter() - start:.2f}s\n")
+
+    def centroid_only(text):
+        tool, _ = classifier.classify(text)
+        return tool, 0
+
+    def with_fallback(text):
+        tool, confidence = classifier.classify(text)
+        if confidence >= INTENT_CONFIG["min_confidence"]:
+            return tool, 0
+        return llm_only(text)
+
+    def llm_only(text):
+        intent = llm.generate({"input": f"Determine the intent of: {text}"})["response"]
+        return classifier.match_intent_text(intent), 1
+
+    evaluate("centroid", centroid_only)
+    evaluate("centroid + fallback", with_fallback)
+    evaluate("llm (previous path)", llm_only)
+
+if __name__ == "__main__":
+    main()
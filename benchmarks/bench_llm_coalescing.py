@@ -0,0 +1,83 @@
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.config.settings import MODEL_CONFIG
+from src.models.client_pool import ClientPool
+from src.models.fake_llm import FakeChatNVIDIA
+from src.models.llm_model import LLMModel
+
+RESPONSE = "Why did the neural network cross the road? To minimize the loss on the other side."
+
+def state(prompt: str):
+    return {"input": prompt, "memory": []}
+
+def burst(requests: int, call) -> list:
+    """Fire requests at the same moment from separate threads; returns latencies in ms"""
+    barrier = threading.Barrier(requests)
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(i):
+        barrier.wait()
+        start = time.perf_counter()
+        call(i)
+        with lock:
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(requests)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies
+
+async def async_burst(requests: int, call) -> list:
+    async def timed(i):
+        start = time.perf_counter()
+        await call(i)
+        return (time.perf_counter() - start) * 1000
+    return await asyncio.gather(*(timed(i) for i in range(requests)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Upstream calls when many users click the same suggestion chip")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--prompts", type=int, default=2, help="Distinct prompts in the burst")
+    parser.add_argument("--max-concurrency", type=int, default=8, help="Upstream slots per process")
+    parser.add_argument("--latency", type=float, default=0.3, help="Seconds to the first token")
+    args = parser.parse_args()
+
+    prompts = ["Tell me a joke", "Explain what AI is", "Write a haiku", "Summarize the news"][:args.prompts]
+    print(f"{args.requests} concurrent requests over {len(prompts)} distinct prompts, "
+          f"{args.max_concurrency} upstream slots, {args.latency * 1000:.0f} ms to first token")
+    print(f"{'mode':<8} {'coalesce':<9} {'upstream calls':>15} {'coalesced':>10} {'p50 ms':>8} {'p99 ms':>8}")
+
+    for mode in ["invoke", "stream", "async"]:
+        for coalesce in [False, True]:
+            MODEL_CONFIG["llm"]["coalesce"] = coalesce
+            client = FakeChatNVIDIA(RESPONSE, args.latency, 0.01)
+            llm = LLMModel(client=client, pool=ClientPool(args.max_concurrency))
+            pick = lambda i: state(prompts[i % len(prompts)])
+            if mode == "invoke":
+                latencies = burst(args.requests, lambda i: llm.generate(pick(i)))
+            elif mode == "stream":
+                outputs = []
+                latencies = burst(args.requests, lambda i: outputs.append("".join(llm.generate_stream(pick(i)))))
+                assert set(outputs) == {RESPONSE}, "a coalesced stream lost or reordered tokens"
+            else:
+                latencies = asyncio.run(async_burst(args.requests, lambda i: llm.agenerate(pick(i))))
+            stats = llm.pool.stats()
+            print(f"{mode:<8} {str(coalesce):<9} {client.calls:>15} {stats['coalesced']:>10} "
+                  f"{np.percentile(latencies, 50):>8.0f} {np.percentile(latencies, 99):>8.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import argparse
+import contextlib
+import io
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.config.settings import MODEL_CONFIG
+from src.models.client_pool import ClientPool
+from src.models.fake_llm import FakeMessage
+from src.models.llm_model import LLMModel
+
+class SimulatedEndpoint:
+    """
+    LLM endpoint with a capacity the client doesn't know
+
+    Up to capacity requests run at full speed; beyond that they share the
+    hardware and slow down proportionally. Past overload_at requests in
+    flight it answers 429 straight away, like a gateway shedding load.
+    """
+    def __init__(self, capacity: int, latency: float, overload_at: int):
+        self.capacity = capacity
+        self.latency = latency
+        self.overload_at = overload_at
+        self.active = 0
+        self.served = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt: str) -> FakeMessage:
+        with self._lock:
+            if self.active >= self.overload_at:
+                self.throttled += 1
+                raise Exception("[429] Too Many Requests\nRate limit exceeded")
+            self.active += 1
+            load = self.active
+        try:
+            time.sleep(self.latency * max(1.0, load / self.capacity))
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.served += 1
+        return FakeMessage("Fine.")
+
+def spike(llm: LLMModel, users: int, duration: float):
+    """users threads sending requests back to back; returns (ok latencies in ms, limit trace)"""
+    latencies, trace = [], []
+    lock = threading.Lock()
+    stop = time.perf_counter() + duration
+
+    def user(u):
+        i = 0
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            response = llm.generate({"input": f"user {u} question {i}", "memory": []})["response"]
+            elapsed = (time.perf_counter() - start) * 1000
+            if response == "Fine.":
+                with lock:
+                    latencies.append(elapsed)
+            else:
+                time.sleep(0.1)  # The user reads the error before trying again
+            i += 1
+
+    def sample():
+        while time.perf_counter() < stop:
+            if llm.pool.limiter:
+                trace.append(llm.pool.limiter.limit)
+            time.sleep(0.1)
+
+    threads = [threading.Thread(target=user, args=(u,)) for u in range(users)] + [threading.Thread(target=sample)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, trace
+
+def main():
+    parser = argparse.ArgumentParser(description="Fixed vs adaptive upstream concurrency under a load spike")
+    parser.add_argument("--users", type=int, default=64)
+    parser.add_argument("--capacity", type=int, default=12, help="Hidden endpoint capacity")
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds per request at or under capacity")
+    parser.add_argument("--duration", type=float, default=6.0)
+    parser.add_argument("--queue-timeout", type=float, default=0.5, help="Longest wait for an upstream slot")
+    args = parser.parse_args()
+
+    MODEL_CONFIG["llm"]["queue_timeout"] = args.queue_timeout
+    MODEL_CONFIG["llm"]["coalesce"] = False
+    print(f"{args.users} users for {args.duration:.0f} s against an endpoint with hidden capacity {args.capacity} "
+          f"({args.latency * 1000:.0f} ms per request, 429 above {args.capacity * 2} in flight)")
+    print(f"{'limiter':<18} {'ok req/s':>9} {'p50 ms':>7} {'p99 ms':>7} {'429s':>6} {'rejected':>9} "
+          f"{'limit mean/final':>17}")
+
+    for label, limit, adaptive in [
+        ("fixed 64", 64, False),
+        ("fixed 4", 4, False),
+        ("adaptive from 64", 64, True),
+        ("adaptive from 4", 4, True)
+    ]:
+        endpoint = SimulatedEndpoint(args.capacity, args.latency, args.capacity * 2)
+        llm = LLMModel(client=endpoint, pool=ClientPool(limit, adaptive=adaptive))
+        # generate prints every upstream error; keep the table readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            latencies, trace = spike(llm, args.users, args.duration)
+        stats = llm.pool.stats().get("adaptive", {})
+        limits = f"{np.mean(trace):.1f}/{trace[-1]:.1f}" if trace else "-"
+        print(f"{label:<18} {len(latencies) / args.duration:>9.1f} {np.percentile(latencies, 50):>7.0f} "
+              f"{np.percentile(latencies, 99):>7.0f} {endpoint.throttled:>6} {stats.get('rejected', 0):>9} "
+              f"{limits:>17}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import contextlib
+import io
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.models.client_pool import ClientPool
+from src.models.fake_llm import FakeChatNVIDIA
+from src.models.llm_model import LLMModel
+from src.models.resilience import CircuitBreaker, ResilientClient
+
+FAILED = "I'm having trouble processing that. Could you try again?"
+
+def heavy_tail(rng: random.Random, median: float, slow_rate: float, slow: float):
+    """Lognormal latencies around median, plus a slow_rate share of slow requests"""
+    return lambda: slow if rng.random() < slow_rate else rng.lognormvariate(np.log(median), 0.3)
+
+def run(client, requests: int, workers: int):
+    """Send distinct prompts through LLMModel; returns latencies (ms) and the failed share"""
+    llm = LLMModel(client=client, pool=ClientPool(workers))
+
+    def one(i):
+        start = time.perf_counter()
+        response = llm.generate({"input": f"question {i}", "memory": []})["response"]
+        return (time.perf_counter() - start) * 1000, response == FAILED
+
+    # generate prints every upstream error; keep the table readable
+    with ThreadPoolExecutor(workers) as pool, contextlib.redirect_stdout(io.StringIO()):
+        results = list(pool.map(one, range(requests)))
+    latencies = [latency for latency, _ in results]
+    return latencies, sum(failed for _, failed in results) / requests
+
+def main():
+    parser = argparse.ArgumentParser(description="p50/p99 and failures with deadlines, retries, hedging and a breaker")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--median", type=float, default=0.08, help="Typical upstream latency in seconds")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{args.requests} requests from {args.workers} threads, {args.median * 1000:.0f} ms typical latency")
+    print(f"{'scenario':<22} {'client':<28} {'p50 ms':>8} {'p99 ms':>8} {'failed':>7} {'upstream':>9}")
+
+    def report(scenario, label, fake, client, requests=args.requests):
+        latencies, failed = run(client, requests, args.workers)
+        print(f"{scenario:<22} {label:<28} {np.percentile(latencies, 50):>8.0f} "
+              f"{np.percentile(latencies, 99):>8.0f} {failed:>7.1%} {fake.calls:>9}")
+
+    # 3% of requests stall for 2 s, e.g. a slow replica
+    scenario = "3% stall for 2 s"
+    for label, wrap in [
+        ("plain", lambda fake: fake),
+        ("deadline 5 s + retries", lambda fake: ResilientClient(fake, timeout=5, hedge=False)),
+        ("deadline 5 s + p95 hedge", lambda fake: ResilientClient(fake, timeout=5, hedge=True))
+    ]:
+        fake = FakeChatNVIDIA("Fine.", 0.0, 0.0, latency=heavy_tail(rng, args.median, 0.03, 2.0))
+        report(scenario, label, fake, wrap(fake))
+
+    # 5% of requests fail with a 503
+    scenario = "5% errors"
+    for label, wrap in [
+        ("plain", lambda fake: fake),
+        ("deadline 5 s + retries", lambda fake: ResilientClient(fake, timeout=5, hedge=False))
+    ]:
+        fake = FakeChatNVIDIA("Fine.", 0.0, 0.0, latency=heavy_tail(rng, args.median, 0.0, 0.0),
+                              error_rate=0.05, seed=1)
+        report(scenario, label, fake, wrap(fake))
+
+    # The endpoint hangs: every request takes 2 s and then fails
+    scenario = "outage (hangs 2 s)"
+    for label, wrap in [
+        ("plain", lambda fake: fake),
+        ("deadline 1 s, no breaker", lambda fake: ResilientClient(
+            fake, timeout=1, retries=0, breaker=CircuitBreaker(10 ** 9))),
+        ("deadline 1 s + breaker", lambda fake: ResilientClient(
+            fake, timeout=1, retries=0, breaker=CircuitBreaker(5, 30)))
+    ]:
+        fake = FakeChatNVIDIA("Fine.", 2.0, 0.0, error_rate=1.0)
+        report(scenario, label, fake, wrap(fake), requests=args.requests // 3)
+
+if __name__ == "__main__":
+    main()
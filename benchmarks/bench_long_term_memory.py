@@ -0,0 +1,84 @@
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.memory.long_term import LongTermMemory
+
+LATENCY_BUDGET_MS = 10.0
+
+class RandomEmbedder:
+    """Stands in for the embedding model; only recall's search cost is measured"""
+    def __init__(self, dim: int):
+        self.rng = np.random.default_rng(0)
+        self.dim = dim
+
+    def get_embeddings(self, text):
+        return self.rng.standard_normal(self.dim).astype(np.float32).tolist()
+
+def populate(memory: LongTermMemory, user_id: str, turns: int, dim: int) -> float:
+    rng = np.random.default_rng(1)
+    store = memory._user(user_id)
+    start = time.perf_counter()
+    for i in range(turns):
+        store.add(
+            {"input": f"Question {i} about topic {i % 500}", "response": f"Answer {i}", "timestamp": 0.0},
+            rng.standard_normal(dim).astype(np.float32)
+        )
+    return time.perf_counter() - start
+
+def measure_recall(memory: LongTermMemory, user_id: str, queries: int, dim: int):
+    rng = np.random.default_rng(2)
+    latencies = []
+    for _ in range(queries):
+        embedding = rng.standard_normal(dim).astype(np.float32)
+        start = time.perf_counter()
+        memory.recall(user_id, "", embedding=embedding)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-term memory recall latency and reload time per user")
+    parser.add_argument("--turns", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384, help="all-MiniLM-L6-v2 embedding size")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--backends", default="auto", help="Any of numpy, hnsw, auto")
+    args = parser.parse_args()
+
+    print(f"{args.turns} turns for one user, {args.dim}-dim embeddings, {args.queries} recalls")
+    print(f"{'index':<7} {'write s':>8} {'reload s':>9} {'p50 ms':>7} {'p99 ms':>7}")
+    over_budget = []
+    for backend in args.backends.split(","):
+        with tempfile.TemporaryDirectory() as directory:
+            memory = LongTermMemory(RandomEmbedder(args.dim), directory=directory, index_backend=backend)
+            try:
+                write_time = populate(memory, "bench-user", args.turns, args.dim)
+            except ImportError as e:
+                print(f"{backend:<7} skipped: {str(e)}")
+                continue
+
+            # A restarted process: the store is rebuilt from disk on first use
+            memory = LongTermMemory(RandomEmbedder(args.dim), directory=directory, index_backend=backend)
+            start = time.perf_counter()
+            loaded = len(memory._user("bench-user").turns)
+            reload_time = time.perf_counter() - start
+            assert loaded == args.turns, f"reloaded {loaded} of {args.turns} turns"
+
+            p50, p99 = measure_recall(memory, "bench-user", args.queries, args.dim)
+            print(f"{backend:<7} {write_time:>8.2f} {reload_time:>9.2f} {p50:>7.2f} {p99:>7.2f}")
+            if p99 > LATENCY_BUDGET_MS:
+                over_budget.append(f"{backend}: p99 {p99:.2f} ms")
+
+    if over_budget:
+        print(f"\nRecall above the {LATENCY_BUDGET_MS:.0f} ms budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
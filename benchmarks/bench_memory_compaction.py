@@ -0,0 +1,87 @@
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.agent.base_agent import AIAgent
+from src.memory.buffer import WindowBuffer, count_tokens
+from src.memory.summarizer import ConversationSummarizer
+from src.models.fake_llm import FakeChatNVIDIA
+from src.models.llm_model import LLMModel
+
+TOPICS = ["my trip to Lisbon", "the quarterly budget", "a birthday gift for my sister",
+          "learning Python", "fixing the kitchen sink", "a job interview on Monday"]
+
+def build_conversation(turns: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        f"Turn {i}: about {rng.choice(TOPICS)}, " + " ".join(rng.choices(
+            ["could", "you", "help", "me", "plan", "compare", "explain", "options", "details", "again"],
+            k=rng.randint(5, 40)))
+        for i in range(turns)
+    ]
+
+class RecordingClient(FakeChatNVIDIA):
+    """Fake endpoint that keeps chat prompts and answers summary requests with a short summary"""
+    def __init__(self, response_words: int, summary_words: int, **delays):
+        self.prompts = []
+        answer = " ".join(["answer"] * response_words)
+        summary = " ".join(["summary"] * summary_words)
+        super().__init__(lambda prompt: summary if prompt.startswith("Summarize") else answer, **delays)
+
+    def invoke(self, prompt):
+        if not prompt.startswith("Summarize"):
+            self.prompts.append(prompt)
+        return super().invoke(prompt)
+
+def run(mode: str, conversation, args):
+    client = RecordingClient(
+        args.response_words, args.summary_words,
+        first_token_delay=args.first_token_delay, token_delay=0.0, prompt_token_delay=args.prompt_token_delay
+    )
+    llm = LLMModel(client=client)
+    agent = AIAgent(llm=llm)
+    if mode == "full history":
+        agent.memory = WindowBuffer(max_size=10**9, max_tokens=10**9)
+    elif mode == "window only":
+        agent.memory = WindowBuffer()
+    else:
+        agent.memory = WindowBuffer(summarizer=ConversationSummarizer(llm))
+
+    latencies = []
+    for user_input in conversation:
+        start = time.perf_counter()
+        agent.process(user_input)
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(args.think_time)
+    tokens = [count_tokens(prompt) for prompt in client.prompts]
+    return tokens, latencies, agent.memory.compactions
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt size and latency on long conversations with and without compaction")
+    parser.add_argument("--turns", type=int, default=60)
+    parser.add_argument("--response-words", type=int, default=60)
+    parser.add_argument("--summary-words", type=int, default=100)
+    parser.add_argument("--first-token-delay", type=float, default=0.05)
+    parser.add_argument("--prompt-token-delay", type=float, default=0.0002, help="Simulated prefill cost per prompt word")
+    parser.add_argument("--think-time", type=float, default=0.02, help="Pause between user turns")
+    args = parser.parse_args()
+
+    conversation = build_conversation(args.turns)
+    print(f"{args.turns}-turn conversation, {args.response_words}-word responses")
+    print(f"{'memory':<16} {'mean tok':>9} {'last tok':>9} {'max tok':>8} {'p50 ms':>7} {'p95 ms':>7} {'compactions':>12}")
+    for mode in ["full history", "window only", "compaction"]:
+        tokens, latencies, compactions = run(mode, conversation, args)
+        print(f"{mode:<16} {np.mean(tokens):>9.0f} {tokens[-1]:>9} {max(tokens):>8} "
+              f"{np.percentile(latencies, 50):>7.1f} {np.percentile(latencies, 95):>7.1f} {compactions:>12}")
+    print("\n'window only' keeps prompts small by forgetting; compaction keeps a summary of what it evicts.")
+
+if __name__ == "__main__":
+    main()
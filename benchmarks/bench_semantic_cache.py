@@ -0,0 +1,84 @@
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.models.embedding_model import EmbeddingModel
+from src.utils.semantic_cache import SemanticCache
+
+# Canonical question -> paraphrases users actually send
+PARAPHRASES = {
+    "What can you help me with?": [
+        "What are you able to help me with?",
+        "what can you do for me",
+        "How can you help me?"
+    ],
+    "Tell me a joke": [
+        "Tell me something funny",
+        "Do you know any jokes?",
+        "tell me a joke please"
+    ],
+    "Explain what AI is": [
+        "What is artificial intelligence?",
+        "Can you explain AI to me?",
+        "what's AI"
+    ],
+    "What programming topics can you help with?": [
+        "Which programming subjects do you know about?",
+        "What coding topics can you assist with?",
+        "Can you help me with programming?"
+    ]
+}
+
+# Queries that must not be answered from the cache
+UNRELATED = [
+    "Write an email to my manager asking for a day off",
+    "What's the weather like in Paris tomorrow?",
+    "Summarize this PDF for me",
+    "Remind me to call mom at 6pm"
+]
+
+UPSTREAM_LATENCY = 1.5  # Seconds an LLM call would have taken
+
+def main():
+    model = EmbeddingModel()
+    cache = SemanticCache(model, threshold=0.0)
+
+    for question in PARAPHRASES:
+        cache.store(question, question, latency=UPSTREAM_LATENCY)
+
+    queries = [(p, question) for question, ps in PARAPHRASES.items() for p in ps]
+    queries += [(q, None) for q in UNRELATED]
+
+    start = time.perf_counter()
+    embeddings = [cache.embed(query) for query, _ in queries]
+    embed_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+    print(f"Embedding cost per lookup: {embed_ms:.1f} ms")
+    print(f"{'threshold':>9} {'hit rate':>9} {'wrong hits':>11} {'latency saved':>14}")
+    for threshold in [0.80, 0.85, 0.90, 0.92, 0.95]:
+        cache.threshold = threshold
+        hits = wrong = 0
+        saved = 0.0
+        for (query, expected), embedding in zip(queries, embeddings):
+            answer = cache.lookup(query, embedding)
+            if answer is None:
+                continue
+            hits += 1
+            if answer != expected:
+                wrong += 1
+            else:
+                saved += UPSTREAM_LATENCY - embed_ms / 1000
+        print(f"{threshold:>9.2f} {hits / len(queries):>8.0%} {wrong:>11} {saved:>13.1f}s")
+
+    stats = cache.stats()
+    print("\nBest-match similarity distribution:")
+    for bucket, count in stats["similarity_histogram"].items():
+        if count:
+            print(f"  {bucket}: {count}")
+
+if __name__ == "__main__":
+    main()
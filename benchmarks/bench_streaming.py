@@ -0,0 +1,46 @@
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.models.llm_model import LLMModel
+from src.models.fake_llm import FakeChatNVIDIA
+
+RESPONSE = " ".join(["token"] * 60)
+
+def measure(llm: LLMModel, state: dict) -> dict:
+    """Time-to-first-token and total latency for generate vs generate_stream"""
+    start = time.perf_counter()
+    llm.generate(state)
+    blocking = time.perf_counter() - start
+
+    start = time.perf_counter()
+    first_token = None
+    for _ in llm.generate_stream(state):
+        if first_token is None:
+            first_token = time.perf_counter() - start
+    streaming = time.perf_counter() - start
+
+    return {
+        "blocking_ttft": blocking,  # nothing is visible until the call returns
+        "streaming_ttft": first_token,
+        "streaming_total": streaming
+    }
+
+def main():
+    state = {"input": "Explain what AI is"}
+    print(f"{'first_token_delay':>18} {'token_delay':>12} {'blocking TTFT':>14} {'stream TTFT':>12} {'stream total':>13}")
+    for first_token_delay, token_delay in [(0.1, 0.01), (0.3, 0.02), (0.5, 0.05)]:
+        llm = LLMModel(client=FakeChatNVIDIA(RESPONSE, first_token_delay, token_delay))
+        result = measure(llm, state)
+        print(
+            f"{first_token_delay:>18.2f} {token_delay:>12.3f} "
+            f"{result['blocking_ttft']:>13.3f}s {result['streaming_ttft']:>11.3f}s "
+            f"{result['streaming_total']:>12.3f}s"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from src.agent.workflow import AgentWorkflow
+from src.config.settings import API_KEYS, MODEL_CONFIG
+from src.models.fake_llm import FakeChatNVIDIA
+from src.models.llm_model import LLMModel
+
+QUERIES = [
+    "Remind me to call mom at 6pm",
+    "Search the web for reviews of electric cars",
+    "Write an email asking my manager for a day off",
+    "My order hasn't arrived and I want a refund",
+    "What's on my calendar tomorrow?"
+]
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage timings of the real AgentWorkflow graph")
+    parser.add_argument("--rounds", type=int, default=5, help="Passes over the sample queries")
+    parser.add_argument("--fake-llm", type=float, default=None, metavar="SECONDS",
+                        help="Replace the NVIDIA endpoint with a fake answering after SECONDS "
+                             "(default when NVIDIA_API_KEY isn't set: 0.5)")
+    parser.add_argument("--user-id", default=None,
+                        help="Recall this user's long-term memory alongside intent classification "
+                             "(needs LONG_TERM_MEMORY_ENABLED=true)")
+    args = parser.parse_args()
+
+    workflow = AgentWorkflow()
+    if args.fake_llm is not None or not API_KEYS["nvidia"]:
+        latency = 0.5 if args.fake_llm is None else args.fake_llm
+        workflow.llm_model = LLMModel(client=FakeChatNVIDIA("Done.", latency, 0.0))
+        print(f"LLM: fake endpoint, {latency * 1000:.0f} ms per call")
+    else:
+        print(f"LLM: {MODEL_CONFIG['llm']['model_name']}")
+
+    # Warm up the encoder, centroids and tools so first-load costs aren't counted
+    for query in QUERIES:
+        workflow.run(query, user_id=args.user_id)
+
+    durations = {}
+    walls, sequentials, paths = [], [], set()
+    for _ in range(args.rounds):
+        for query in QUERIES:
+            timings = workflow.run(query, user_id=args.user_id)["timings"]
+            for name, node in timings["nodes"].items():
+                durations.setdefault(name, []).append(node["duration"] * 1000)
+            walls.append(timings["wall_time"] * 1000)
+            sequentials.append(timings["sequential_time"] * 1000)
+            paths.add(" -> ".join(timings["critical_path"]))
+
+    print(f"\n{'node':<18} {'p50 ms':>8} {'mean ms':>8}")
+    for name, values in durations.items():
+        print(f"{name:<18} {np.percentile(values, 50):>8.1f} {np.mean(values):>8.1f}")
+
+    wall, sequential = np.mean(walls), np.mean(sequentials)
+    print(f"\nCritical path(s): {'; '.join(sorted(paths))}")
+    print(f"Wall time:        {wall:.1f} ms")
+    print(f"Sequential time:  {sequential:.1f} ms")
+    print(f"Overlap saved:    {sequential - wall:.1f} ms per request ({(sequential - wall) / sequential:.1%})")
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,45 @@
+import importlib.util
 import streamlit as st
 from src.agent.base_agent import AIAgent
 from src.utils.user_management import UserManager
 from src.utils.personalization import PersonalizationEngine
 from src.utils.ab_testing import ABTestingSystem
 from src.utils.cache import CacheManager
+from src.utils.response_cache import ResponseCache
+from src.utils.semantic_cache import SemanticCache
+from src.memory.long_term import LongTermMemory
+from src.config.settings import SEMANTIC_CACHE_CONFIG, LONG_TERM_MEMORY_CONFIG
 from src.utils.analytics import ConversationAnalytics
 from src.utils.feedback import FeedbackSystem
-import plotly.express as px
 import time
 from streamlit_option_menu import option_menu
-from streamlit_lottie import st_lottie
-import requests
 import json
-import speech_recognition as sr
-from speech_recognition import Recognizer, Microphone
-import pyttsx3
-from streamlit_ace import st_ace
 from datetime import datetime
-import sounddevice as sd
-import numpy as np
-import scipy.io.wavfile as wav
-import io
+
+# Optional feature stacks (voice, charts, code editor, PDF) are imported
+# inside the handlers that use them, so a cold start or a headless
+# deployment only pays for what is actually used.
+VOICE_MODULES = ("sounddevice", "scipy", "speech_recognition", "pyttsx3")
 
 def initialize_session_state():
     """Initialize Streamlit session state variables"""
     try:
         if 'user' not in st.session_state:
             st.session_state.user = None
+        if 'cache' not in st.session_state:
+            st.session_state.cache = CacheManager.shared()
         if 'agent' not in st.session_state:
-            st.session_state.agent = AIAgent()
+            st.session_state.agent = AIAgent(
+                response_cache=ResponseCache(st.session_state.cache),
+                semantic_cache=SemanticCache.shared() if SEMANTIC_CACHE_CONFIG["enabled"] else None,
+                long_term_memory=LongTermMemory.shared() if LONG_TERM_MEMORY_CONFIG["enabled"] else None
+            )
         if 'user_manager' not in st.session_state:
             st.session_state.user_manager = UserManager()
         if 'personalization' not in st.session_state:
             st.session_state.personalization = PersonalizationEngine()
         if 'ab_testing' not in st.session_state:
             st.session_state.ab_testing = ABTestingSystem()
-        if 'cache' not in st.session_state:
-            st.session_state.cache = CacheManager()
         if 'analytics' not in st.session_state:
             st.session_state.analytics = ConversationAnalytics()
         if 'feedback' not in st.session_state:
@@ -93,7 +96,10 @@ def show_auth_page():
             except ValueError as e:
                 st.error(str(e))
 
+@st.cache_data(ttl=3600, show_spinner=False)
 def load_lottie_url(url: str):
+    import requests
+    
     r = requests.get(url)
     if r.status_code != 200:
         return None
@@ -266,6 +272,9 @@ def show_main_app():
         st.divider()
         if st.button("Logout", type="secondary"):
             st.session_state.user = None
+            # The agent outlives the login; don't carry this user's turns over
+            st.session_state.messages = []
+            st.session_state.agent.memory.clear()
             st.rerun()
         st.markdown('</div>', unsafe_allow_html=True)
     
@@ -288,6 +297,7 @@ def show_chat_interface():
         st.header("💬 AI Assistant")
     with col2:
         if chat_animation:
+            from streamlit_lottie import st_lottie
             st_lottie(chat_animation, height=100, key="chat_animation")
     
     # Chat container with enhanced styling
@@ -315,6 +325,7 @@ def show_chat_interface():
         with col3:
             if st.button("🔄 Clear", key="clear_btn", use_container_width=True):
                 st.session_state.messages = []
+                st.session_state.agent.memory.clear()
                 st.rerun()
     
     # Suggestion chips with enhanced styling
@@ -349,60 +360,63 @@ def show_chat_interface():
         add_export_options()
 
 def add_voice_controls():
-    try:
-        import sounddevice as sd
-        import numpy as np
-        import scipy.io.wavfile as wav
-        import speech_recognition as sr
-        import pyttsx3
+    # Checking for the audio packages is cheap; importing them is not, so
+    # that waits until a voice button is pressed
+    if not all(importlib.util.find_spec(module) for module in VOICE_MODULES):
+        st.warning("Voice features are not available. Please install required dependencies.")
+        return
         
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("🎤 Voice Input"):
-                try:
-                    # Voice input code...
-                    status_placeholder = st.empty()
-                    status_placeholder.info("🎤 Recording will start in 3 seconds...")
-                    time.sleep(1)
-                    
-                    duration = 5
-                    fs = 44100
-                    status_placeholder.info("🎤 Recording... Speak now!")
-                    recording = sd.rec(int(duration * fs), samplerate=fs, channels=1, dtype='int16')
-                    sd.wait()
-                    
-                    virtual_file = io.BytesIO()
-                    recording = recording.flatten()
-                    wav.write(virtual_file, fs, recording)
-                    virtual_file.seek(0)
-                    
-                    recognizer = sr.Recognizer()
-                    with sr.AudioFile(virtual_file) as source:
-                        audio = recognizer.record(source)
-                        text = recognizer.recognize_google(audio)
-                        
-                    if text:
-                        status_placeholder.success(f"Recognized: {text}")
-                        process_chat_input(text)
-                    else:
-                        status_placeholder.error("No speech detected. Please try again.")
-                        
-                except Exception as e:
-                    st.error(f"Voice input error: {str(e)}")
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("🎤 Voice Input"):
+            try:
+                import io
+                import sounddevice as sd
+                import scipy.io.wavfile as wav
+                import speech_recognition as sr
+                
+                # Voice input code...
+                status_placeholder = st.empty()
+                status_placeholder.info("🎤 Recording will start in 3 seconds...")
+                time.sleep(1)
+                
+                duration = 5
+                fs = 44100
+                status_placeholder.info("🎤 Recording... Speak now!")
+                recording = sd.rec(int(duration * fs), samplerate=fs, channels=1, dtype='int16')
+                sd.wait()
+                
+                virtual_file = io.BytesIO()
+                recording = recording.flatten()
+                wav.write(virtual_file, fs, recording)
+                virtual_file.seek(0)
+                
+                recognizer = sr.Recognizer()
+                with sr.AudioFile(virtual_file) as source:
+                    audio = recognizer.record(source)
+                    text = recognizer.recognize_google(audio)
                     
-        with col2:
-            if st.button("🔊 Read Response"):
-                try:
-                    if st.session_state.messages:
-                        last_response = st.session_state.messages[-1]['content']
-                        engine = pyttsx3.init()
-                        engine.say(last_response)
-                        engine.runAndWait()
-                except Exception as e:
-                    st.error("Could not process text-to-speech.")
+                if text:
+                    status_placeholder.success(f"Recognized: {text}")
+                    process_chat_input(text)
+                else:
+                    status_placeholder.error("No speech detected. Please try again.")
                     
-    except ImportError:
-        st.warning("Voice features are not available. Please install required dependencies.")
+            except Exception as e:
+                st.error(f"Voice input error: {str(e)}")
+                
+    with col2:
+        if st.button("🔊 Read Response"):
+            try:
+                import pyttsx3
+                
+                if st.session_state.messages:
+                    last_response = st.session_state.messages[-1]['content']
+                    engine = pyttsx3.init()
+                    engine.say(last_response)
+                    engine.runAndWait()
+            except Exception as e:
+                st.error("Could not process text-to-speech.")
 
 def show_analytics():
     """Enhanced analytics dashboard"""
@@ -443,6 +457,8 @@ def display_metric_card(title, value, icon):
 
 # Add helper functions for charts
 def create_activity_chart(data):
+    import plotly.express as px
+    
     return px.line(
         data['activity_data'],
         x='timestamp',
@@ -452,6 +468,8 @@ def create_activity_chart(data):
     )
 
 def create_usage_chart(data):
+    import plotly.express as px
+    
     return px.pie(
         values=list(data['tool_usage'].values()),
         names=list(data['tool_usage'].keys()),
@@ -461,6 +479,8 @@ def create_usage_chart(data):
 
 def create_performance_chart(data):
     """Create performance metrics chart"""
+    import plotly.express as px
+    
     performance_data = {
         'Metric': ['Response Time', 'Success Rate', 'User Rating'],
         'Value': [
@@ -536,48 +556,45 @@ def process_chat_input(user_input: str):
         
         # Get response
         with st.chat_message("assistant", avatar="🤖"):
-            with st.spinner("Thinking..."):
-                try:
-                    # Get response with context
-                    response = st.session_state.agent.process(
+            try:
+                # Stream response with context, rendering tokens as they arrive
+                response_text = st.write_stream(
+                    st.session_state.agent.process_stream(
                         user_input,
-                        context=st.session_state.messages[-5:]  # Last 5 messages for context
+                        user_id=st.session_state.user['username']
                     )
-                    
-                    # Clean and display response
-                    response_text = response.get('response', '')
-                    if response_text:
-                        st.markdown(response_text)
-                        
-                        # Add to message history
-                        st.session_state.messages.append({
-                            "role": "assistant",
-                            "content": response_text
-                        })
-                        
-                        # Track analytics
-                        processing_time = time.time() - start_time
-                        st.session_state.analytics.track_conversation(
-                            user_input,
-                            {
-                                'response': response_text,
-                                'processing_time': processing_time,
-                                'sentiment': 'neutral',
-                                'tool_used': 'chat'
-                            }
-                        )
-                    else:
-                        raise ValueError("Empty response")
-                        
-                except Exception as e:
-                    print(f"Chat processing error: {str(e)}")
-                    error_message = "I'm here to help! Could you rephrase your question?"
-                    st.warning(error_message)
+                )
+                
+                if response_text:
+                    # Add to message history
                     st.session_state.messages.append({
                         "role": "assistant",
-                        "content": error_message
+                        "content": response_text
                     })
                     
+                    # Track analytics
+                    processing_time = time.time() - start_time
+                    st.session_state.analytics.track_conversation(
+                        user_input,
+                        {
+                            'response': response_text,
+                            'processing_time': processing_time,
+                            'sentiment': 'neutral',
+                            'tool_used': 'chat'
+                        }
+                    )
+                else:
+                    raise ValueError("Empty response")
+                    
+            except Exception as e:
+                print(f"Chat processing error: {str(e)}")
+                error_message = "I'm here to help! Could you rephrase your question?"
+                st.warning(error_message)
+                st.session_state.messages.append({
+                    "role": "assistant",
+                    "content": error_message
+                })
+                
     except Exception as e:
         print(f"Chat interface error: {str(e)}")
         st.error("Something went wrong. Let's start fresh!")
@@ -627,6 +644,8 @@ def add_file_processing():
 
 def add_code_editor():
     if st.button("📝 Open Code Editor"):
+        from streamlit_ace import st_ace
+        
         code = st_ace(
             placeholder="Write your code here...",
             language="python",
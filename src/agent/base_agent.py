@@ -1,26 +1,46 @@
-from typing import Dict, Any, List
+import asyncio
+from typing import Dict, Any, List, Iterator, Optional
+from ..config.settings import MEMORY_CONFIG
+from ..memory.buffer import WindowBuffer
+from ..memory.long_term import LongTermMemory
+from ..memory.summarizer import ConversationSummarizer
 from ..models.llm_model import LLMModel
+from ..utils.response_cache import ResponseCache
+from ..utils.semantic_cache import SemanticCache
 
 class AIAgent:
-    def __init__(self):
-        self.llm = LLMModel()
+    def __init__(
+        self,
+        llm: LLMModel = None,
+        response_cache: ResponseCache = None,
+        semantic_cache: SemanticCache = None,
+        long_term_memory: LongTermMemory = None
+    ):
+        self.llm = llm or LLMModel(cache=response_cache, semantic_cache=semantic_cache)
+        self.long_term_memory = long_term_memory
+        summarizer = None
+        if MEMORY_CONFIG["compaction"] and getattr(self.llm, 'client', None) is not None:
+            summarizer = ConversationSummarizer(self.llm)
+        self.memory = WindowBuffer(summarizer=summarizer)
         self.conversation_history = []
         
-    def process(self, user_input: str, context: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def process(
+        self,
+        user_input: str,
+        context: List[Dict[str, Any]] = None,
+        user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Process user input and generate response"""
         try:
             # Format the state
-            state = {
-                'input': user_input,
-                'memory': self._format_context(context) if context else [],
-                'sentiment': 'neutral'
-            }
+            state = self._build_state(user_input, context, user_id)
             
             # Generate response with error handling
             try:
                 response = self.llm.generate(state)
                 if not response or 'response' not in response:
                     raise ValueError("Invalid response format")
+                self._remember(user_id, user_input, response['response'])
                 return response
                 
             except Exception as e:
@@ -35,6 +55,94 @@ class AIAgent:
                 "response": "Something went wrong. Please try again."
             }
             
+    async def aprocess(
+        self,
+        user_input: str,
+        context: List[Dict[str, Any]] = None,
+        user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Async version of process for serving many conversations on one event loop"""
+        try:
+            # Recall embeds the input; keep it off the event loop
+            state = await asyncio.to_thread(self._build_state, user_input, context, user_id)
+            
+            try:
+                response = await self.llm.agenerate(state)
+                if not response or 'response' not in response:
+                    raise ValueError("Invalid response format")
+                self._remember(user_id, user_input, response['response'])
+                return response
+                
+            except Exception as e:
+                print(f"LLM error: {str(e)}")
+                return {
+                    "response": "I'm having trouble understanding. Could you rephrase your question?"
+                }
+                
+        except Exception as e:
+            print(f"Processing error: {str(e)}")
+            return {
+                "response": "Something went wrong. Please try again."
+            }
+            
+    def process_stream(
+        self,
+        user_input: str,
+        context: List[Dict[str, Any]] = None,
+        user_id: Optional[str] = None
+    ) -> Iterator[str]:
+        """Process user input and yield the response as it is generated"""
+        state = self._build_state(user_input, context, user_id)
+        
+        tokens = []
+        try:
+            for token in self.llm.generate_stream(state):
+                tokens.append(token)
+                yield token
+        except Exception as e:
+            print(f"LLM streaming error: {str(e)}")
+            if not tokens:
+                yield "I'm having trouble understanding. Could you rephrase your question?"
+            return
+        if tokens:
+            self._remember(user_id, user_input, "".join(tokens))
+            
+    def _build_state(
+        self,
+        user_input: str,
+        context: List[Dict[str, Any]] = None,
+        user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the LLM input state, with relevant earlier turns if the user has
+        long-term memory. Without an explicit context the agent's own
+        token-budgeted window of recent turns is used, with the rolling
+        summary of the turns compacted out of it.
+        """
+        state = {
+            'input': user_input,
+            'memory': self._format_context(context) if context else [],
+            'sentiment': 'neutral'
+        }
+        if context is None:
+            if len(self.memory):
+                state['memory'] = self.memory.get_context()
+                state['history'] = self.memory.get_formatted_history()
+            if self.memory.summary:
+                state['summary'] = self.memory.summary
+        if self.long_term_memory is not None and user_id is not None:
+            try:
+                state['recalled'] = self.long_term_memory.recall(user_id, user_input)
+            except Exception as e:
+                print(f"Long-term memory recall error: {str(e)}")
+        return state
+    
+    def _remember(self, user_id: Optional[str], user_input: str, response: str) -> None:
+        """Add the finished turn to the window and queue it for long-term memory"""
+        self.memory.add(user_input, response)
+        if self.long_term_memory is not None and user_id is not None:
+            self.long_term_memory.remember(user_id, user_input, response)
+            
     def _format_context(self, context: List[Dict[str, Any]]) -> List[Dict[str, str]]:
         """Format context for the LLM"""
         formatted_context = []
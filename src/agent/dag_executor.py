@@ -0,0 +1,138 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+class DAGNode:
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[Dict[str, Any]], Dict[str, Any]],
+        requires: Iterable[str],
+        provides: Iterable[str]
+    ):
+        self.name = name
+        self.fn = fn
+        self.requires = set(requires)
+        self.provides = set(provides)
+
+class DAGExecutor:
+    """
+    Run workflow nodes concurrently on a thread pool, ordered only by
+    their declared data dependencies
+
+    Each node receives a snapshot of the state and returns a dict of
+    updates limited to the keys it declared in `provides`. A node starts
+    as soon as every node providing one of its `requires` keys is done.
+    """
+    def __init__(self, max_workers: int = 4):
+        self.nodes: Dict[str, DAGNode] = {}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dag")
+
+    def add_node(
+        self,
+        name: str,
+        fn: Callable[[Dict[str, Any]], Dict[str, Any]],
+        requires: Iterable[str] = (),
+        provides: Iterable[str] = ()
+    ) -> None:
+        """Register a node and the state keys it reads and writes"""
+        self.nodes[name] = DAGNode(name, fn, requires, provides)
+
+    def run(self, state: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Execute all nodes and return the merged state and timing report
+        """
+        dependencies = self._dependencies(state)
+        pending = dict(dependencies)
+        done: Dict[str, Tuple[float, float]] = {}
+        running = {}
+        state = dict(state)
+        run_start = time.perf_counter()
+
+        def execute(node: DAGNode, snapshot: Dict[str, Any]):
+            start = time.perf_counter()
+            updates = node.fn(snapshot) or {}
+            return updates, start, time.perf_counter()
+
+        while pending or running:
+            for name in [n for n, deps in pending.items() if deps <= done.keys()]:
+                del pending[name]
+                node = self.nodes[name]
+                running[self.executor.submit(execute, node, dict(state))] = node
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                node = running.pop(future)
+                updates, start, end = future.result()
+                unexpected = set(updates) - node.provides
+                if unexpected:
+                    raise ValueError(f"Node {node.name} wrote undeclared keys: {sorted(unexpected)}")
+                state.update(updates)
+                done[node.name] = (start - run_start, end - run_start)
+
+        return state, self._timings(dependencies, done, time.perf_counter() - run_start)
+
+    def _dependencies(self, state: Dict[str, Any]) -> Dict[str, set]:
+        """Map each node to the nodes producing its inputs, validating the graph"""
+        providers = {}
+        for node in self.nodes.values():
+            for key in node.provides:
+                if key in providers:
+                    raise ValueError(f"State key {key} is provided by both {providers[key]} and {node.name}")
+                providers[key] = node.name
+
+        dependencies = {}
+        for node in self.nodes.values():
+            deps = set()
+            for key in node.requires:
+                if key in providers:
+                    deps.add(providers[key])
+                elif key not in state:
+                    raise ValueError(f"Node {node.name} requires {key}, which nothing provides")
+            dependencies[node.name] = deps
+
+        # Reject cycles up front instead of deadlocking in run()
+        resolved = set()
+        remaining = dict(dependencies)
+        while remaining:
+            ready = [n for n, deps in remaining.items() if deps <= resolved]
+            if not ready:
+                raise ValueError(f"Cycle between workflow nodes: {sorted(remaining)}")
+            for name in ready:
+                resolved.add(name)
+                del remaining[name]
+        return dependencies
+
+    def _timings(
+        self,
+        dependencies: Dict[str, set],
+        done: Dict[str, Tuple[float, float]],
+        wall_time: float
+    ) -> Dict[str, Any]:
+        """Per-node timings plus the critical path through the dependency graph"""
+        durations = {name: end - start for name, (start, end) in done.items()}
+        if not durations:
+            return {"nodes": {}, "critical_path": [], "critical_path_time": 0.0,
+                    "wall_time": wall_time, "sequential_time": 0.0, "saved_time": 0.0}
+
+        # Longest chain of node durations ending at each node, in completion order
+        path_cost: Dict[str, float] = {}
+        path: Dict[str, List[str]] = {}
+        for name in sorted(done, key=lambda n: done[n][1]):
+            parent = max(dependencies[name], key=lambda d: path_cost[d], default=None)
+            path_cost[name] = durations[name] + (path_cost[parent] if parent else 0.0)
+            path[name] = (path[parent] if parent else []) + [name]
+        last = max(path_cost, key=path_cost.get)
+
+        sequential_time = sum(durations.values())
+        return {
+            "nodes": {
+                name: {"start": start, "end": end, "duration": durations[name]}
+                for name, (start, end) in done.items()
+            },
+            "critical_path": path[last],
+            "critical_path_time": path_cost[last],
+            "wall_time": wall_time,
+            "sequential_time": sequential_time,
+            "saved_time": sequential_time - wall_time
+        }
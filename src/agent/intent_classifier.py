@@ -0,0 +1,146 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from ..config.settings import INTENT_CONFIG
+
+# Labelled example utterances per tool; each tool's centroid is the mean
+# of their normalized embeddings
+INTENT_EXAMPLES = {
+    "web_search": [
+        "Search the web for the latest news on electric cars",
+        "Find information about the history of the Roman empire",
+        "Look up the population of Tokyo",
+        "Can you google the best laptops of this year?",
+        "What are the latest developments in quantum computing?",
+        "Find me articles about climate change"
+    ],
+    "email": [
+        "Write an email to my manager asking for a day off",
+        "Draft a follow-up email to the client",
+        "Compose a thank-you email for the interview",
+        "Help me reply to this email from HR",
+        "Send a message to the team about the meeting delay",
+        "Write a formal email requesting a refund"
+    ],
+    "customer_support": [
+        "My order hasn't arrived yet",
+        "I was charged twice for my subscription",
+        "The app keeps crashing when I log in",
+        "How do I reset my password?",
+        "I want to return a damaged product",
+        "I need help with my account, it is locked"
+    ],
+    "personal_assist": [
+        "Schedule a meeting with John tomorrow at 3pm",
+        "Remind me to call mom at 6pm",
+        "Add buy groceries to my task list",
+        "Take a note: the wifi password is on the fridge",
+        "What's on my calendar for Friday?",
+        "Set a reminder for my dentist appointment"
+    ],
+    "content_creator": [
+        "Write a tweet about our product launch",
+        "Create an Instagram caption for a beach photo",
+        "Draft a LinkedIn post announcing my new job",
+        "Generate an image of a sunset over mountains",
+        "Come up with hashtags for a fitness post",
+        "Write a social media post for our summer sale"
+    ]
+}
+
+class IntentClassifier:
+    """
+    Nearest-centroid intent classifier over sentence embeddings
+
+    Confidence is the cosine-similarity margin between the best and the
+    runner-up tool, which separates intents far better than the raw
+    similarity (all embeddings of short English sentences are fairly
+    close to each other).
+    """
+    def __init__(
+        self,
+        embedding_model: Any,
+        examples: Optional[Dict[str, List[str]]] = None,
+        centroids_path: Optional[Path] = None
+    ):
+        self.embedding_model = embedding_model
+        self.examples = examples or INTENT_EXAMPLES
+        self.centroids_path = centroids_path or INTENT_CONFIG["centroids_path"]
+        self.labels = list(self.examples)
+        self.centroids = self._load_or_build_centroids()
+
+    def classify(
+        self,
+        text: Optional[str] = None,
+        embedding: Optional[List[float]] = None
+    ) -> Tuple[str, float]:
+        """
+        Get the closest tool and the confidence margin for a text or a
+        precomputed embedding of it
+        """
+        if embedding is None:
+            embedding = self.embedding_model.get_embeddings(text)
+        scores = self.centroids @ _normalize(np.asarray(embedding, dtype=np.float32))
+        order = np.argsort(-scores)
+        margin = float(scores[order[0]] - scores[order[1]]) if len(order) > 1 else 1.0
+        return self.labels[order[0]], margin
+
+    def match_intent_text(self, intent: str) -> str:
+        """
+        Map a free-text intent description from the LLM to a tool name
+        """
+        tool_mapping = {
+            "search": "web_search",
+            "email": "email",
+            "support": "customer_support",
+            "assist": "personal_assist",
+            "content": "content_creator"
+        }
+        
+        selected_tool = "personal_assist"  # default
+        for intent_key, tool_name in tool_mapping.items():
+            if intent_key in intent.lower():
+                selected_tool = tool_name
+                break
+                
+        return selected_tool
+
+    def _load_or_build_centroids(self) -> np.ndarray:
+        """Load precomputed centroids if they match the current examples, else build and save them"""
+        fingerprint = self._fingerprint()
+        path = Path(self.centroids_path)
+        if path.exists():
+            try:
+                saved = np.load(path)
+                if str(saved["fingerprint"]) == fingerprint:
+                    return saved["centroids"]
+            except Exception as e:
+                print(f"Could not load intent centroids: {str(e)}")
+
+        centroids = np.stack([
+            _normalize(np.mean(
+                _normalize(np.asarray(self.embedding_model.get_embeddings(self.examples[label]), dtype=np.float32)),
+                axis=0
+            ))
+            for label in self.labels
+        ])
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            np.savez(path, centroids=centroids, fingerprint=fingerprint)
+        except Exception as e:
+            print(f"Could not save intent centroids: {str(e)}")
+        return centroids
+
+    def _fingerprint(self) -> str:
+        """Identify the example set and embedding model the centroids were built from"""
+        model_name = getattr(self.embedding_model, "config", {}).get("model_name", "")
+        payload = json.dumps({"model": model_name, "examples": self.examples}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale a vector, or each row of a matrix, to unit length"""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
@@ -1,103 +1,167 @@
-from typing import Dict, Any
-from langgraph.graph import StateGraph
-from ..models.embedding_model import EmbeddingModel
+from typing import Dict, Any, Optional
+from ..memory.long_term import LongTermMemory
+from ..models.embedding_batcher import EmbeddingBatcher
 from ..models.llm_model import LLMModel
-from ..tools.web_search import WebSearchTool
-from ..tools.email_writer import EmailWriter
-from ..tools.customer_support import CustomerSupport
-from ..tools.personal_assist import PersonalAssistant
-from ..tools.content_creator import ContentCreator
+from ..tools.registry import default_tool_registry
+from ..config.settings import INTENT_CONFIG, WORKFLOW_CONFIG, TOOL_REGISTRY_CONFIG, LONG_TERM_MEMORY_CONFIG
+from .dag_executor import DAGExecutor
+from .intent_classifier import IntentClassifier
 
 class AgentWorkflow:
-    def __init__(self):
-        self.embedding_model = EmbeddingModel()
+    def __init__(self, long_term_memory: Optional[LongTermMemory] = None):
+        # Concurrent sessions share batched forward passes on one model
+        self.embedding_model = EmbeddingBatcher.shared()
         self.llm_model = LLMModel()
-        self.tools = {
-            "web_search": WebSearchTool(),
-            "email": EmailWriter(),
-            "customer_support": CustomerSupport(),
-            "personal_assist": PersonalAssistant(),
-            "content_creator": ContentCreator()
-        }
+        if long_term_memory is None and LONG_TERM_MEMORY_CONFIG["enabled"]:
+            long_term_memory = LongTermMemory.shared()
+        self.long_term_memory = long_term_memory
+        self.intent_classifier = IntentClassifier(self.embedding_model)
+        # Tools load on first use; ContentCreator alone pulls in Stable Diffusion
+        self.tools = default_tool_registry()
+        if TOOL_REGISTRY_CONFIG["warm_up"]:
+            self.tools.warm_up(TOOL_REGISTRY_CONFIG["warm_up"])
+        if TOOL_REGISTRY_CONFIG["max_idle"]:
+            self.tools.start_idle_reaper(
+                TOOL_REGISTRY_CONFIG["max_idle"],
+                memory_limit_mb=TOOL_REGISTRY_CONFIG["memory_limit_mb"]
+            )
+        self.executor = self.build_executor()
         
-    def build_workflow(self) -> StateGraph:
+    def build_workflow(self):
         """
         Build the LangGraph workflow
         """
+        # Only this legacy graph needs LangGraph; run() uses the DAG executor
+        from langgraph.graph import StateGraph
+
         # Initialize the graph
         graph = StateGraph()
         
         # Add nodes
-        graph.add_node("process_input", self._process_input)
-        graph.add_node("analyze_input", self._analyze_input)
+        graph.add_node("embed_input", self._embed_input)
+        graph.add_node("classify_intent", self._classify_intent)
+        graph.add_node("classify_sentiment", self._classify_sentiment)
+        graph.add_node("recall_memory", self._recall_memory)
         graph.add_node("route_to_tool", self._route_to_tool)
         graph.add_node("execute_tool", self._execute_tool)
         graph.add_node("generate_response", self._generate_response)
         
         # Define edges
-        graph.add_edge("process_input", "analyze_input")
-        graph.add_edge("analyze_input", "route_to_tool")
+        graph.add_edge("embed_input", "classify_intent")
+        graph.add_edge("classify_intent", "classify_sentiment")
+        graph.add_edge("classify_sentiment", "recall_memory")
+        graph.add_edge("recall_memory", "route_to_tool")
         graph.add_edge("route_to_tool", "execute_tool")
         graph.add_edge("execute_tool", "generate_response")
         
         return graph.compile()
     
-    def _process_input(self, state: Dict[str, Any]) -> Dict[str, Any]:
+    def build_executor(self) -> DAGExecutor:
+        """
+        Build the parallel executor: nodes are ordered by the state keys
+        they read and write, so independent ones run concurrently
+
+        Once the input is embedded, intent classification (which may need
+        an LLM round trip), sentiment and long-term memory recall all run
+        side by side; only routing waits for intent and sentiment, and only
+        the final response waits for the recalled turns (see
+        benchmarks/bench_workflow_dag.py).
+        """
+        executor = DAGExecutor(max_workers=WORKFLOW_CONFIG["max_workers"])
+        executor.add_node("embed_input", self._embed_input,
+                          requires=["input"], provides=["embeddings"])
+        executor.add_node("classify_intent", self._classify_intent,
+                          requires=["input", "embeddings"], provides=["intent"])
+        executor.add_node("classify_sentiment", self._classify_sentiment,
+                          requires=["embeddings"], provides=["sentiment"])
+        executor.add_node("recall_memory", self._recall_memory,
+                          requires=["input", "user_id", "embeddings"], provides=["recalled"])
+        executor.add_node("route_to_tool", self._route_to_tool,
+                          requires=["sentiment", "intent"], provides=["analysis", "selected_tool"])
+        executor.add_node("execute_tool", self._execute_tool,
+                          requires=["input", "analysis", "selected_tool"], provides=["tool_result"])
+        executor.add_node("generate_response", self._generate_response,
+                          requires=["input", "tool_result", "recalled"], provides=["response"])
+        return executor
+    
+    def run(self, user_input: str, user_id: Optional[str] = None) -> Dict[str, Any]:
         """
-        Process initial input and generate embeddings
+        Run the workflow for one input; the returned state includes
+        per-node and critical-path timings under "timings"
         """
-        input_text = state["input"]
-        embeddings = self.embedding_model.get_embeddings(input_text)
-        state["embeddings"] = embeddings
+        state, timings = self.executor.run({"input": user_input, "user_id": user_id})
+        state["timings"] = timings
         return state
     
-    def _analyze_input(self, state: Dict[str, Any]) -> Dict[str, Any]:
+    def _embed_input(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Analyze input to determine intent and sentiment
+        Process initial input: one encoder pass shared by every later node
+        """
+        return {"embeddings": self.embedding_model.get_embeddings(state["input"])}
+    
+    def _classify_sentiment(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sentiment from the input embeddings
+        """
+        return {"sentiment": self.embedding_model.classify_sentiment(state["embeddings"])}
+    
+    def _recall_memory(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
-        input_text = state["input"]
-        sentiment = self.embedding_model.get_sentiment(input_text)
+        Earlier turns of this user relevant to the input, if long-term memory is on
+        """
+        if self.long_term_memory is None or state["user_id"] is None:
+            return {"recalled": []}
+        try:
+            recalled = self.long_term_memory.recall(state["user_id"], state["input"], embedding=state["embeddings"])
+        except Exception as e:
+            print(f"Long-term memory recall error: {str(e)}")
+            recalled = []
+        return {"recalled": recalled}
+    
+    def _classify_intent(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Determine intent, i.e. which tool should handle the input
+        """
+        # Classify intent against the tool centroids, reusing the input embeddings
+        tool, confidence = self.intent_classifier.classify(embedding=state["embeddings"])
+        intent_source = "embedding"
         
-        # Determine intent using LLM
-        intent_prompt = f"Determine the intent of: {input_text}"
-        intent = self.llm_model.generate({"input": intent_prompt})
+        # Only ambiguous inputs pay for an LLM round trip
+        if confidence < INTENT_CONFIG["min_confidence"]:
+            intent_prompt = f"Determine the intent of: {state['input']}"
+            intent = self.llm_model.generate({"input": intent_prompt})["response"]
+            tool = self.intent_classifier.match_intent_text(intent)
+            intent_source = "llm"
         
-        state["analysis"] = {
-            "sentiment": sentiment,
-            "intent": intent
+        return {
+            "intent": {
+                "tool": tool,
+                "confidence": confidence,
+                "source": intent_source
+            }
         }
-        return state
     
     def _route_to_tool(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
         Route to appropriate tool based on analysis
         """
-        intent = state["analysis"]["intent"]
-        
-        # Map intent to tool
-        tool_mapping = {
-            "search": "web_search",
-            "email": "email",
-            "support": "customer_support",
-            "assist": "personal_assist",
-            "content": "content_creator"
+        intent = state["intent"]
+        return {
+            "analysis": {
+                "sentiment": state["sentiment"],
+                "intent": intent["tool"],
+                "confidence": intent["confidence"],
+                "intent_source": intent["source"]
+            },
+            "selected_tool": intent["tool"]
         }
-        
-        selected_tool = "personal_assist"  # default
-        for intent_key, tool_name in tool_mapping.items():
-            if intent_key in intent.lower():
-                selected_tool = tool_name
-                break
-                
-        state["selected_tool"] = selected_tool
-        return state
     
     def _execute_tool(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute selected tool
         """
         tool_name = state["selected_tool"]
-        tool = self.tools[tool_name]
+        tool = self.tools.get(tool_name)
         
         # Prepare tool input
         tool_input = {
@@ -120,8 +184,7 @@ class AgentWorkflow:
         else:
             result = tool.search(tool_input["query"])
             
-        state["tool_result"] = result
-        return state
+        return {"tool_result": result}
     
     def _generate_response(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -135,6 +198,4 @@ class AgentWorkflow:
             f"Generate a natural response for the user's input: {state['input']}"
         )
         
-        response = self.llm_model.generate({"input": prompt})
-        state["response"] = response
-        return state 
\ No newline at end of file
+        return {"response": self.llm_model.generate({"input": prompt, "recalled": state["recalled"]})}
\ No newline at end of file
@@ -9,34 +9,164 @@ load_dotenv()
 # Base project paths
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 MODEL_DIR = BASE_DIR / "models"
+# Caches and per-user state written at runtime (gitignored)
+DATA_DIR = Path(os.getenv("DATA_DIR", BASE_DIR / "data"))
 
 # Model configurations
 MODEL_CONFIG = {
     "embedding": {
         "model_name": "sentence-transformers/all-MiniLM-L6-v2",
-        "max_length": 512
+        "max_length": 512,
+        "max_concurrency": int(os.getenv("EMBEDDING_MAX_CONCURRENCY", 4)),  # Concurrent forward passes on the shared model
+        "batch_size": int(os.getenv("EMBEDDING_BATCH_SIZE", 32)),  # Most texts coalesced into one forward pass
+        "batch_wait_ms": float(os.getenv("EMBEDDING_BATCH_WAIT_MS", 5)),  # How long a request may wait for others to join
+        # CPU inference mode; benchmarks/bench_embedding_cpu.py compares speed and drift
+        "backend": os.getenv("EMBEDDING_BACKEND", "torch"),  # "torch" or "onnx" (needs onnxruntime)
+        "quantize": os.getenv("EMBEDDING_QUANTIZE", "false").lower() == "true",  # Dynamic int8 weights
+        "intra_op_threads": int(os.getenv("EMBEDDING_INTRA_OP_THREADS", 0)),  # 0 = library default
+        "inter_op_threads": int(os.getenv("EMBEDDING_INTER_OP_THREADS", 0)),
+        "onnx_dir": MODEL_DIR / "onnx",  # Exported (and quantized) ONNX models
+        "sentiment_head_path": MODEL_DIR / "sentiment_head.npz",  # From python -m src.models.train_sentiment_head
+        # Length bucketing: texts of similar token length share a padded batch
+        "length_bucketing": os.getenv("EMBEDDING_LENGTH_BUCKETING", "true").lower() == "true",
+        "bucket_size": int(os.getenv("EMBEDDING_BUCKET_SIZE", 32)),  # Most texts per forward pass
+        "max_batch_tokens": int(os.getenv("EMBEDDING_MAX_BATCH_TOKENS", 8192))  # Most padded tokens per forward pass
     },
     "llm": {
         "model_name": os.getenv("MODEL_NAME", "mixtral-8x7b-instruct-v0.1"),
         "temperature": float(os.getenv("TEMPERATURE", 0.7)),
         "top_p": float(os.getenv("TOP_P", 0.9)),
-        "max_length": int(os.getenv("MAX_LENGTH", 200))
+        "max_length": int(os.getenv("MAX_LENGTH", 200)),
+        "max_concurrency": int(os.getenv("LLM_MAX_CONCURRENCY", 16)),  # Upstream requests in flight per process (initial limit when adaptive)
+        "adaptive_concurrency": os.getenv("LLM_ADAPTIVE_CONCURRENCY", "true").lower() == "true",  # AIMD limit from latency and 429/5xx
+        "min_concurrency": 1,
+        "max_concurrency_limit": int(os.getenv("LLM_MAX_CONCURRENCY_LIMIT", 64)),
+        "queue_size": int(os.getenv("LLM_QUEUE_SIZE", 100)),  # Requests waiting for a slot before rejecting
+        "queue_timeout": float(os.getenv("LLM_QUEUE_TIMEOUT", 10)),  # Longest wait for a slot; rejected up front if it can't be met
+        "latency_tolerance": 2.0,  # Recent/long-run latency ratio treated as overload
+        "coalesce": os.getenv("LLM_COALESCE", "true").lower() == "true",  # Identical concurrent prompts share one request
+        # Seconds per request, retries included; for streams the time to the
+        # first token, so long generations aren't cut off. 0 waits forever
+        "timeout": float(os.getenv("LLM_TIMEOUT", 30)),
+        "retries": int(os.getenv("LLM_RETRIES", 2)),
+        "backoff_base": 0.2,  # Seconds; retry n sleeps a random time up to backoff_base * 2**n
+        "backoff_max": 2.0,
+        "hedge": os.getenv("LLM_HEDGE", "false").lower() == "true",  # Second request after the hedge_quantile latency
+        "hedge_quantile": 0.95,
+        "hedge_min_samples": 20,
+        "breaker_failures": int(os.getenv("LLM_BREAKER_FAILURES", 5)),  # Consecutive failures that open the breaker
+        "breaker_reset": float(os.getenv("LLM_BREAKER_RESET", 30))  # Seconds before a probe request is let through
     },
     "speech_to_text": {
-        "model_name": "facebook/wav2vec2-base-960h"
+        "model_name": "facebook/wav2vec2-base-960h",
+        "max_concurrency": 1
     },
     "text_to_speech": {
-        "model_name": "facebook/fastspeech2-en-ljspeech"
+        "model_name": "facebook/fastspeech2-en-ljspeech",
+        "max_concurrency": 1
     },
     "image": {
         "model_name": "stabilityai/stable-diffusion-2-1"
     }
 }
 
+# Persistent embedding cache, shared by all processes on a host
+EMBEDDING_CACHE_CONFIG = {
+    "enabled": os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true",
+    "dir": Path(os.getenv("EMBEDDING_CACHE_DIR", DATA_DIR / "embedding_cache")),  # Memory-mapped float16 vectors
+    "memory_entries": int(os.getenv("EMBEDDING_CACHE_MEMORY_ENTRIES", 10000)),  # In-process LRU tier
+    "shared": os.getenv("EMBEDDING_CACHE_SHARED", "false").lower() == "true",  # Also memoize calls in Redis
+    "shared_ttl": int(os.getenv("EMBEDDING_CACHE_SHARED_TTL", 86400))
+}
+
 # Memory configuration
 MEMORY_CONFIG = {
     "window_size": 5,  # Number of conversations to remember
-    "max_tokens": 1000
+    "max_tokens": int(os.getenv("MEMORY_MAX_TOKENS", 1000)),  # Token budget for the remembered turns
+    # Counts tokens for the budget; the embedding tokenizer is already cached locally
+    "tokenizer": os.getenv("MEMORY_TOKENIZER", MODEL_CONFIG["embedding"]["model_name"]),
+    # Fold the oldest turns into a rolling summary in the background; opt-in
+    # because each compaction is an extra LLM call, about one every
+    # window_size - keep_recent turns
+    "compaction": os.getenv("MEMORY_COMPACTION", "false").lower() == "true",
+    "compact_at": float(os.getenv("MEMORY_COMPACT_AT", 0.75)),  # Fraction of max_tokens that triggers it
+    "keep_recent": int(os.getenv("MEMORY_KEEP_RECENT", 2)),  # Latest turns always kept verbatim
+    "summary_max_words": int(os.getenv("MEMORY_SUMMARY_MAX_WORDS", 120)),
+    "summary_workers": int(os.getenv("MEMORY_SUMMARY_WORKERS", 2))
+}
+
+# Long-term memory: every turn is embedded, persisted per user and the
+# most relevant earlier turns are added to the prompt
+LONG_TERM_MEMORY_CONFIG = {
+    "enabled": os.getenv("LONG_TERM_MEMORY_ENABLED", "false").lower() == "true",
+    "dir": Path(os.getenv("LONG_TERM_MEMORY_DIR", DATA_DIR / "long_term_memory")),
+    "top_k": int(os.getenv("LONG_TERM_MEMORY_TOP_K", 3)),  # Retrieved turns per prompt
+    "min_similarity": float(os.getenv("LONG_TERM_MEMORY_MIN_SIMILARITY", 0.3)),
+    "skip_recent": 3,  # Latest turns already in the prompt as recent memory
+    # "numpy" (exact), "hnsw" (approximate, needs hnswlib) or "auto": exact until ann_threshold turns
+    "index": os.getenv("LONG_TERM_MEMORY_INDEX", "auto"),
+    "ann_threshold": int(os.getenv("LONG_TERM_MEMORY_ANN_THRESHOLD", 20000)),
+    "snapshot_every": 1000,  # Turns between HNSW snapshots; later turns are re-inserted on load
+    "max_loaded_users": int(os.getenv("LONG_TERM_MEMORY_MAX_LOADED_USERS", 100))  # Stores kept in RAM
+}
+
+# Redis cache configuration
+CACHE_CONFIG = {
+    "host": os.getenv("REDIS_HOST", "localhost"),
+    "port": int(os.getenv("REDIS_PORT", 6379)),
+    "db": int(os.getenv("REDIS_DB", 0)),
+    "max_connections": int(os.getenv("REDIS_MAX_CONNECTIONS", 50)),  # Shared by every thread in the process
+    "socket_timeout": float(os.getenv("REDIS_SOCKET_TIMEOUT", 1.0)),  # Seconds; a slow cache is a miss
+    "connect_timeout": float(os.getenv("REDIS_CONNECT_TIMEOUT", 1.0)),
+    # In-process LRU tier in front of Redis; 0 entries disables it
+    "local_entries": int(os.getenv("CACHE_LOCAL_ENTRIES", 10000)),
+    "local_max_bytes": int(os.getenv("CACHE_LOCAL_MAX_BYTES", 64 * 1024 * 1024)),  # Pickled size of the values
+    "local_ttl": float(os.getenv("CACHE_LOCAL_TTL", 60)),  # Seconds; upper bound on staleness without invalidation
+    "invalidation": os.getenv("CACHE_INVALIDATION", "true").lower() == "true",  # Redis pub/sub between processes
+    "channel": os.getenv("CACHE_INVALIDATION_CHANNEL", "cache:invalidate"),
+    # Value encoding, see src/utils/codecs.py
+    "vector_dtype": os.getenv("CACHE_VECTOR_DTYPE", "float32"),  # "float32" or "float16" (half the bytes)
+    "compression": os.getenv("CACHE_COMPRESSION", "none"),  # "none", "zstd" or "lz4" (optional packages)
+    "compress_min_bytes": int(os.getenv("CACHE_COMPRESS_MIN_BYTES", 1024)),
+    "allow_pickle": os.getenv("CACHE_ALLOW_PICKLE", "false").lower() == "true",  # Read values cached before the codec
+    "retry_after": float(os.getenv("CACHE_RETRY_AFTER", 5)),  # Seconds Redis is skipped after a connection error
+    "memoize": os.getenv("CACHE_MEMOIZE", "true").lower() == "true",  # @cached functions (tools, embeddings)
+    "tool_ttl": int(os.getenv("CACHE_TOOL_TTL", 3600)),
+    # Stampede protection for get_or_compute / @cached
+    "lease_ttl": float(os.getenv("CACHE_LEASE_TTL", 30)),  # Seconds one process may hold a recompute lease; 0 disables
+    "lease_poll": 0.05,  # Seconds between checks while another process recomputes
+    "early_refresh_beta": float(os.getenv("CACHE_EARLY_REFRESH_BETA", 1.0)),  # 0 disables early refresh
+    "stale_ttl": int(os.getenv("CACHE_STALE_TTL", 0)),  # Seconds an expired value may be served while refreshing
+    "tool_stale_ttl": int(os.getenv("CACHE_TOOL_STALE_TTL", 300)),
+    "refresh_workers": 4
+}
+
+# Response cache configuration
+RESPONSE_CACHE_CONFIG = {
+    "enabled": os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true",
+    "ttl": int(os.getenv("RESPONSE_CACHE_TTL", 3600)),  # Seconds
+    "max_temperature": float(os.getenv("RESPONSE_CACHE_MAX_TEMPERATURE", 1.0))  # Hotter sampling is not replayed; covers the default TEMPERATURE so repeated questions hit
+}
+
+# Semantic (paraphrase-matching) cache configuration
+SEMANTIC_CACHE_CONFIG = {
+    "enabled": os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true",
+    "threshold": float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.92)),  # Minimum cosine similarity for a hit
+    "max_entries": int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", 10000)),
+    "ttl": int(os.getenv("SEMANTIC_CACHE_TTL", 3600)),  # Seconds
+    "index": os.getenv("SEMANTIC_CACHE_INDEX", "numpy"),  # "numpy" (exact) or "hnsw" (approximate, needs hnswlib)
+    "search_k": 5  # Nearest entries checked per lookup, so expired ones don't hide a valid match
+}
+
+# Intent classification configuration
+INTENT_CONFIG = {
+    "min_confidence": float(os.getenv("INTENT_MIN_CONFIDENCE", 0.05)),  # Similarity margin below which the LLM decides
+    "centroids_path": Path(os.getenv("INTENT_CENTROIDS_PATH", DATA_DIR / "intent_centroids.npz"))
+}
+
+# Workflow configuration
+WORKFLOW_CONFIG = {
+    "max_workers": int(os.getenv("WORKFLOW_MAX_WORKERS", 4))  # Threads for running independent nodes concurrently
 }
 
 # Tool configurations
@@ -52,6 +182,13 @@ TOOL_CONFIG = {
     }
 }
 
+# Tool registry configuration
+TOOL_REGISTRY_CONFIG = {
+    "warm_up": [t for t in os.getenv("TOOL_WARM_UP", "").split(",") if t],  # Tools to load in the background at startup
+    "max_idle": int(os.getenv("TOOL_MAX_IDLE", 1800)),  # Seconds unused before a tool may be unloaded; 0 disables
+    "memory_limit_mb": float(os.getenv("TOOL_MEMORY_LIMIT_MB", 0)) or None  # Only unload while RSS is above this
+}
+
 # API Keys
 API_KEYS = {
     "nvidia": os.getenv("NVIDIA_API_KEY"),
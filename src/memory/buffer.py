@@ -1,12 +1,168 @@
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from ..config.settings import MEMORY_CONFIG
+
 class WindowBuffer:
-    def __init__(self, max_size: int = 10):
-        self.buffer = []
-        self.max_size = max_size
-        
-    def add(self, user_input: str, response: str):
-        self.buffer.append({"input": user_input, "response": response})
-        if len(self.buffer) > self.max_size:
-            self.buffer.pop(0)
-            
-    def get_context(self):
-        return self.buffer 
\ No newline at end of file
+    """
+    Recent conversation turns, bounded by both a turn count and a token
+    budget
+
+    Each turn's prompt fragment and token count are computed once when it
+    is added; a running total decides how many of the oldest turns to
+    evict. The formatted history is joined from the kept fragments only
+    when asked for, and cached until the next add or eviction, so adding
+    a turn never re-tokenizes, re-formats or copies the rest of the window.
+
+    With a summarizer, once the window passes compact_at of its budget (or
+    fills up) the oldest turns are handed to it in the background and
+    replaced by the rolling summary when it arrives; adds never wait.
+    Turns evicted before they were summarized are kept aside and go into
+    the next summary, so nothing leaves the window unrecorded.
+    """
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        summarizer: Optional[Any] = None
+    ):
+        self.window_size = max_size or MEMORY_CONFIG["window_size"]
+        self.max_tokens = max_tokens or MEMORY_CONFIG["max_tokens"]
+        self.summarizer = summarizer
+        self.buffer: deque = deque()
+        self.total_tokens = 0
+        self.summary = ""
+        self.summary_tokens = 0
+        self.compactions = 0
+        self._seq = 0
+        self._compacting = False
+        self._generation = 0
+        self._unsummarized: List[Dict[str, Any]] = []
+        self._summarized_seq = 0
+        self._history: Optional[str] = None
+        self._lock = threading.RLock()
+
+    def add(self, user_input: str, response: str) -> None:
+        """
+        Add a conversation turn, evicting the oldest ones as needed
+        """
+        fragment = f"User: {user_input}\nAssistant: {response}"
+        tokens = count_tokens(fragment)
+        with self._lock:
+            self._seq += 1
+            self.buffer.append({
+                "input": user_input,
+                "response": response,
+                "timestamp": time.time(),
+                "tokens": tokens,
+                "fragment": fragment,
+                "seq": self._seq
+            })
+            self.total_tokens += tokens
+            self._history = None
+            self._evict(lambda: len(self.buffer) > self.window_size or self._over(self.max_tokens))
+            if self.summarizer is not None and not self._compacting and self._wants_compaction():
+                self._compact()
+
+    def get_context(self) -> List[Dict[str, Any]]:
+        """
+        Get the current conversation context
+        """
+        with self._lock:
+            return [
+                {"input": t["input"], "response": t["response"], "timestamp": t["timestamp"], "tokens": t["tokens"]}
+                for t in self.buffer
+            ]
+
+    def get_formatted_history(self) -> str:
+        """
+        Get formatted conversation history for LLM context
+        """
+        with self._lock:
+            if self._history is None:
+                self._history = "\n".join(turn["fragment"] for turn in self.buffer)
+            return self._history
+
+    def clear(self) -> None:
+        """
+        Clear the memory buffer
+        """
+        with self._lock:
+            self.buffer.clear()
+            self.total_tokens = 0
+            self.summary = ""
+            self.summary_tokens = 0
+            # A summary still in flight belongs to the cleared conversation
+            self._compacting = False
+            self._generation += 1
+            self._unsummarized = []
+            self._history = None
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def _over(self, budget: float) -> bool:
+        return self.total_tokens + self.summary_tokens > budget
+
+    def _evict(self, should_evict) -> None:
+        """Drop oldest turns while should_evict() holds"""
+        while self.buffer and should_evict():
+            evicted = self.buffer.popleft()
+            self.total_tokens -= evicted["tokens"]
+            self._history = None
+            if self.summarizer is not None and evicted["seq"] > self._summarized_seq:
+                self._unsummarized.append(evicted)
+        # Bounded in case the summarizer keeps failing
+        del self._unsummarized[:-self.window_size]
+
+    def _wants_compaction(self) -> bool:
+        if self._unsummarized:
+            return True
+        if len(self.buffer) <= MEMORY_CONFIG["keep_recent"]:
+            return False
+        return len(self.buffer) >= self.window_size or self._over(MEMORY_CONFIG["compact_at"] * self.max_tokens)
+
+    def _compact(self) -> None:
+        """Send evicted turns and all but the latest keep_recent to the summarizer"""
+        kept = list(self.buffer)
+        turns = self._unsummarized + kept[:max(len(kept) - MEMORY_CONFIG["keep_recent"], 0)]
+        self._compacting = True
+        generation = self._generation
+        future = self.summarizer.submit(self.summary, turns)
+        future.add_done_callback(lambda f: self._apply_summary(f.result(), turns[-1]["seq"], generation))
+
+    def _apply_summary(self, summary: Optional[str], last_seq: int, generation: int) -> None:
+        """Swap the summarized turns for the new summary; runs on the summarizer's thread"""
+        tokens = count_tokens(summary) if summary else 0
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._compacting = False
+            if not summary:
+                return  # Keep the turns; the next add retries
+            self.summary = summary
+            self.summary_tokens = tokens
+            self.compactions += 1
+            self._summarized_seq = last_seq
+            self._unsummarized = [t for t in self._unsummarized if t["seq"] > last_seq]
+            self._evict(lambda: self.buffer[0]["seq"] <= last_seq or self._over(self.max_tokens))
+
+def count_tokens(text: str) -> int:
+    """Token count of text under MEMORY_CONFIG["tokenizer"]; a regex estimate if it can't be loaded"""
+    tokenizer = _tokenizer(MEMORY_CONFIG["tokenizer"])
+    if tokenizer is None:
+        return len(re.findall(r"\w+|[^\w\s]", text))
+    return len(tokenizer.encode(text, add_special_tokens=False))
+
+@lru_cache(maxsize=None)
+def _tokenizer(name: str):
+    # Loaded once per process; only the vocabulary, not the model weights
+    try:
+        from transformers import AutoTokenizer
+        return AutoTokenizer.from_pretrained(name)
+    except Exception as e:
+        print(f"Could not load tokenizer {name}, estimating token counts: {str(e)}")
+        return None
@@ -0,0 +1,309 @@
+import hashlib
+import importlib.util
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import numpy as np
+from ..config.settings import LONG_TERM_MEMORY_CONFIG
+from ..utils.vector_index import create_index
+
+_warned_no_hnswlib = False
+
+def _have_hnswlib() -> bool:
+    """Whether the HNSW backend can be used; says so once when it can't"""
+    global _warned_no_hnswlib
+    if importlib.util.find_spec("hnswlib") is not None:
+        return True
+    if not _warned_no_hnswlib:
+        _warned_no_hnswlib = True
+        print("hnswlib isn't installed; long-term memory stays on exact search (pip install hnswlib)")
+    return False
+
+class UserMemory:
+    """
+    One user's turns: an append-only JSON-lines file of turns, a float32
+    file of their embeddings (row i is turn i) and a vector index over
+    them, rebuilt from the files on load
+
+    With the "auto" backend the exact NumPy index is used until the store
+    reaches ann_threshold turns, then an HNSW graph takes over so recall
+    stays fast. The graph is snapshotted to disk periodically; on load
+    only the turns added after the last snapshot are re-inserted.
+    """
+    def __init__(self, directory: Path, index_backend: str):
+        self.directory = directory
+        self.index_backend = "numpy" if index_backend == "hnsw" and not _have_hnswlib() else index_backend
+        self.turns_path = directory / "turns.jsonl"
+        self.vectors_path = directory / "vectors.f32"
+        self.meta_path = directory / "meta.json"
+        self.snapshot_path = directory / "index.hnsw"
+        self.turns: List[Dict[str, Any]] = []
+        self.index = None
+        self.backend = None
+        self.dim = None
+        self.lock = threading.Lock()
+        self._load()
+
+    def add(self, turn: Dict[str, Any], vector: np.ndarray) -> None:
+        """Append a turn; called from a single writer thread"""
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        with self.lock:
+            if self.index is None:
+                self.dim = len(vector)
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self.meta_path.write_text(json.dumps({"dim": self.dim}))
+                self.backend = "numpy" if self.index_backend == "auto" else self.index_backend
+                self.index = create_index(self.dim, self.backend)
+            # Vector first: a turn line is only ever written after its vector
+            with open(self.vectors_path, "ab") as f:
+                f.write(vector.tobytes())
+            with open(self.turns_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(turn) + "\n")
+            self.index.add(len(self.turns), vector)
+            self.turns.append(turn)
+            count = len(self.turns)
+
+        if self.backend == "numpy" and self._wants_ann(count):
+            self._switch_to_ann(count)
+        elif self.backend == "hnsw" and count % LONG_TERM_MEMORY_CONFIG["snapshot_every"] == 0:
+            with self.lock:
+                self._snapshot()
+
+    def search(self, vector: np.ndarray, k: int, skip_recent: int, min_similarity: float) -> List[Dict[str, Any]]:
+        with self.lock:
+            if self.index is None:
+                return []
+            newest = len(self.turns) - skip_recent
+            matches = self.index.search(vector, k=k + skip_recent)
+            return [
+                {**self.turns[turn_id], "score": score}
+                for turn_id, score in matches
+                if turn_id < newest and score >= min_similarity
+            ][:k]
+
+    def _wants_ann(self, count: int) -> bool:
+        if self.index_backend != "auto" or count < LONG_TERM_MEMORY_CONFIG["ann_threshold"]:
+            return False
+        return _have_hnswlib()
+
+    def _switch_to_ann(self, count: int) -> None:
+        """Build the HNSW graph outside the lock; recall keeps using the exact index meanwhile"""
+        index = self._build_hnsw(count)
+        with self.lock:
+            self.index, self.backend = index, "hnsw"
+            self._snapshot()
+
+    def _build_hnsw(self, count: int, from_snapshot: bool = False):
+        from ..utils.vector_index import HNSWIndex
+
+        start = 0
+        index = None
+        if from_snapshot and self.snapshot_path.exists():
+            try:
+                index = HNSWIndex.load(self.snapshot_path, self.dim)
+                start = len(index)
+            except Exception as e:
+                print(f"Could not load memory index snapshot: {str(e)}")
+        if index is None or start > count:
+            index, start = create_index(self.dim, "hnsw", capacity=max(1024, count * 2)), 0
+        if count > start:
+            vectors = np.fromfile(self.vectors_path, dtype=np.float32, count=count * self.dim)
+            index.add_many(np.arange(start, count), vectors[start * self.dim:].reshape(-1, self.dim))
+            if from_snapshot:
+                index.save(self.snapshot_path)
+        return index
+
+    def _snapshot(self) -> None:
+        try:
+            self.index.save(self.snapshot_path)
+        except Exception as e:
+            print(f"Could not save memory index snapshot: {str(e)}")
+
+    def _load(self) -> None:
+        if not self.meta_path.exists():
+            return
+        self.dim = json.loads(self.meta_path.read_text())["dim"]
+        turns, ends = [], []
+        if self.turns_path.exists():
+            with open(self.turns_path, "rb") as f:
+                offset = 0
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # Torn final line from a crash
+                    turns.append(json.loads(line))
+                    offset += len(line)
+                    ends.append(offset)
+        vector_count = self.vectors_path.stat().st_size // (self.dim * 4) if self.vectors_path.exists() else 0
+        count = min(len(turns), vector_count)
+
+        # Drop whatever a crash left half-written so appends stay aligned
+        if self.vectors_path.exists() and self.vectors_path.stat().st_size != count * self.dim * 4:
+            with open(self.vectors_path, "r+b") as f:
+                f.truncate(count * self.dim * 4)
+        turns_size = ends[count - 1] if count else 0
+        if self.turns_path.exists() and self.turns_path.stat().st_size != turns_size:
+            with open(self.turns_path, "r+b") as f:
+                f.truncate(turns_size)
+        self.turns = turns[:count]
+
+        if self.index_backend == "hnsw" or self._wants_ann(count):
+            self.backend = "hnsw"
+            self.index = self._build_hnsw(count, from_snapshot=True)
+        else:
+            self.backend = "numpy"
+            self.index = create_index(self.dim, "numpy", capacity=max(1024, count * 2))
+            if count:
+                vectors = np.fromfile(self.vectors_path, dtype=np.float32, count=count * self.dim)
+                self.index.add_many(np.arange(count), vectors.reshape(count, self.dim))
+
+class LongTermMemory:
+    """
+    Per-user conversation memory that outlives the prompt window
+
+    Every turn is embedded and persisted; recall() returns the earlier
+    turns most similar to the new input so they can be added to the
+    prompt. Stores are loaded on first use and the least recently used
+    ones are dropped from RAM past max_loaded_users, but never while a
+    write or search is using them: a second instance of a store being
+    written would reload (and truncate) its files under a different lock.
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        embedding_model: Any,
+        directory: Optional[Path] = None,
+        index_backend: Optional[str] = None,
+        max_loaded_users: Optional[int] = None
+    ):
+        self.embedding_model = embedding_model
+        self.directory = Path(directory or LONG_TERM_MEMORY_CONFIG["dir"])
+        self.index_backend = index_backend or LONG_TERM_MEMORY_CONFIG["index"]
+        self.max_loaded_users = max_loaded_users or LONG_TERM_MEMORY_CONFIG["max_loaded_users"]
+        self.users: "OrderedDict[str, UserMemory]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Per-user locks held while a store loads from disk, so one slow
+        # load doesn't block recall for everyone else
+        self._loading: Dict[str, threading.Lock] = {}
+        # Writes and searches in progress per user; pinned stores aren't evicted
+        self._pins: Dict[str, int] = {}
+        # One writer keeps each user's turns in conversation order
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="long-term-memory")
+        self.recall_time = 0.0
+        self.recalls = 0
+
+    @classmethod
+    def shared(cls) -> "LongTermMemory":
+        """Get the process-wide memory over the shared embedding model"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                from ..models.embedding_batcher import EmbeddingBatcher
+                cls._shared = cls(EmbeddingBatcher.shared())
+            return cls._shared
+
+    def remember(self, user_id: str, user_input: str, response: str, background: bool = True) -> Optional[Future]:
+        """Store a turn; embedding and disk writes happen off the chat path by default"""
+        turn = {"input": user_input, "response": response, "timestamp": time.time()}
+        if not background:
+            self._store(user_id, turn)
+            return None
+        return self._writer.submit(self._store, user_id, turn)
+
+    def recall(
+        self,
+        user_id: str,
+        query: str,
+        k: Optional[int] = None,
+        embedding: Optional[List[float]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get up to k earlier turns relevant to the query, most similar first,
+        leaving out the latest turns that are in the prompt already
+        """
+        if embedding is None:
+            embedding = self.embedding_model.get_embeddings(query)
+        start = time.perf_counter()
+        with self._pinned(user_id) as memory:
+            turns = memory.search(
+                np.asarray(embedding, dtype=np.float32),
+                k=LONG_TERM_MEMORY_CONFIG["top_k"] if k is None else k,
+                skip_recent=LONG_TERM_MEMORY_CONFIG["skip_recent"],
+                min_similarity=LONG_TERM_MEMORY_CONFIG["min_similarity"]
+            )
+        self.recall_time += time.perf_counter() - start
+        self.recalls += 1
+        return turns
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loaded_users": len(self.users),
+            "recalls": self.recalls,
+            "mean_recall_time": self.recall_time / self.recalls if self.recalls else 0.0
+        }
+
+    def _store(self, user_id: str, turn: Dict[str, Any]) -> None:
+        try:
+            text = f"User: {turn['input']}\nAssistant: {turn['response']}"
+            vector = self.embedding_model.get_embeddings(text)
+            with self._pinned(user_id) as memory:
+                memory.add(turn, vector)
+        except Exception as e:
+            print(f"Long-term memory error: {str(e)}")
+
+    @contextmanager
+    def _pinned(self, user_id: str) -> Iterator[UserMemory]:
+        """The user's store, kept loaded (and the only instance) until the block exits"""
+        memory = self._user(user_id, pin=True)
+        try:
+            yield memory
+        finally:
+            with self._lock:
+                self._pins[user_id] -= 1
+                if not self._pins[user_id]:
+                    del self._pins[user_id]
+                self._evict()
+
+    def _user(self, user_id: str, pin: bool = False) -> UserMemory:
+        with self._lock:
+            memory = self._cached_user(user_id, pin)
+            if memory is not None:
+                return memory
+            loading = self._loading.setdefault(user_id, threading.Lock())
+
+        with loading:
+            with self._lock:
+                # Another thread may have loaded it while we waited
+                memory = self._cached_user(user_id, pin)
+                if memory is not None:
+                    return memory
+            # Hashed so arbitrary user ids are safe directory names
+            name = hashlib.sha256(str(user_id).encode("utf-8")).hexdigest()[:32]
+            memory = UserMemory(self.directory / name, self.index_backend)
+            with self._lock:
+                self.users[user_id] = memory
+                self._loading.pop(user_id, None)
+                if pin:
+                    self._pins[user_id] = self._pins.get(user_id, 0) + 1
+                self._evict()
+            return memory
+
+    def _cached_user(self, user_id: str, pin: bool) -> Optional[UserMemory]:
+        """Loaded store for user_id, marked recently used; caller holds _lock"""
+        memory = self.users.get(user_id)
+        if memory is not None:
+            self.users.move_to_end(user_id)
+            if pin:
+                self._pins[user_id] = self._pins.get(user_id, 0) + 1
+        return memory
+
+    def _evict(self) -> None:
+        """Drop least recently used stores past max_loaded_users, skipping pinned ones; caller holds _lock"""
+        excess = len(self.users) - self.max_loaded_users
+        for user_id in [u for u in self.users if u not in self._pins][:max(excess, 0)]:
+            del self.users[user_id]
@@ -0,0 +1,68 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from ..config.settings import MEMORY_CONFIG
+
+SUMMARY_PROMPT = """Summarize the conversation below for an assistant that will continue it.
+Keep names, facts, preferences, decisions and open questions; drop greetings and filler.
+Write at most {max_words} words of plain prose.
+{previous}
+Conversation:
+{conversation}
+
+Summary:"""
+
+class ConversationSummarizer:
+    """
+    Folds the oldest turns of a conversation into a rolling summary
+
+    Summaries are produced on a small process-wide worker pool so the
+    chat path only ever submits work; a WindowBuffer applies the result
+    whenever it arrives. Each summarization takes an upstream slot like
+    any other LLM call, so the pool's concurrency cap still holds.
+    """
+    _executor = None
+    _executor_lock = threading.Lock()
+
+    def __init__(self, llm: Any, max_words: Optional[int] = None):
+        self.llm = llm
+        self.max_words = max_words or MEMORY_CONFIG["summary_max_words"]
+        self.summaries = 0
+        self.failures = 0
+
+    def submit(self, summary: str, turns: List[Dict[str, Any]]) -> Future:
+        """Summarize in the background; the future resolves to the new summary, or None on failure"""
+        return self._workers().submit(self._run, summary, turns)
+
+    def summarize(self, summary: str, turns: List[Dict[str, Any]]) -> str:
+        """Fold the turns into the previous summary with one LLM call"""
+        conversation = "\n".join(f"User: {t['input']}\nAssistant: {t['response']}" for t in turns)
+        prompt = SUMMARY_PROMPT.format(
+            max_words=self.max_words,
+            previous=f"\nSummary so far:\n{summary}\n" if summary else "",
+            conversation=conversation
+        )
+        with self.llm.pool.slot():
+            response = self.llm.client.invoke(prompt)
+        content = response.content if hasattr(response, 'content') else str(response)
+        return content.strip()
+
+    def _run(self, summary: str, turns: List[Dict[str, Any]]) -> Optional[str]:
+        try:
+            result = self.summarize(summary, turns)
+            self.summaries += 1
+            return result or None
+        except Exception as e:
+            print(f"Summarization error: {str(e)}")
+            self.failures += 1
+            return None
+
+    @classmethod
+    def _workers(cls) -> ThreadPoolExecutor:
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=MEMORY_CONFIG["summary_workers"],
+                    thread_name_prefix="memory-summarizer"
+                )
+            return cls._executor
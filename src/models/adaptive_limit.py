@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+class LimitExceeded(RuntimeError):
+    """The upstream is at its concurrency limit and the queue can't take the request in time"""
+    pass
+
+class _Waiter:
+    def __init__(self, wake: Callable[[], None]):
+        self.wake = wake
+        self.granted = False
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for one upstream, learned from latency and errors
+
+    While the limit is in use every success raises it by 1/limit, about +1
+    per round trip. An overload signal (429/5xx/timeout, or recent latency
+    above latency_tolerance times the long-run average) multiplies it by
+    backoff, at most once per round trip. Requests over the limit wait in
+    a FIFO queue for up to queue_timeout seconds; they are rejected up
+    front when the queue is full or its expected wait is already longer.
+    Threads and coroutines on any event loop share the one limit.
+    """
+    def __init__(
+        self,
+        initial_limit: int = 16,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        max_queue: int = 100,
+        queue_timeout: float = 10.0,
+        latency_tolerance: float = 2.0,
+        backoff: float = 0.9
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.rejected = 0
+        self.decreases = 0
+        self._short_latency: Optional[float] = None
+        self._long_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._waiters: Deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a slot, waiting in the queue if needed; raises LimitExceeded"""
+        with self._lock:
+            if self._try_enter():
+                return
+            event = threading.Event()
+            waiter = self._enqueue(event.set)
+        event.wait(self.queue_timeout)
+        with self._lock:
+            if waiter.granted:
+                return
+            self._waiters.remove(waiter)
+            self.rejected += 1
+        raise LimitExceeded(f"No upstream slot within {self.queue_timeout:.1f}s")
+
+    async def aacquire(self) -> None:
+        """Async version of acquire"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_enter():
+                return
+            future = loop.create_future()
+            waiter = self._enqueue(lambda: loop.call_soon_threadsafe(_resolve, future))
+        try:
+            await asyncio.wait([future], timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self.in_flight -= 1
+                    self._wake()
+                else:
+                    self._waiters.remove(waiter)
+            raise
+        with self._lock:
+            if waiter.granted:
+                return
+            self._waiters.remove(waiter)
+            self.rejected += 1
+        raise LimitExceeded(f"No upstream slot within {self.queue_timeout:.1f}s")
+
+    def release(self, started: float, latency: Optional[float] = None, overloaded: bool = False) -> None:
+        """
+        Give the slot back and adapt the limit
+
+        Args:
+            started: time.monotonic() when the request went upstream
+            latency: Seconds it took, or None if not comparable (streams)
+            overloaded: The upstream rejected or timed out the request
+        """
+        with self._lock:
+            self.in_flight -= 1
+            if overloaded or self._congested(latency):
+                # Requests sent before the last decrease saw the old limit
+                if started > self._last_decrease:
+                    self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                    self._last_decrease = time.monotonic()
+                    self.decreases += 1
+            elif self.in_flight + 1 >= self.limit / 2:
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+            self._wake()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 1),
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "queued": len(self._waiters),
+            "rejected": self.rejected,
+            "decreases": self.decreases
+        }
+
+    def _try_enter(self) -> bool:
+        if self._waiters or self.in_flight >= max(int(self.limit), 1):
+            return False
+        self._enter()
+        return True
+
+    def _enter(self) -> None:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _enqueue(self, wake: Callable[[], None]) -> _Waiter:
+        position = len(self._waiters) + 1
+        if position > self.max_queue:
+            self.rejected += 1
+            raise LimitExceeded("Upstream queue is full")
+        # A slot frees up roughly every latency / limit seconds
+        expected_wait = position * (self._long_latency or 0.0) / max(int(self.limit), 1)
+        if expected_wait > self.queue_timeout:
+            self.rejected += 1
+            raise LimitExceeded(f"Expected queue wait {expected_wait:.1f}s exceeds {self.queue_timeout:.1f}s")
+        waiter = _Waiter(wake)
+        self._waiters.append(waiter)
+        return waiter
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < max(int(self.limit), 1):
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+            self._enter()
+            waiter.wake()
+
+    def _congested(self, latency: Optional[float]) -> bool:
+        """Track short- and long-run average latency; True when the short one runs away"""
+        if latency is None:
+            return False
+        if self._long_latency is None:
+            self._short_latency = self._long_latency = latency
+            return False
+        self._short_latency = 0.8 * self._short_latency + 0.2 * latency
+        self._long_latency = 0.99 * self._long_latency + 0.01 * latency
+        return self._short_latency > self.latency_tolerance * self._long_latency
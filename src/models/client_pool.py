@@ -0,0 +1,169 @@
+import asyncio
+import threading
+import time
+import weakref
+from contextlib import contextmanager, asynccontextmanager
+from typing import Any, Callable, Dict, Hashable, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from ..config.settings import MODEL_CONFIG
+from .adaptive_limit import AdaptiveLimiter
+from .resilience import is_overload
+from ..utils.single_flight import SingleFlight
+
+class ClientPool:
+    """
+    Process-wide registry of upstream LLM clients with a bound on the
+    number of requests in flight
+
+    Clients are created once per configuration and shared by every
+    LLMModel, so their HTTP connections are reused across conversations.
+    With adaptive concurrency on, one AdaptiveLimiter shared by threads
+    and event loops starts at max_concurrency and follows the upstream's
+    latency and overload errors. Otherwise the cap is fixed and applies to
+    synchronous callers (threads) and, separately, to each running event
+    loop. flights coalesces identical requests that are in flight at the
+    same time.
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_concurrency: int = 16, adaptive: Optional[bool] = None):
+        config = MODEL_CONFIG["llm"]
+        self.max_concurrency = max_concurrency
+        self.limiter = None
+        if config["adaptive_concurrency"] if adaptive is None else adaptive:
+            self.limiter = AdaptiveLimiter(
+                initial_limit=max_concurrency,
+                min_limit=config["min_concurrency"],
+                max_limit=max(config["max_concurrency_limit"], max_concurrency),
+                max_queue=config["queue_size"],
+                queue_timeout=config["queue_timeout"],
+                latency_tolerance=config["latency_tolerance"]
+            )
+        self._clients: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+        self._sync_slots = threading.BoundedSemaphore(max_concurrency)
+        self._async_slots = weakref.WeakKeyDictionary()
+        self.flights = SingleFlight()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    @classmethod
+    def shared(cls) -> "ClientPool":
+        """Get the process-wide pool"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(MODEL_CONFIG["llm"]["max_concurrency"])
+            return cls._shared
+
+    def get_client(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Get the client for a configuration, creating it on first use"""
+        with self._lock:
+            if key not in self._clients:
+                client = factory()
+                self._enable_keep_alive(client)
+                self._clients[key] = client
+            return self._clients[key]
+
+    @contextmanager
+    def slot(self, measure: bool = True):
+        """
+        Hold one upstream slot for a synchronous call; raises LimitExceeded
+        when the adaptive queue can't take it. measure=False keeps the
+        call's duration (e.g. a whole stream) out of the latency signal.
+        """
+        if self.limiter is None:
+            with self._sync_slots:
+                self._enter()
+                try:
+                    yield
+                finally:
+                    self._exit()
+            return
+
+        self.limiter.acquire()
+        with self._adapting(measure):
+            yield
+
+    @asynccontextmanager
+    async def aslot(self, measure: bool = True):
+        """Hold one upstream slot for a coroutine"""
+        if self.limiter is None:
+            async with self._async_semaphore():
+                self._enter()
+                try:
+                    yield
+                finally:
+                    self._exit()
+            return
+
+        await self.limiter.aacquire()
+        with self._adapting(measure):
+            yield
+
+    def stats(self) -> Dict[str, int]:
+        """Get pool usage counters"""
+        return {
+            "clients": len(self._clients),
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "upstream_calls": self.flights.executions,
+            "coalesced": self.flights.coalesced,
+            **({"adaptive": self.limiter.stats()} if self.limiter else {})
+        }
+
+    @contextmanager
+    def _adapting(self, measure: bool):
+        """Report the outcome of a call holding a limiter slot"""
+        self._enter()
+        start = time.monotonic()
+        failed = overloaded = False
+        try:
+            yield
+        except Exception as e:
+            # Only saturation cuts the limit; a 400 or a refused connection says nothing about load
+            failed, overloaded = True, is_overload(e)
+            raise
+        finally:
+            self._exit()
+            latency = time.monotonic() - start if measure and not failed else None
+            self.limiter.release(start, latency, overloaded)
+
+    def _async_semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore for the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._async_slots.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._async_slots[loop] = semaphore
+            return semaphore
+
+    def _enter(self):
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _exit(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def _enable_keep_alive(self, client: Any) -> None:
+        """
+        Make the client reuse one pooled HTTP session instead of opening
+        a new connection for every call
+        """
+        sync_client = getattr(client, "_client", None)
+        if sync_client is None or not hasattr(sync_client, "get_session_fn"):
+            return
+
+        session = requests.Session()
+        session.verify = getattr(sync_client, "verify_ssl", True)
+        # One connection per request the limit can let through at its highest
+        max_size = self.limiter.max_limit if self.limiter is not None else self.max_concurrency
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        sync_client.get_session_fn = lambda: session
@@ -0,0 +1,114 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Union
+from ..config.settings import MODEL_CONFIG
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent embedding requests into batched forward passes
+
+    Texts submitted from any thread are queued; a worker collects them
+    until max_batch_size texts are waiting or the oldest has waited
+    max_wait_ms, embeds them with a single get_embeddings call and
+    resolves each caller's future with its row. Other attributes are
+    passed through to the wrapped model, so the batcher can stand in for
+    it.
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        model: Any,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None
+    ):
+        config = MODEL_CONFIG["embedding"]
+        self.model = model
+        self.max_batch_size = max_batch_size or config["batch_size"]
+        self.max_wait = (config["batch_wait_ms"] if max_wait_ms is None else max_wait_ms) / 1000
+        self._queue: "queue.Queue" = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.texts = 0
+        self.largest_batch = 0
+        self.queue_time = 0.0
+        self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._worker.start()
+
+    @classmethod
+    def shared(cls) -> "EmbeddingBatcher":
+        """Get the process-wide batcher over the shared embedding model"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                from .embedding_model import EmbeddingModel
+                from .model_pool import ModelPool
+                cls._shared = cls(ModelPool.shared().get("embedding", EmbeddingModel))
+            return cls._shared
+
+    def submit(self, text: str) -> Future:
+        """Queue one text and get a future for its embedding"""
+        future = Future()
+        self._queue.put((text, future, time.perf_counter()))
+        return future
+
+    def get_embeddings(self, texts: Union[str, List[str]]) -> Union[List[float], List[List[float]]]:
+        """Same contract as EmbeddingModel.get_embeddings, served through the queue"""
+        if isinstance(texts, str):
+            return self.submit(texts).result()
+        futures = [self.submit(text) for text in texts]
+        return [future.result() for future in futures]
+
+    def analyze(self, text: str) -> Dict[str, Any]:
+        """Same contract as EmbeddingModel.analyze, with the encoder pass batched"""
+        embedding = self.get_embeddings(text)
+        return {"embedding": embedding, "sentiment": self.model.classify_sentiment(embedding)}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "batches": self.batches,
+                "texts": self.texts,
+                "mean_batch_size": self.texts / self.batches if self.batches else 0.0,
+                "largest_batch": self.largest_batch,
+                "mean_queue_time": self.queue_time / self.texts if self.texts else 0.0,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "sentiment_head": getattr(self.model, "sentiment_head_status", None)
+            }
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.model, attr)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._embed(batch)
+
+    def _embed(self, batch: List[tuple]) -> None:
+        start = time.perf_counter()
+        # Repeated texts within a batch are embedded once
+        unique = list(dict.fromkeys(text for text, _, _ in batch))
+        try:
+            rows = dict(zip(unique, self.model.get_embeddings(unique)))
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        for text, future, _ in batch:
+            future.set_result(rows[text])
+        with self._stats_lock:
+            self.batches += 1
+            self.texts += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            self.queue_time += sum(start - queued for _, _, queued in batch)
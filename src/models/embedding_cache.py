@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from ..config.settings import EMBEDDING_CACHE_CONFIG
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within the process
+    fcntl = None
+
+KEY_BYTES = 33  # 32 hex digits of the content hash plus a newline
+
+class EmbeddingCache:
+    """
+    Content-hash-keyed embedding store shared by every process on a host
+
+    Vectors live in an append-only float16 file that is memory-mapped,
+    not loaded, so a new worker can serve everything earlier workers
+    embedded. Row i belongs to the i-th fixed-width key in a companion
+    key file. A vector is always written before its key, so any key a
+    reader sees points at a complete row. Recently used vectors are also
+    kept in an in-memory LRU tier.
+    """
+    _instances: Dict[str, "EmbeddingCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, directory: Path, namespace: str, dim: int, memory_entries: Optional[int] = None):
+        self.dim = dim
+        self.row_bytes = dim * 2
+        self.memory_entries = EMBEDDING_CACHE_CONFIG["memory_entries"] if memory_entries is None else memory_entries
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = directory / f"{namespace}-{dim}.f16"
+        self.keys_path = directory / f"{namespace}-{dim}.keys"
+        self.vectors_path.touch()
+        self.keys_path.touch()
+
+        self.memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.rows: Dict[str, int] = {}
+        self._keys_read = 0
+        self._mapped = None
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._refresh()
+
+    @classmethod
+    def for_model(cls, config: Dict[str, Any], dim: int) -> "EmbeddingCache":
+        """Get the process-wide cache for a model configuration"""
+        namespace = cls.namespace_for(config)
+        directory = Path(EMBEDDING_CACHE_CONFIG["dir"])
+        with cls._instances_lock:
+            key = str(directory / f"{namespace}-{dim}")
+            if key not in cls._instances:
+                cls._instances[key] = cls(directory, namespace, dim)
+            return cls._instances[key]
+
+    @staticmethod
+    def namespace_for(config: Dict[str, Any]) -> str:
+        """Anything that changes the vectors gets its own namespace"""
+        settings = {k: str(config.get(k)) for k in ("model_name", "backend", "quantize", "max_length")}
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:KEY_BYTES - 1]
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Cached float32 vectors for texts, None where missing"""
+        results = []
+        with self._lock:
+            for text in texts:
+                key = self.key(text)
+                vector = self.memory.get(key)
+                if vector is not None:
+                    self.memory.move_to_end(key)
+                    self.memory_hits += 1
+                elif key in self.rows or self._refresh() and key in self.rows:
+                    vector = self._read_row(self.rows[key])
+                    self._remember(key, vector)
+                    self.disk_hits += 1
+                else:
+                    self.misses += 1
+                results.append(vector)
+        return results
+
+    def put_many(self, texts: Sequence[str], vectors: np.ndarray) -> None:
+        """Append new vectors to the shared file and the memory tier"""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        with self._lock:
+            pending = {}
+            for text, vector in zip(texts, vectors):
+                key = self.key(text)
+                self._remember(key, vector)
+                if key not in self.rows:
+                    pending[key] = vector
+            if pending:
+                self._append(pending)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "rows": len(self.rows),
+            "bytes_mapped": self._mapped.size * 2 if self._mapped is not None else 0
+        }
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self.memory[key] = vector
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def _read_row(self, row: int) -> np.ndarray:
+        if self._mapped is None or row >= self._mapped.shape[0]:
+            self._remap()
+        return self._mapped[row].astype(np.float32)
+
+    def _remap(self) -> None:
+        rows = os.path.getsize(self.vectors_path) // self.row_bytes
+        self._mapped = np.memmap(self.vectors_path, dtype=np.float16, mode="r", shape=(rows, self.dim)) if rows else None
+
+    def _refresh(self) -> bool:
+        """Pick up keys appended by other processes; True if any were new"""
+        size = os.path.getsize(self.keys_path)
+        complete = size // KEY_BYTES
+        if complete <= self._keys_read:
+            return False
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._keys_read * KEY_BYTES)
+            data = f.read((complete - self._keys_read) * KEY_BYTES)
+        for i in range(0, len(data), KEY_BYTES):
+            self.rows[data[i:i + KEY_BYTES - 1].decode("ascii")] = self._keys_read
+            self._keys_read += 1
+        return True
+
+    def _append(self, pending: Dict[str, np.ndarray]) -> None:
+        with open(self.keys_path, "ab") as keys_file:
+            if fcntl is not None:
+                fcntl.flock(keys_file, fcntl.LOCK_EX)
+            try:
+                # Another process may have added some of these meanwhile
+                self._refresh()
+                pending = {k: v for k, v in pending.items() if k not in self.rows}
+                if not pending:
+                    return
+                with open(self.vectors_path, "ab") as vectors_file:
+                    # Rows follow the keys, even if a crash left a partial row behind
+                    vectors_file.truncate(self._keys_read * self.row_bytes)
+                    vectors_file.write(np.stack(list(pending.values())).astype(np.float16).tobytes())
+                keys_file.truncate(self._keys_read * KEY_BYTES)
+                keys_file.write("".join(f"{k}\n" for k in pending).encode("ascii"))
+                keys_file.flush()
+                for key in pending:
+                    self.rows[key] = self._keys_read
+                    self._keys_read += 1
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(keys_file, fcntl.LOCK_UN)
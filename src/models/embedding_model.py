@@ -1,47 +1,265 @@
-from typing import List, Union
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+import numpy as np
 import torch
-from transformers import AutoModel, AutoTokenizer
-from ..config.settings import MODEL_CONFIG
+from transformers import AutoConfig, AutoModel, AutoTokenizer
+from ..config.settings import MODEL_CONFIG, EMBEDDING_CACHE_CONFIG
+from ..utils.cache import cached
+from ..utils.logger import CustomLogger
+from .embedding_cache import EmbeddingCache
+from .sentiment_head import SentimentHead
+
+logger = CustomLogger("embedding_model")
 
 class EmbeddingModel:
-    def __init__(self):
-        self.config = MODEL_CONFIG["embedding"]
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        # Overrides let one process compare modes side by side
+        self.config = {**MODEL_CONFIG["embedding"], **(config or {})}
+        self.device = "cuda" if torch.cuda.is_available() and self.config["backend"] == "torch" else "cpu"
+        self._set_threads()
         self.tokenizer = AutoTokenizer.from_pretrained(self.config["model_name"])
-        self.model = AutoModel.from_pretrained(self.config["model_name"]).to(self.device)
+        self.model = None
+        self.session = None
+
+        if self.config["backend"] == "onnx":
+            self.session = self._load_onnx_session()
+        elif self.config["backend"] == "torch":
+            self.model = AutoModel.from_pretrained(self.config["model_name"]).to(self.device).eval()
+            if self.config["quantize"]:
+                if self.device == "cpu":
+                    # int8 weights for every Linear layer; activations are quantized on the fly
+                    self.model = torch.ao.quantization.quantize_dynamic(
+                        self.model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                else:
+                    print("Dynamic int8 quantization is CPU-only; using the fp32 model on GPU")
+        else:
+            raise ValueError(f"Unknown embedding backend: {self.config['backend']}")
+
+        # "loaded", or why sentiment is reported as neutral; shown in EmbeddingBatcher.stats()
+        self.sentiment_head_status = "not loaded"
+        self.sentiment_head = self._load_sentiment_head()
+        # Non-padding vs. total tokens fed to the encoder, to gauge wasted compute
+        self.real_tokens = 0
+        self.padded_tokens = 0
+
+        # Vectors computed by any process on this host are reused, not recomputed
+        self.cache = None
+        self.namespace = EmbeddingCache.namespace_for(self.config)
+        if EMBEDDING_CACHE_CONFIG["enabled"]:
+            dim = AutoConfig.from_pretrained(self.config["model_name"]).hidden_size
+            self.cache = EmbeddingCache.for_model(self.config, dim)
         
-    def get_embeddings(self, texts: Union[str, List[str]]) -> List[float]:
+    # Optional cross-host tier in Redis, keyed by the whole call
+    @cached(
+        ttl=EMBEDDING_CACHE_CONFIG["shared_ttl"],
+        key=lambda self, texts: (self.namespace, texts),
+        enabled=EMBEDDING_CACHE_CONFIG["shared"],
+        vector=True
+    )
+    def get_embeddings(self, texts: Union[str, List[str]]) -> Union[List[float], List[List[float]]]:
         """
         Generate embeddings for input text(s)
+
+        A single string gets a single embedding; a list gets one embedding
+        per text, computed in one forward pass.
         """
-        if isinstance(texts, str):
+        single = isinstance(texts, str)
+        if single:
             texts = [texts]
+        if not texts:
+            return []
             
-        # Tokenize texts
-        encoded_input = self.tokenizer(
-            texts,
-            padding=True,
-            truncation=True,
-            max_length=self.config["max_length"],
-            return_tensors="pt"
-        ).to(self.device)
-        
-        # Generate embeddings
-        with torch.no_grad():
-            model_output = self.model(**encoded_input)
-            embeddings = model_output.last_hidden_state[:, 0, :]  # Using [CLS] token
-            
-        # Convert tensor to list of floats
-        return embeddings[0].cpu().tolist()  # Return first embedding as list
+        # Convert to lists of floats
+        embeddings = self._embed_cached(texts).tolist()
+        return embeddings[0] if single else embeddings
+    
+    def analyze(self, text: str) -> Dict[str, Any]:
+        """
+        Embedding and sentiment of a text from a single encoder pass
+        """
+        embedding = self.get_embeddings(text)
+        return {"embedding": embedding, "sentiment": self.classify_sentiment(embedding)}
     
     def get_sentiment(self, text: str) -> dict:
         """
         Analyze sentiment of input text
         """
-        embeddings = self.get_embeddings(text)
-        # Here you would typically use a sentiment classification head
-        # For now, we'll return a placeholder
-        return {
-            "sentiment": "neutral",
-            "confidence": 0.0
-        } 
\ No newline at end of file
+        return self.analyze(text)["sentiment"]
+    
+    def classify_sentiment(self, embedding: List[float]) -> Dict[str, Any]:
+        """
+        Apply the sentiment head to an embedding computed earlier
+        """
+        if self.sentiment_head is None:
+            return {"sentiment": "neutral", "confidence": 0.0}
+        return self.sentiment_head.predict(embedding)
+    
+    def _embed_cached(self, texts: List[str]) -> np.ndarray:
+        """
+        Embeddings served from the cache where possible; only unseen texts
+        go through the encoder
+        """
+        if self.cache is None:
+            return self._embed_batch(texts)
+
+        vectors = self.cache.get_many(texts)
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        if missing:
+            # Round through float16 so a vector is identical whether fresh or cached
+            fresh = self._embed_batch(missing).astype(np.float16).astype(np.float32)
+            self.cache.put_many(missing, fresh)
+            computed = dict(zip(missing, fresh))
+            vectors = [computed[text] if vector is None else vector for text, vector in zip(texts, vectors)]
+        return np.stack(vectors)
+    
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        [CLS] embeddings of a batch of texts as a float32 matrix
+
+        Texts are tokenized once, sorted by length and run in buckets
+        padded only to their own longest member, so a long document no
+        longer makes every short chat turn pay for full-length attention.
+        Rows are returned in input order.
+        """
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.config["max_length"])
+        lengths = [len(ids) for ids in encoded["input_ids"]]
+        embeddings = None
+
+        for bucket in self._buckets(lengths):
+            features = {name: [values[i] for i in bucket] for name, values in encoded.items()}
+            batch = self.tokenizer.pad(
+                features,
+                padding=True,
+                pad_to_multiple_of=8,
+                return_tensors="np" if self.session is not None else "pt"
+            )
+            self.real_tokens += sum(lengths[i] for i in bucket)
+            self.padded_tokens += batch["input_ids"].shape[0] * batch["input_ids"].shape[1]
+
+            rows = self._forward(batch)
+            if embeddings is None:
+                embeddings = np.empty((len(texts), rows.shape[1]), dtype=np.float32)
+            embeddings[bucket] = rows  # Scatter back into input order
+        return embeddings
+    
+    def _buckets(self, lengths: List[int]) -> List[List[int]]:
+        """
+        Group text indices into batches of similar token length, capped at
+        bucket_size texts and max_batch_tokens padded tokens each
+        """
+        order = np.argsort(lengths, kind="stable") if self.config["length_bucketing"] else range(len(lengths))
+        buckets, bucket, longest = [], [], 0
+        for i in order:
+            longest_with_i = max(longest, lengths[i])
+            if bucket and (len(bucket) >= self.config["bucket_size"]
+                           or longest_with_i * (len(bucket) + 1) > self.config["max_batch_tokens"]):
+                buckets.append(bucket)
+                bucket, longest_with_i = [], lengths[i]
+            bucket.append(int(i))
+            longest = longest_with_i
+        if bucket:
+            buckets.append(bucket)
+        return buckets
+    
+    def _forward(self, batch) -> np.ndarray:
+        """
+        Run one padded batch through the encoder and return its [CLS] rows
+        """
+        if self.session is not None:
+            feed = {i.name: batch[i.name].astype(np.int64) for i in self.session.get_inputs()}
+            hidden_state = self.session.run(None, feed)[0]
+            return hidden_state[:, 0, :].astype(np.float32)  # Using [CLS] token
+
+        # inference_mode also skips autograd version tracking, unlike no_grad
+        with torch.inference_mode():
+            model_output = self.model(**batch.to(self.device))
+            embeddings = model_output.last_hidden_state[:, 0, :]  # Using [CLS] token
+        return embeddings.float().cpu().numpy()
+    
+    def _load_sentiment_head(self) -> Optional[SentimentHead]:
+        path = Path(self.config["sentiment_head_path"])
+        if not path.exists():
+            return self._sentiment_head_missing(
+                f"No sentiment head at {path}; run python -m src.models.train_sentiment_head"
+            )
+        head = SentimentHead.load(path)
+        if head.model_name != self.config["model_name"]:
+            return self._sentiment_head_missing(
+                f"Sentiment head was trained on {head.model_name}, not {self.config['model_name']}; retrain it"
+            )
+        self.sentiment_head_status = "loaded"
+        return head
+
+    def _sentiment_head_missing(self, reason: str) -> None:
+        """Record and log why every sentiment will be neutral"""
+        self.sentiment_head_status = reason
+        logger.warning(f"{reason}; sentiment is neutral for every input")
+        return None
+    
+    def _set_threads(self) -> None:
+        """Apply the configured thread counts; 0 keeps the library default"""
+        if self.config["intra_op_threads"]:
+            torch.set_num_threads(self.config["intra_op_threads"])
+        if self.config["inter_op_threads"]:
+            try:
+                torch.set_num_interop_threads(self.config["inter_op_threads"])
+            except RuntimeError as e:
+                # Only settable before the first parallel operation in the process
+                print(f"Could not set inter-op threads: {str(e)}")
+    
+    def _load_onnx_session(self):
+        """
+        Export the model to ONNX once (quantized to int8 if configured)
+        and open an ONNX Runtime session on it
+        """
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise ImportError("The onnx embedding backend needs onnxruntime: pip install onnxruntime onnx")
+
+        name = self.config["model_name"].strip("/").replace("/", "--")
+        path = Path(self.config["onnx_dir"]) / f"{name}.onnx"
+        if not path.exists():
+            self._export_onnx(path)
+        if self.config["quantize"]:
+            quantized_path = path.with_name(f"{name}-int8.onnx")
+            if not quantized_path.exists():
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+                quantize_dynamic(str(path), str(quantized_path), weight_type=QuantType.QInt8)
+            path = quantized_path
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = self.config["intra_op_threads"]
+        options.inter_op_num_threads = self.config["inter_op_threads"]
+        return ort.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+    
+    def _export_onnx(self, path: Path) -> None:
+        sample = self.tokenizer(["Export sample"], return_tensors="pt")
+        names = list(sample.keys())
+        model = _HiddenStateOutput(AutoModel.from_pretrained(self.config["model_name"]).eval(), names)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        dynamic_axes = {n: {0: "batch", 1: "sequence"} for n in names}
+        dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+        torch.onnx.export(
+            model,
+            tuple(sample[n] for n in names),
+            str(path),
+            input_names=names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+            dynamo=False
+        )
+
+class _HiddenStateOutput(torch.nn.Module):
+    """Positional-input wrapper returning only last_hidden_state, for ONNX export"""
+    def __init__(self, model: torch.nn.Module, input_names: List[str]):
+        super().__init__()
+        self.model = model
+        self.input_names = input_names
+
+    def forward(self, *inputs):
+        return self.model(**dict(zip(self.input_names, inputs))).last_hidden_state
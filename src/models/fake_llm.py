@@ -0,0 +1,105 @@
+import asyncio
+import random
+import re
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Union
+
+class FakeMessage:
+    """Minimal stand-in for the langchain message/chunk objects"""
+    def __init__(self, content: str):
+        self.content = content
+
+class FakeChatNVIDIA:
+    """
+    Offline stand-in for ChatNVIDIA that replays a canned response
+    token by token with configurable delays
+
+    Args:
+        response: Response text, or a callable mapping the prompt to it
+        first_token_delay: Seconds before the first token (queueing + prefill)
+        token_delay: Seconds between subsequent tokens (decode)
+        prompt_token_delay: Extra seconds before the first token per prompt word (prefill)
+        latency: Called once per request for extra seconds before the first
+            token, e.g. a heavy-tailed sampler
+        error_rate: Probability that a request fails with a 503 once its
+            latency has elapsed, raised the way ChatNVIDIA raises HTTP errors
+        seed: Seed for the error draws
+    """
+    def __init__(
+        self,
+        response: Union[str, Callable[[str], str]] = "This is a response from the fake model.",
+        first_token_delay: float = 0.3,
+        token_delay: float = 0.02,
+        prompt_token_delay: float = 0.0,
+        latency: Optional[Callable[[], float]] = None,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        self.response = response
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.prompt_token_delay = prompt_token_delay
+        self.latency = latency
+        self.error_rate = error_rate
+        self.calls = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt: str) -> FakeMessage:
+        """Return the whole response once every token has been 'generated'"""
+        tokens = self._tokens(prompt)
+        time.sleep(self._prefill(prompt) + self.token_delay * max(len(tokens) - 1, 0))
+        self._maybe_fail()
+        return FakeMessage("".join(tokens))
+
+    def stream(self, prompt: str) -> Iterator[FakeMessage]:
+        """Yield the response one token at a time"""
+        tokens = self._tokens(prompt)
+        time.sleep(self._prefill(prompt))
+        self._maybe_fail()
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(self.token_delay)
+            yield FakeMessage(token)
+
+    async def ainvoke(self, prompt: str) -> FakeMessage:
+        """Async version of invoke"""
+        tokens = self._tokens(prompt)
+        await asyncio.sleep(self._prefill(prompt) + self.token_delay * max(len(tokens) - 1, 0))
+        self._maybe_fail()
+        return FakeMessage("".join(tokens))
+
+    async def astream(self, prompt: str) -> AsyncIterator[FakeMessage]:
+        """Async version of stream"""
+        tokens = self._tokens(prompt)
+        await asyncio.sleep(self._prefill(prompt))
+        self._maybe_fail()
+        for i, token in enumerate(tokens):
+            if i:
+                await asyncio.sleep(self.token_delay)
+            yield FakeMessage(token)
+
+    def _prefill(self, prompt: str) -> float:
+        """Seconds before the first token for this prompt"""
+        delay = self.first_token_delay + (self.latency() if self.latency else 0.0)
+        if not self.prompt_token_delay:
+            return delay
+        return delay + self.prompt_token_delay * len(prompt.split())
+
+    def _maybe_fail(self) -> None:
+        """Fail error_rate of the requests once their latency has elapsed"""
+        with self._lock:
+            failed = self.error_rate and self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        if failed:
+            raise Exception("[503] Service Unavailable\nThe fake endpoint is overloaded")
+
+    def _tokens(self, prompt: str) -> List[str]:
+        """Split the response into word-level tokens, keeping whitespace"""
+        with self._lock:
+            self.calls += 1
+        text = self.response(prompt) if callable(self.response) else self.response
+        return re.findall(r"\s*\S+", text)
@@ -1,21 +1,46 @@
-from typing import Dict, Any
+import asyncio
+import time
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from langchain_nvidia_ai_endpoints import ChatNVIDIA
-from ..config.settings import MODEL_CONFIG, API_KEYS
+from .client_pool import ClientPool
+from .resilience import ResilientClient
+from ..config.settings import MODEL_CONFIG, API_KEYS, RESPONSE_CACHE_CONFIG
+from ..utils.response_cache import ResponseCache
+from ..utils.semantic_cache import SemanticCache
 
 class LLMModel:
-    def __init__(self):
+    def __init__(
+        self,
+        client: Optional[Any] = None,
+        pool: Optional[ClientPool] = None,
+        cache: Optional[ResponseCache] = None,
+        semantic_cache: Optional[SemanticCache] = None
+    ):
+        self.cache = cache
+        self.semantic_cache = semantic_cache
         try:
             self.config = MODEL_CONFIG["llm"]
+            self.pool = pool or ClientPool.shared()
+            if client is not None:
+                # Injected client (e.g. FakeChatNVIDIA for offline runs)
+                self.client = client
+                return
             if not API_KEYS["nvidia"]:
                 raise ValueError("NVIDIA API key not found")
             
-            self.client = ChatNVIDIA(
+            client_key = (
+                self.config["model_name"],
+                self.config["temperature"],
+                self.config["top_p"],
+                self.config["max_length"]
+            )
+            self.client = self.pool.get_client(client_key, lambda: ResilientClient(ChatNVIDIA(
                 model=self.config["model_name"],
                 api_key=API_KEYS["nvidia"],
                 temperature=self.config["temperature"],
                 top_p=self.config["top_p"],
                 max_tokens=self.config["max_length"],
-            )
+            )))
         except Exception as e:
             print(f"Error initializing LLM: {str(e)}")
             self.use_fallback = True
@@ -27,6 +52,222 @@ class LLMModel:
                 "response": "I'm a helpful AI assistant. I can help you with questions, coding, analysis, and more. What would you like to know?"
             }
 
+        prompt = self._build_prompt(state)
+        if prompt is None:
+            return {"response": "I didn't catch that. Could you please try again?"}
+
+        cache_key = self._cache_key(state)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return {"response": cached}
+
+        similar, embedding = self._semantic_lookup(state)
+        if similar is not None:
+            return {"response": similar}
+        
+        def complete() -> Optional[str]:
+            start = time.perf_counter()
+            with self.pool.slot():
+                response = self.client.invoke(prompt)
+            return self._finish(response, state, cache_key, embedding, start)
+
+        try:
+            flight_key = self._flight_key(prompt)
+            response_text = self.pool.flights.do(flight_key, complete) if flight_key else complete()
+            if not response_text:
+                return {"response": "Could you please rephrase that?"}
+            return {"response": response_text}
+            
+        except Exception as e:
+            print(f"Generation error: {str(e)}")
+            return {"response": "I'm having trouble processing that. Could you try again?"}
+
+    async def agenerate(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Async version of generate; waits on the upstream without blocking a thread"""
+        if hasattr(self, 'use_fallback'):
+            return {
+                "response": "I'm a helpful AI assistant. I can help you with questions, coding, analysis, and more. What would you like to know?"
+            }
+
+        prompt = self._build_prompt(state)
+        if prompt is None:
+            return {"response": "I didn't catch that. Could you please try again?"}
+
+        cache_key = self._cache_key(state)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return {"response": cached}
+
+        # Embedding is CPU-bound; keep it off the event loop
+        similar, embedding = await asyncio.to_thread(self._semantic_lookup, state)
+        if similar is not None:
+            return {"response": similar}
+        
+        async def complete() -> Optional[str]:
+            start = time.perf_counter()
+            async with self.pool.aslot():
+                response = await self.client.ainvoke(prompt)
+            return self._finish(response, state, cache_key, embedding, start)
+
+        try:
+            flight_key = self._flight_key(prompt)
+            response_text = await (self.pool.flights.ado(flight_key, complete) if flight_key else complete())
+            if not response_text:
+                return {"response": "Could you please rephrase that?"}
+            return {"response": response_text}
+            
+        except Exception as e:
+            print(f"Generation error: {str(e)}")
+            return {"response": "I'm having trouble processing that. Could you try again?"}
+
+    def generate_stream(self, state: Dict[str, Any]) -> Iterator[str]:
+        """
+        Generate response incrementally, yielding text chunks as the
+        endpoint produces them
+        """
+        if hasattr(self, 'use_fallback'):
+            yield "I'm a helpful AI assistant. I can help you with questions, coding, analysis, and more. What would you like to know?"
+            return
+
+        prompt = self._build_prompt(state)
+        if prompt is None:
+            yield "I didn't catch that. Could you please try again?"
+            return
+
+        cache_key = self._cache_key(state)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        similar, embedding = self._semantic_lookup(state)
+        if similar is not None:
+            yield similar
+            return
+
+        def produce() -> Iterator[str]:
+            tokens = []
+            start = time.perf_counter()
+            # A stream's duration depends on the response length, not on load
+            with self.pool.slot(measure=False):
+                for token in self._clean_stream(self.client.stream(prompt)):
+                    tokens.append(token)
+                    yield token
+            if tokens:
+                self._store("".join(tokens), state, cache_key, embedding, start)
+
+        streamed = False
+        try:
+            flight_key = self._flight_key(prompt)
+            for token in self.pool.flights.stream(flight_key, produce) if flight_key else produce():
+                streamed = True
+                yield token
+        except Exception as e:
+            print(f"Streaming error: {str(e)}")
+            if not streamed:
+                yield "I'm having trouble processing that. Could you try again?"
+            return
+
+        if not streamed:
+            yield "Could you please rephrase that?"
+
+    def _flight_key(self, prompt: str) -> Optional[Tuple]:
+        """
+        Key under which identical concurrent requests share one upstream
+        call, or None when coalescing is off
+        """
+        if not self.config.get("coalesce"):
+            return None
+        return (
+            id(self.client),
+            self.config["model_name"],
+            self.config["temperature"],
+            self.config["top_p"],
+            self.config["max_length"],
+            prompt
+        )
+
+    def _finish(
+        self,
+        response: Any,
+        state: Dict[str, Any],
+        cache_key: Optional[str],
+        embedding: Optional[Any],
+        start: float
+    ) -> Optional[str]:
+        """Clean an upstream response and cache it; None if it was empty"""
+        content = response.content if hasattr(response, 'content') else str(response)
+        if not content:
+            return None
+        response_text = self._clean_response(content)
+        self._store(response_text, state, cache_key, embedding, start)
+        return response_text
+
+    def _store(
+        self,
+        response_text: str,
+        state: Dict[str, Any],
+        cache_key: Optional[str],
+        embedding: Optional[Any],
+        start: float
+    ) -> None:
+        """Store a fresh response in the exact and semantic caches"""
+        if cache_key:
+            self.cache.set(cache_key, response_text)
+        if embedding is not None:
+            self.semantic_cache.store(
+                state['input'], response_text, embedding, time.perf_counter() - start
+            )
+
+    def _cache_key(self, state: Dict[str, Any]) -> Optional[str]:
+        """Get the response cache key for the state, or None to skip the cache"""
+        if self.cache is None:
+            return None
+        return self.cache.make_key(
+            self.config["model_name"],
+            self.config["temperature"],
+            state['input'],
+            self._context_turns(state)
+        )
+
+    def _semantic_lookup(self, state: Dict[str, Any]) -> Tuple[Optional[str], Optional[Any]]:
+        """
+        Look the input up in the semantic cache; returns the cached response
+        (or None) and the query embedding to store the new response under.
+        Only requests without conversation context are eligible, under the
+        same enabled/max_temperature rule as the response cache (the Settings
+        toggle covers both).
+        """
+        if self.semantic_cache is None or self._context_turns(state):
+            return None, None
+        temperature = self.config["temperature"]
+        if self.cache is not None and not self.cache.accepts(temperature):
+            return None, None
+        if self.cache is None and temperature > RESPONSE_CACHE_CONFIG["max_temperature"]:
+            return None, None
+        embedding = self.semantic_cache.embed(state['input'])
+        return self.semantic_cache.lookup(state['input'], embedding), embedding
+
+    def _recent_memory(self, state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Latest conversation turns that make it into the prompt; a formatted
+        history comes from a WindowBuffer that already enforces the budget
+        """
+        if state.get('history'):
+            return state['memory']
+        return state.get('memory', [])[-3:]
+
+    def _context_turns(self, state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Every turn in the prompt: the summary, recalled long-term memory and recent memory"""
+        summary = [{'input': '', 'response': state['summary']}] if state.get('summary') else []
+        recalled = [{'input': t['input'], 'response': t['response']} for t in state.get('recalled', [])]
+        return summary + recalled + self._recent_memory(state)
+
+    def _build_prompt(self, state: Dict[str, Any]) -> Optional[str]:
+        """Build the full prompt for the input state, or None if there is no input"""
         system_prompt = """You are a helpful and friendly AI assistant. Maintain a natural conversation flow.
         
         Core capabilities:
@@ -38,30 +279,79 @@ class LLMModel:
         
         user_query = state.get('input', '')
         if not user_query:
-            return {"response": "I didn't catch that. Could you please try again?"}
+            return None
         
         # Format context for conversation flow
         context_str = ""
-        if state.get('memory'):
-            last_exchanges = state['memory'][-3:]
-            context_str = "\nPrevious conversation:\n" + "\n".join(
+        if state.get('summary'):
+            context_str += "\nSummary of earlier conversation:\n" + state['summary']
+        if state.get('recalled'):
+            context_str += "\nRelevant earlier conversation:\n" + "\n".join(
+                [f"User: {c['input']}\nAssistant: {c['response']}" for c in state['recalled']]
+            )
+        if state.get('history'):
+            context_str += "\nPrevious conversation:\n" + state['history']
+        elif state.get('memory'):
+            last_exchanges = self._recent_memory(state)
+            context_str += "\nPrevious conversation:\n" + "\n".join(
                 [f"User: {c['input']}\nAssistant: {c['response']}" for c in last_exchanges]
             )
         
-        prompt = f"{system_prompt}\n\n{context_str}\nUser: {user_query}\nAssistant:"
-        
-        try:
-            response = self.client.invoke(prompt)
-            content = response.content if hasattr(response, 'content') else str(response)
-            
-            if not content:
-                return {"response": "Could you please rephrase that?"}
-                
-            return {"response": self._clean_response(content)}
-            
-        except Exception as e:
-            print(f"Generation error: {str(e)}")
-            return {"response": "I'm having trouble processing that. Could you try again?"}
+        return f"{system_prompt}\n\n{context_str}\nUser: {user_query}\nAssistant:"
+
+    def _clean_stream(self, chunks: Iterator[Any]) -> Iterator[str]:
+        """
+        Streaming counterpart of _clean_response: the chunks joined always
+        equal _clean_response of the full text. Each chunk is scanned once;
+        only a tail that could still turn into an "Assistant:" marker, the
+        start of the text while it could be a JSON wrapper, and trailing
+        whitespace are held back until the next chunk settles them.
+        """
+        marker = "Assistant:"
+        wrapper = '{"response":'
+        pending = ""  # Raw tail that might be the start of a marker
+        head = ""  # Start of the output while it could still be the wrapper
+        spaces = ""  # Trailing whitespace, emitted only if more text follows
+        started = False
+        wrapped = None  # The whole output, once it turned out to be wrapped
+
+        def settle(piece: str) -> str:
+            nonlocal head, spaces, started, wrapped
+            if wrapped is not None:
+                wrapped.append(piece)
+                return ""
+            if not started:
+                head = (head + piece).lstrip()
+                if head.startswith(wrapper):
+                    wrapped = [head]
+                    return ""
+                if not head or wrapper.startswith(head):
+                    return ""
+                started, piece, head = True, head, ""
+            body = piece.rstrip()
+            if not body:
+                spaces += piece
+                return ""
+            out = spaces + body
+            spaces = piece[len(body):]
+            return out
+
+        for chunk in chunks:
+            token = chunk.content if hasattr(chunk, 'content') else str(chunk)
+            if not token:
+                continue
+            text, pending = _strip_markers(pending + token, marker)
+            out = settle(text)
+            if out:
+                yield out
+
+        out = settle(pending)
+        if wrapped is not None:
+            out = self._unwrap_json("".join(wrapped).strip())
+        elif not started:
+            out = head.strip()
+        if out:
+            yield out
             
     def _format_context(self, context: list) -> str:
         """
@@ -110,12 +400,29 @@ class LLMModel:
         """Clean up the response text"""
         # Remove any "Assistant:" prefix
         response = response.replace("Assistant:", "").strip()
-        
-        # Remove any JSON formatting if present
+        return self._unwrap_json(response)
+
+    def _unwrap_json(self, response: str) -> str:
+        """Remove any JSON formatting if present"""
         if response.startswith('{"response":'):
             try:
                 response = eval(response)["response"]
             except:
                 pass
             
-        return response 
\ No newline at end of file
+        return response 
+
+def _strip_markers(text: str, marker: str) -> Tuple[str, str]:
+    """
+    Remove every marker from text, like str.replace; returns the cleaned
+    text and a raw tail held back because it could be the start of one
+    """
+    parts = []
+    i = text.find(marker)
+    while i >= 0:
+        parts.append(text[:i])
+        text = text[i + len(marker):]
+        i = text.find(marker)
+    held = next((k for k in range(len(marker) - 1, 0, -1) if text.endswith(marker[:k])), 0)
+    parts.append(text[:len(text) - held])
+    return "".join(parts), text[len(text) - held:]
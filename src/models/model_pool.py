@@ -0,0 +1,127 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+from ..config.settings import MODEL_CONFIG
+
+class ModelHandle:
+    """
+    Thread-safe handle to a shared model instance
+
+    Method calls made through the handle hold one of the model's
+    inference slots, so at most max_concurrency calls run on the model at
+    once; other attributes are passed through untouched. Use acquire()
+    to hold a slot across several calls.
+    """
+    def __init__(self, name: str, model: Any, max_concurrency: int):
+        self._name = name
+        self._model = model
+        self._max_concurrency = max_concurrency
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._counter_lock = threading.Lock()
+        self._in_use = 0
+        self._calls = 0
+        self._wait_time = 0.0
+
+    @contextmanager
+    def acquire(self):
+        """Hold an inference slot and get the underlying model"""
+        start = time.perf_counter()
+        with self._slots:
+            with self._counter_lock:
+                self._wait_time += time.perf_counter() - start
+                self._in_use += 1
+                self._calls += 1
+            try:
+                yield self._model
+            finally:
+                with self._counter_lock:
+                    self._in_use -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "type": type(self._model).__name__,
+            "max_concurrency": self._max_concurrency,
+            "in_use": self._in_use,
+            "calls": self._calls,
+            "wait_time": self._wait_time
+        }
+
+    def __call__(self, *args, **kwargs):
+        with self.acquire() as model:
+            return model(*args, **kwargs)
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(self._model, attr)
+        if not callable(value):
+            return value
+
+        @functools.wraps(value)
+        def guarded(*args, **kwargs):
+            with self.acquire():
+                return value(*args, **kwargs)
+        return guarded
+
+class ModelPool:
+    """
+    Process-wide registry that loads each model once and hands out
+    shared, concurrency-limited handles to it
+
+    Memory and load time no longer scale with the number of sessions:
+    every AIAgent, workflow and speech component asking for the same
+    model gets the same handle.
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._handles: Dict[str, ModelHandle] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._load_times: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "ModelPool":
+        """Get the process-wide pool"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def get(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        max_concurrency: Optional[int] = None
+    ) -> ModelHandle:
+        """
+        Get the handle for a model, loading it with factory on first use
+
+        max_concurrency defaults to MODEL_CONFIG[name]["max_concurrency"].
+        """
+        handle = self._handles.get(name)
+        if handle is not None:
+            return handle
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+        # Loads of different models proceed in parallel; the same model loads once
+        with load_lock:
+            handle = self._handles.get(name)
+            if handle is None:
+                if max_concurrency is None:
+                    max_concurrency = MODEL_CONFIG.get(name, {}).get("max_concurrency", 1)
+                start = time.perf_counter()
+                model = factory()
+                self._load_times[name] = time.perf_counter() - start
+                handle = ModelHandle(name, model, max_concurrency)
+                self._handles[name] = handle
+        return handle
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get load time and usage counters per model"""
+        return {
+            name: {**handle.stats(), "load_time": self._load_times.get(name)}
+            for name, handle in self._handles.items()
+        }
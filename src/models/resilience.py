@@ -0,0 +1,400 @@
+import asyncio
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+from typing import Any, Deque, Dict, Iterator, Optional
+from ..config.settings import MODEL_CONFIG
+
+# ChatNVIDIA raises plain Exceptions formatted as "[<status>] <title>"
+_STATUS = re.compile(r"\[(\d{3})\]")
+_END = object()
+
+class DeadlineExceeded(TimeoutError):
+    """The upstream didn't answer within the request deadline"""
+    pass
+
+class CircuitOpenError(RuntimeError):
+    """The upstream is unhealthy; calls are refused until the breaker resets"""
+    pass
+
+def is_retryable(error: BaseException) -> bool:
+    """Transient upstream failures: timeouts, connection errors, 408, 429 and 5xx"""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status = _status(error)
+    if status is None:
+        # Bugs on our side won't go away by asking again
+        return not isinstance(error, (ValueError, TypeError, KeyError, AttributeError))
+    return status in (408, 429) or status >= 500
+
+def is_overload(error: BaseException) -> bool:
+    """Signs the upstream is saturated: timeouts, 429 and 5xx"""
+    if isinstance(error, TimeoutError):
+        return True
+    status = _status(error)
+    return status is not None and (status == 429 or status >= 500)
+
+def _status(error: BaseException) -> Optional[int]:
+    """HTTP status of an upstream error, if it carries one"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        match = _STATUS.match(str(error))
+        status = int(match.group(1)) if match else None
+    return status
+
+class CircuitBreaker:
+    """
+    Fails fast while the upstream is unhealthy
+
+    Opens after failure_threshold consecutive failures. Once reset_timeout
+    has passed a single probe is let through (half-open); its outcome
+    closes the breaker again or re-opens it.
+    """
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> None:
+        """Raise CircuitOpenError unless a call may go upstream now"""
+        with self._lock:
+            if self.state == "open":
+                retry_in = self._opened_at + self.reset_timeout - time.monotonic()
+                if retry_in > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"LLM endpoint unavailable, retrying in {retry_in:.0f}s")
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "half_open":
+                if self._probing:
+                    self.rejected += 1
+                    raise CircuitOpenError("LLM endpoint unavailable, probe in flight")
+                self._probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.state = "closed"
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == "half_open" or (self.state == "closed" and self.failures >= self.failure_threshold):
+                self.state = "open"
+                self.trips += 1
+                self._opened_at = time.monotonic()
+
+class LatencyTracker:
+    """Sliding window of recent successful call latencies"""
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+class ResilientClient:
+    """
+    Wraps a chat client with a per-request deadline, retries with jittered
+    exponential backoff, optional hedging and a circuit breaker
+
+    invoke/ainvoke must finish within timeout seconds, retries included.
+    With hedging on, a second request goes out once the first has taken
+    longer than the hedge_quantile of recent latencies; the first answer
+    wins. For stream the timeout is a time-to-first-token deadline: it
+    and the retries cover the wait for the first chunk only, and once
+    tokens flow the stream runs as long as the generation does. A
+    synchronous call that misses its deadline can't be cancelled: it
+    finishes on a worker thread and is discarded.
+    Anything else (astream, the underlying HTTP client) is passed through.
+    """
+    def __init__(
+        self,
+        client: Any,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+        backoff_max: Optional[float] = None,
+        hedge: Optional[bool] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        config = MODEL_CONFIG["llm"]
+        self.client = client
+        self.timeout = config["timeout"] if timeout is None else timeout
+        self.retries = config["retries"] if retries is None else retries
+        self.backoff_base = config["backoff_base"] if backoff_base is None else backoff_base
+        self.backoff_max = config["backoff_max"] if backoff_max is None else backoff_max
+        self.hedge = config["hedge"] if hedge is None else hedge
+        self.hedge_quantile = config["hedge_quantile"]
+        self.hedge_min_samples = config["hedge_min_samples"]
+        self.breaker = breaker or CircuitBreaker(config["breaker_failures"], config["breaker_reset"])
+        self.latencies = LatencyTracker()
+        self.requests = 0
+        self.retried = 0
+        self.timeouts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+        # Room for every request the concurrency limit can let through
+        # (it grows up to max_concurrency_limit when adaptive), plus hedges
+        limit = config["max_concurrency"]
+        if config["adaptive_concurrency"]:
+            limit = max(limit, config["max_concurrency_limit"])
+        self._executor = ThreadPoolExecutor(max_workers=max(4, limit * 2), thread_name_prefix="llm-call")
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def invoke(self, prompt: str, timeout: Optional[float] = None) -> Any:
+        """Call the upstream, retrying transient failures until the deadline"""
+        deadline = self._deadline(timeout)
+        attempt = 0
+        while True:
+            self.breaker.allow()
+            try:
+                response = self._hedged(prompt, deadline)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, deadline)
+                if delay is None:
+                    raise
+                attempt += 1
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return response
+
+    async def ainvoke(self, prompt: str, timeout: Optional[float] = None) -> Any:
+        """Async version of invoke; a request that loses a hedge or the deadline is cancelled"""
+        deadline = self._deadline(timeout)
+        attempt = 0
+        while True:
+            self.breaker.allow()
+            try:
+                response = await self._ahedged(prompt, deadline)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, deadline)
+                if delay is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return response
+
+    def stream(self, prompt: str, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Stream the response; timeout and retries bound the time to the first chunk only"""
+        deadline = self._deadline(timeout)
+        attempt = 0
+        while True:
+            self.breaker.allow()
+            chunks = iter(self.client.stream(prompt))
+            try:
+                first = self._first_chunk(chunks, deadline)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, deadline)
+                if delay is None:
+                    raise
+                attempt += 1
+                time.sleep(delay)
+                continue
+            break
+
+        self.breaker.record_success()
+        if first is _END:
+            return
+        yield first
+        try:
+            yield from chunks
+        except Exception as e:
+            if is_retryable(e):
+                self.breaker.record_failure()
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Get retry, hedging and breaker counters"""
+        p50, p95 = self.latencies.quantile(0.5), self.latencies.quantile(0.95)
+        return {
+            "requests": self.requests,
+            "retries": self.retried,
+            "timeouts": self.timeouts,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "breaker": self.breaker.state,
+            "breaker_trips": self.breaker.trips,
+            "rejected": self.breaker.rejected,
+            "p50_ms": p50 * 1000 if p50 is not None else None,
+            "p95_ms": p95 * 1000 if p95 is not None else None
+        }
+
+    def _deadline(self, timeout: Optional[float]) -> float:
+        timeout = self.timeout if timeout is None else timeout
+        return time.monotonic() + timeout if timeout and timeout > 0 else float("inf")
+
+    def _time_left(self, deadline: float) -> Optional[float]:
+        """Seconds until the deadline (None if unbounded); raises once it has passed"""
+        if deadline == float("inf"):
+            return None
+        left = deadline - time.monotonic()
+        if left <= 0:
+            self._expired()
+        return left
+
+    def _expired(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+        raise DeadlineExceeded("LLM endpoint didn't answer before the deadline")
+
+    def _retry_delay(self, error: Exception, attempt: int, deadline: float) -> Optional[float]:
+        """Record a failed attempt; returns the backoff before the next one, or None to give up"""
+        if not is_retryable(error):
+            if not isinstance(error, CircuitOpenError):
+                # The upstream answered, it just didn't like the request
+                self.breaker.record_success()
+            return None
+        self.breaker.record_failure()
+        if attempt >= self.retries:
+            return None
+        # Full jitter keeps clients that failed together from retrying together
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if time.monotonic() + delay >= deadline:
+            return None
+        with self._lock:
+            self.retried += 1
+        return delay
+
+    def _hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None to send a single request"""
+        if not self.hedge or self.breaker.state != "closed" or len(self.latencies) < self.hedge_min_samples:
+            return None
+        return self.latencies.quantile(self.hedge_quantile)
+
+    def _timed_invoke(self, prompt: str) -> Any:
+        with self._lock:
+            self.requests += 1
+        start = time.monotonic()
+        response = self.client.invoke(prompt)
+        # Every request reports its own latency, hedge losers included, so
+        # winning hedges don't drag the quantile down
+        self.latencies.add(time.monotonic() - start)
+        return response
+
+    async def _atimed_invoke(self, prompt: str) -> Any:
+        with self._lock:
+            self.requests += 1
+        start = time.monotonic()
+        try:
+            response = await self.client.ainvoke(prompt)
+        except asyncio.CancelledError:
+            # A cancelled hedge loser took at least this long
+            self.latencies.add(time.monotonic() - start)
+            raise
+        self.latencies.add(time.monotonic() - start)
+        return response
+
+    def _hedged(self, prompt: str, deadline: float) -> Any:
+        """One attempt: a request plus, if it is slow, a hedge; first success wins"""
+        left = self._time_left(deadline)
+        hedge_after = self._hedge_delay()
+        if left is None and hedge_after is None:
+            return self._timed_invoke(prompt)
+
+        futures = [self._executor.submit(self._timed_invoke, prompt)]
+        if hedge_after is not None and (left is None or hedge_after < left):
+            done, _ = wait(futures, timeout=hedge_after)
+            if not done:
+                with self._lock:
+                    self.hedges += 1
+                futures.append(self._executor.submit(self._timed_invoke, prompt))
+
+        pending, error = set(futures), None
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=self._time_left(deadline), return_when=FIRST_COMPLETED)
+                if not done:
+                    break
+                for future in done:
+                    if future.exception() is None:
+                        if future is not futures[0]:
+                            with self._lock:
+                                self.hedge_wins += 1
+                        return future.result()
+                    error = future.exception()
+            if error is not None and not pending:
+                raise error
+            self._expired()
+        finally:
+            # Requests still queued for a worker never reach the upstream
+            for future in pending:
+                future.cancel()
+
+    async def _ahedged(self, prompt: str, deadline: float) -> Any:
+        """Async version of _hedged"""
+        left = self._time_left(deadline)
+        hedge_after = self._hedge_delay()
+        tasks = [asyncio.ensure_future(self._atimed_invoke(prompt))]
+        try:
+            if hedge_after is not None and (left is None or hedge_after < left):
+                done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+                if not done:
+                    with self._lock:
+                        self.hedges += 1
+                    tasks.append(asyncio.ensure_future(self._atimed_invoke(prompt)))
+
+            pending, error = set(tasks), None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=self._time_left(deadline), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in done:
+                    if task.exception() is None:
+                        if task is not tasks[0]:
+                            with self._lock:
+                                self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            if error is not None and not pending:
+                raise error
+            self._expired()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _first_chunk(self, chunks: Iterator[Any], deadline: float) -> Any:
+        left = self._time_left(deadline)
+        with self._lock:
+            self.requests += 1
+        if left is None:
+            return next(chunks, _END)
+        try:
+            return self._executor.submit(next, chunks, _END).result(timeout=left)
+        except FutureTimeout:
+            self._expired()
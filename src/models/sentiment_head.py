@@ -0,0 +1,64 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+import numpy as np
+
+class SentimentHead:
+    """
+    Softmax-regression sentiment classifier over sentence embeddings
+
+    Runs on the embedding EmbeddingModel already computed, so sentiment
+    costs a matrix-vector product instead of a second encoder pass.
+    Weights come from src/models/train_sentiment_head.py.
+    """
+    def __init__(
+        self,
+        weights: np.ndarray,
+        bias: np.ndarray,
+        labels: Sequence[str],
+        model_name: str = "",
+        mean: Optional[np.ndarray] = None,
+        scale: Optional[np.ndarray] = None
+    ):
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        # Standardization of the unit-length embeddings, fitted at training time
+        self.mean = np.zeros(self.weights.shape[1], dtype=np.float32) if mean is None else np.asarray(mean, dtype=np.float32)
+        self.scale = np.ones(self.weights.shape[1], dtype=np.float32) if scale is None else np.asarray(scale, dtype=np.float32)
+        self.labels = list(labels)
+        self.model_name = model_name
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "SentimentHead":
+        saved = np.load(path)
+        return cls(saved["weights"], saved["bias"], [str(l) for l in saved["labels"]],
+                   str(saved["model_name"]), saved["mean"], saved["scale"])
+
+    def save(self, path: Union[str, Path]) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, weights=self.weights, bias=self.bias, mean=self.mean, scale=self.scale,
+                 labels=np.array(self.labels), model_name=np.array(self.model_name))
+
+    def predict(self, embedding: Union[List[float], np.ndarray]) -> Dict[str, Any]:
+        """Sentiment label, its probability and the full distribution"""
+        probabilities = self.probabilities(np.asarray(embedding, dtype=np.float32)[None, :])[0]
+        best = int(np.argmax(probabilities))
+        return {
+            "sentiment": self.labels[best],
+            "confidence": float(probabilities[best]),
+            "scores": {label: float(p) for label, p in zip(self.labels, probabilities)}
+        }
+
+    def features(self, embeddings: np.ndarray) -> np.ndarray:
+        return (_normalize(embeddings) - self.mean) / self.scale
+
+    def probabilities(self, embeddings: np.ndarray) -> np.ndarray:
+        logits = self.features(embeddings) @ self.weights.T + self.bias
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    # Unit-length inputs keep the head independent of the encoder's output scale
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
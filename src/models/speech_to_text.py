@@ -3,16 +3,20 @@ import numpy as np
 from typing import Union
 from pathlib import Path
 import nemo.collections.asr as nemo_asr
+from .model_pool import ModelPool
 from ..config.settings import MODEL_CONFIG
 
 class SpeechToText:
     def __init__(self):
         self.config = MODEL_CONFIG["speech_to_text"]
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        # Load NeMo ASR model
-        self.model = nemo_asr.models.EncDecCTCModel.from_pretrained(
-            self.config["model_name"]
-        ).to(self.device)
+        # Load NeMo ASR model once per process; instances share it
+        self.model = ModelPool.shared().get(
+            "speech_to_text",
+            lambda: nemo_asr.models.EncDecCTCModel.from_pretrained(
+                self.config["model_name"]
+            ).to(self.device)
+        )
         
     def transcribe(self, audio_input: Union[str, Path, np.ndarray]) -> str:
         """
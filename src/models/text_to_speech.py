@@ -3,19 +3,28 @@ import numpy as np
 from typing import Union
 from pathlib import Path
 import nemo.collections.tts as nemo_tts
+from .model_pool import ModelPool
 from ..config.settings import MODEL_CONFIG
 
 class TextToSpeech:
     def __init__(self):
         self.config = MODEL_CONFIG["text_to_speech"]
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        # Load NeMo TTS models
-        self.spec_generator = nemo_tts.models.FastPitchModel.from_pretrained(
-            self.config["model_name"]
-        ).to(self.device)
-        self.vocoder = nemo_tts.models.HifiGanModel.from_pretrained(
-            "nvidia/nemo-tts-hifigan-en"
-        ).to(self.device)
+        # Load NeMo TTS models once per process; instances share them
+        pool = ModelPool.shared()
+        self.spec_generator = pool.get(
+            "text_to_speech",
+            lambda: nemo_tts.models.FastPitchModel.from_pretrained(
+                self.config["model_name"]
+            ).to(self.device)
+        )
+        self.vocoder = pool.get(
+            "text_to_speech_vocoder",
+            lambda: nemo_tts.models.HifiGanModel.from_pretrained(
+                "nvidia/nemo-tts-hifigan-en"
+            ).to(self.device),
+            max_concurrency=self.config["max_concurrency"]
+        )
         
     def synthesize(self, text: str, output_path: Union[str, Path] = None) -> np.ndarray:
         """
@@ -0,0 +1,119 @@
+"""
+Train the sentiment head offline on top of the configured embedding model
+
+    python -m src.models.train_sentiment_head [--data labeled.jsonl] [--output path]
+
+--data adds JSON lines of {"text": ..., "label": ...} to the built-in
+seed examples. The head is written to MODEL_CONFIG["embedding"]["sentiment_head_path"]
+unless --output is given; retrain whenever the embedding model changes.
+"""
+import argparse
+import json
+from typing import Dict, List, Tuple
+import numpy as np
+from ..config.settings import MODEL_CONFIG
+from .embedding_model import EmbeddingModel
+from .sentiment_head import SentimentHead, _normalize
+
+SENTIMENT_EXAMPLES: Dict[str, List[str]] = {
+    "negative": [
+        "This is the worst service I have ever used",
+        "I was charged twice and nobody is answering my emails",
+        "The app keeps crashing and I lost all my work",
+        "I'm really frustrated with how long this is taking",
+        "Your product stopped working after one day",
+        "That answer was useless and wrong",
+        "I hate having to repeat myself every time",
+        "My order arrived broken and late",
+        "This is so disappointing, I want a refund",
+        "Nothing works and support is rude"
+    ],
+    "neutral": [
+        "What's the weather like in Paris tomorrow?",
+        "Remind me to call mom at 6pm",
+        "Write an email to my manager about the meeting",
+        "How do I reset my password?",
+        "Search for news about electric cars",
+        "Schedule a meeting for Tuesday at 10am",
+        "What are your opening hours?",
+        "Summarize this document",
+        "Translate 'good morning' into Spanish",
+        "Can you list the steps to export my data?"
+    ],
+    "positive": [
+        "Thank you so much, that was really helpful!",
+        "I love how easy this is to use",
+        "Great job, the report looks perfect",
+        "This is exactly what I needed, amazing",
+        "Your support team was fantastic today",
+        "Wow, that worked on the first try",
+        "I'm so happy with the results",
+        "Thanks, you made my day",
+        "The new feature is brilliant",
+        "Everything arrived on time and works great"
+    ]
+}
+
+def load_examples(path: str = None) -> Tuple[List[str], List[str]]:
+    texts = [text for label, examples in SENTIMENT_EXAMPLES.items() for text in examples]
+    labels = [label for label, examples in SENTIMENT_EXAMPLES.items() for _ in examples]
+    if path:
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    texts.append(row["text"])
+                    labels.append(row["label"])
+    return texts, labels
+
+def train(
+    embeddings: np.ndarray,
+    labels: List[str],
+    model_name: str = "",
+    epochs: int = 500,
+    learning_rate: float = 0.1,
+    l2: float = 1e-2
+) -> SentimentHead:
+    """Full-batch gradient descent on softmax cross-entropy; deterministic"""
+    classes = sorted(set(labels))
+    targets = np.eye(len(classes), dtype=np.float32)[[classes.index(l) for l in labels]]
+    # Sentence embeddings share a large common direction; standardizing
+    # the features keeps gradient descent well conditioned
+    unit = _normalize(embeddings.astype(np.float32))
+    mean = unit.mean(axis=0)
+    scale = unit.std(axis=0) + 1e-6
+    x = (unit - mean) / scale
+    weights = np.zeros((len(classes), x.shape[1]), dtype=np.float32)
+    bias = np.zeros(len(classes), dtype=np.float32)
+
+    for _ in range(epochs):
+        logits = x @ weights.T + bias
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        error = (probabilities - targets) / len(x)
+        weights -= learning_rate * (error.T @ x + l2 * weights)
+        bias -= learning_rate * error.sum(axis=0)
+    return SentimentHead(weights, bias, classes, model_name, mean, scale)
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the sentiment head on top of the embedding model")
+    parser.add_argument("--data", help="JSON lines of {\"text\", \"label\"} added to the seed examples")
+    parser.add_argument("--output", default=str(MODEL_CONFIG["embedding"]["sentiment_head_path"]))
+    parser.add_argument("--epochs", type=int, default=500)
+    args = parser.parse_args()
+
+    texts, labels = load_examples(args.data)
+    model = EmbeddingModel()
+    embeddings = np.asarray(model.get_embeddings(texts), dtype=np.float32)
+
+    head = train(embeddings, labels, model.config["model_name"], epochs=args.epochs)
+    predicted = [head.labels[i] for i in np.argmax(head.probabilities(embeddings), axis=1)]
+    accuracy = np.mean([p == l for p, l in zip(predicted, labels)])
+
+    head.save(args.output)
+    print(f"Trained on {len(texts)} examples ({', '.join(head.labels)}); training accuracy {accuracy:.1%}")
+    print(f"Saved sentiment head to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,9 @@ class CustomerSupport:
             "product", "general", "service"
         ]
         
+    # Not memoized: keyword matching is cheap, and timestamps are stamped
+    # per call, never replayed from a cache (see WebSearchTool._fetch); each
+    # inquiry also gets a fresh "open" status
     def handle_inquiry(
         self,
         query: str,
@@ -9,6 +9,8 @@ class EmailWriter:
         self.templates_path = Path(self.config["templates_path"])
         self.templates = self._load_templates()
         
+    # Not memoized: composing is cheap, and timestamps are stamped per call,
+    # never replayed from a cache (see WebSearchTool._fetch)
     def compose_email(
         self,
         context: Dict[str, Any],
@@ -0,0 +1,198 @@
+import gc
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+class ToolRegistry:
+    """
+    Instantiates tools on first use instead of at startup
+
+    Tools can be warmed up in the background and unloaded again once
+    idle, optionally only while the process is above a memory limit.
+    Load time and resident-memory growth are recorded per tool.
+    """
+    def __init__(self, factories: Optional[Dict[str, Callable[[], Any]]] = None):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._tools: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._reaper = None
+        for name, factory in (factories or {}).items():
+            self.register(name, factory)
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """Register a zero-argument factory; nothing is loaded yet"""
+        with self._lock:
+            self._factories[name] = factory
+            self._locks[name] = threading.Lock()
+            self._stats[name] = {
+                "loaded": False,
+                "loads": 0,
+                "load_time": None,
+                "memory_mb": None,
+                "last_used": None
+            }
+
+    def get(self, name: str) -> Any:
+        """Get a tool, instantiating it if needed"""
+        tool = self._tools.get(name)
+        if tool is None:
+            with self._locks[name]:
+                tool = self._tools.get(name)
+                if tool is None:
+                    tool = self._load(name)
+        self._stats[name]["last_used"] = time.time()
+        return tool
+
+    def __getitem__(self, name: str) -> Any:
+        return self.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._tools
+
+    def warm_up(self, names: Optional[Iterable[str]] = None, background: bool = True) -> Optional[threading.Thread]:
+        """Load tools ahead of their first request"""
+        names = list(names if names is not None else self._factories)
+
+        def load_all():
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    print(f"Tool warm-up failed for {name}: {str(e)}")
+
+        if not background:
+            load_all()
+            return None
+        thread = threading.Thread(target=load_all, name="tool-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def unload(self, name: str) -> bool:
+        """Drop a loaded tool so its memory can be reclaimed"""
+        with self._locks[name]:
+            if self._tools.pop(name, None) is None:
+                return False
+            self._stats[name]["loaded"] = False
+        _release_memory()
+        return True
+
+    def unload_idle(self, max_idle: float, memory_limit_mb: Optional[float] = None) -> List[str]:
+        """
+        Unload tools unused for max_idle seconds, least recently used first
+
+        With memory_limit_mb, only unload while resident memory is above
+        the limit.
+        """
+        now = time.time()
+        idle = sorted(
+            (name for name in list(self._tools)
+             if now - (self._stats[name]["last_used"] or 0) >= max_idle),
+            key=lambda name: self._stats[name]["last_used"] or 0
+        )
+        unloaded = []
+        for name in idle:
+            if memory_limit_mb is not None and resident_memory_mb() <= memory_limit_mb:
+                break
+            if self.unload(name):
+                unloaded.append(name)
+        return unloaded
+
+    def start_idle_reaper(
+        self,
+        max_idle: float,
+        interval: float = 60.0,
+        memory_limit_mb: Optional[float] = None
+    ) -> None:
+        """Periodically unload idle tools on a daemon thread"""
+        if self._reaper is not None:
+            return
+
+        def reap():
+            while True:
+                time.sleep(interval)
+                unloaded = self.unload_idle(max_idle, memory_limit_mb)
+                if unloaded:
+                    print(f"Unloaded idle tools: {', '.join(unloaded)}")
+
+        self._reaper = threading.Thread(target=reap, name="tool-reaper", daemon=True)
+        self._reaper.start()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get load time and resident memory per tool"""
+        return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def _load(self, name: str) -> Any:
+        memory_before = resident_memory_mb()
+        start = time.perf_counter()
+        tool = self._factories[name]()
+        load_time = time.perf_counter() - start
+
+        self._tools[name] = tool
+        stats = self._stats[name]
+        stats.update({
+            "loaded": True,
+            "loads": stats["loads"] + 1,
+            "load_time": load_time,
+            # Growth of the whole process while loading; approximate if
+            # other threads allocate at the same time
+            "memory_mb": max(resident_memory_mb() - memory_before, 0.0)
+        })
+        return tool
+
+def resident_memory_mb() -> float:
+    """Current resident set size of this process"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        import resource
+        # Peak rather than current RSS (KiB on Linux) where /proc is unavailable
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _release_memory() -> None:
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+def _web_search():
+    from .web_search import WebSearchTool
+    return WebSearchTool()
+
+def _email():
+    from .email_writer import EmailWriter
+    return EmailWriter()
+
+def _customer_support():
+    from .customer_support import CustomerSupport
+    return CustomerSupport()
+
+def _personal_assist():
+    from .personal_assist import PersonalAssistant
+    return PersonalAssistant()
+
+def _content_creator():
+    from .content_creator import ContentCreator
+    return ContentCreator()
+
+def default_tool_registry() -> ToolRegistry:
+    """Registry of the built-in tools; modules are imported on first use too"""
+    return ToolRegistry({
+        "web_search": _web_search,
+        "email": _email,
+        "customer_support": _customer_support,
+        "personal_assist": _personal_assist,
+        "content_creator": _content_creator
+    })
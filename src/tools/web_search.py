@@ -1,7 +1,8 @@
 from typing import List, Dict, Any
 import requests
 from bs4 import BeautifulSoup
-from ..config.settings import TOOL_CONFIG
+from ..config.settings import TOOL_CONFIG, CACHE_CONFIG
+from ..utils.cache import cached
 
 class WebSearchTool:
     def __init__(self):
@@ -15,13 +16,21 @@ class WebSearchTool:
         Perform web search and return results
         """
         try:
-            # Here you would typically use a search API
-            # For demonstration, we'll create a mock search result
-            results = self._mock_search(query)
-            return self._process_results(results)
+            return self._process_results(self._fetch(query))
         except Exception as e:
             raise Exception(f"Error in web search: {str(e)}")
     
+    # Only the fetched results are memoized; the metadata timestamp is
+    # stamped per call by _process_results, never replayed from the cache
+    @cached(ttl=CACHE_CONFIG["tool_ttl"], stale_ttl=CACHE_CONFIG["tool_stale_ttl"])
+    def _fetch(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Raw results for a query
+        """
+        # Here you would typically use a search API
+        # For demonstration, we'll create a mock search result
+        return self._mock_search(query)
+    
     def _mock_search(self, query: str) -> List[Dict[str, Any]]:
         """
         Mock search results for demonstration
@@ -1,39 +1,568 @@
 import redis
-from typing import Any, Optional
-import pickle
-import hashlib
+from typing import Any, Callable, Dict, Iterable, Optional
+import functools
+import inspect
+import math
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
+from ..config.settings import CACHE_CONFIG
+from .cache_keys import canonical_key
+from .codecs import CacheEntry, Codec
+from .single_flight import SingleFlight
+
+class LocalCache:
+    """
+    In-process LRU of decoded values, bounded by entry count and by the
+    encoded size of the values, with a per-entry expiry
+
+    Values are returned as stored, so callers must not mutate them.
+    """
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, size, expires_at)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[2] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: Any, size: int, expire_in: Optional[float] = None) -> None:
+        ttl = self.ttl if not expire_in else min(self.ttl, expire_in)
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes or ttl <= 0:
+                return
+            self.entries[key] = (value, size, time.monotonic() + ttl)
+            self.bytes += size
+            while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self.entries if k.startswith(prefix)]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self.entries),
+            "bytes": self.bytes
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
 
 class CacheManager:
-    def __init__(self, host='localhost', port=6379, db=0):
-        self.redis_client = redis.Redis(
-            host=host,
-            port=port,
-            db=db,
+    """
+    Redis-backed cache with an optional in-process LRU tier in front
+
+    Values are serialized with a Codec (msgpack, raw float vectors,
+    optional compression) rather than pickle. Reads go to the local tier
+    first and fall through to Redis, filling the local tier on the way
+    back; writes go to both. With invalidation enabled, every write or
+    delete is published on a Redis channel so other processes drop their
+    local copy; otherwise local entries may be stale for up to local_ttl
+    seconds.
+
+    Each public call costs at most one round trip: values are written with
+    SET EX, the bulk methods use MGET and pipelines, and invalidation
+    messages ride in the same pipeline as the write. After a connection
+    error Redis is skipped for retry_after seconds and only the local
+    tier is used, so callers never queue up behind a dead server.
+
+    get_or_compute() guards expensive values against stampedes: callers
+    in one process share a single computation, a Redis lease lets only
+    one process recompute a key, entries may be refreshed early
+    (probabilistically, XFetch) and, with stale_ttl, expired values are
+    served while one worker refreshes them.
+    """
+    _release_script = None
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        host=None,
+        port=None,
+        db=None,
+        local_entries: Optional[int] = None,
+        local_max_bytes: Optional[int] = None,
+        local_ttl: Optional[float] = None,
+        invalidation: Optional[bool] = None,
+        redis_client: Optional[Any] = None,
+        codec: Optional[Codec] = None
+    ):
+        self.codec = codec or Codec()
+        self.redis_client = redis_client or redis.Redis(connection_pool=redis.ConnectionPool(
+            host=host or CACHE_CONFIG["host"],
+            port=port or CACHE_CONFIG["port"],
+            db=CACHE_CONFIG["db"] if db is None else db,
+            max_connections=CACHE_CONFIG["max_connections"],
+            socket_timeout=CACHE_CONFIG["socket_timeout"],
+            socket_connect_timeout=CACHE_CONFIG["connect_timeout"],
             decode_responses=False
-        )
-        
-    def generate_key(self, prefix: str, data: Any) -> str:
-        """Generate a unique cache key"""
-        data_str = str(data)
-        return f"{prefix}:{hashlib.md5(data_str.encode()).hexdigest()}"
-    
-    def set(self, key: str, value: Any, expire_in: Optional[int] = None):
-        """Store value in cache"""
-        try:
-            serialized_value = pickle.dumps(value)
-            self.redis_client.set(key, serialized_value)
-            if expire_in:
-                self.redis_client.expire(key, expire_in)
+        ))
+        local_entries = CACHE_CONFIG["local_entries"] if local_entries is None else local_entries
+        self.local = LocalCache(
+            local_entries,
+            CACHE_CONFIG["local_max_bytes"] if local_max_bytes is None else local_max_bytes,
+            CACHE_CONFIG["local_ttl"] if local_ttl is None else local_ttl
+        ) if local_entries else None
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.redis_errors = 0
+        self.invalidations = 0
+        self.node_id = uuid.uuid4().hex.encode()
+        self._down_until = 0.0
+        self.flights = SingleFlight()
+        self.computes = 0
+        self.early_refreshes = 0
+        self.stale_served = 0
+        self.lease_waits = 0
+        self._refresher = None
+        self._refresher_lock = threading.Lock()
+        self._listener = None
+        if self.local is not None and (CACHE_CONFIG["invalidation"] if invalidation is None else invalidation):
+            self._subscribe()
+
+    @classmethod
+    def shared(cls) -> "CacheManager":
+        """Get the process-wide cache, so every session shares one local tier and subscriber"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def generate_key(self, prefix: str, data: Any, fields: Optional[Iterable[str]] = None) -> str:
+        """Generate a unique cache key, independent of dict ordering; see canonical_key"""
+        return canonical_key(prefix, data, fields)
+
+    def set(self, key: str, value: Any, expire_in: Optional[int] = None, vector: bool = False):
+        """Store value in cache; vector=True stores a list of floats compactly, see Codec"""
+        self.set_many({key: value}, expire_in, vector)
+
+    def set_many(self, values: Dict[str, Any], expire_in: Optional[int] = None, vector: bool = False):
+        """Store several values in one round trip"""
+        if not values:
+            return
+        try:
+            serialized = {key: self.codec.encode(value, vector) for key, value in values.items()}
         except Exception as e:
             print(f"Cache set error: {e}")
-    
+            return
+        if self._redis_up():
+            try:
+                if len(serialized) == 1 and self._listener is None:
+                    key, data = next(iter(serialized.items()))
+                    self.redis_client.set(key, data, ex=expire_in or None)
+                else:
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    for key, data in serialized.items():
+                        pipe.set(key, data, ex=expire_in or None)
+                        self._publish(pipe, b"k", key)
+                    pipe.execute()
+            except Exception as e:
+                self._redis_failed("set", e)
+        if self.local is not None:
+            for key, value in values.items():
+                self.local.set(key, value, len(serialized[key]), expire_in)
+
     def get(self, key: str) -> Optional[Any]:
         """Retrieve value from cache"""
+        if self.local is not None:
+            value = self.local.get(key)
+            if value is not None:
+                return value
+        if not self._redis_up():
+            return None
         try:
             value = self.redis_client.get(key)
             if value:
-                return pickle.loads(value)
+                self.redis_hits += 1
+                result = self.codec.decode(value)
+                if self.local is not None:
+                    self.local.set(key, result, len(value))
+                return result
+            self.redis_misses += 1
+        except Exception as e:
+            self._redis_failed("get", e)
+        return None
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Retrieve several values with at most one round trip; missing keys are left out"""
+        found = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            value = self.local.get(key) if self.local is not None else None
+            if value is None:
+                missing.append(key)
+            else:
+                found[key] = value
+        if not missing or not self._redis_up():
+            return found
+        try:
+            for key, value in zip(missing, self.redis_client.mget(missing)):
+                if not value:
+                    self.redis_misses += 1
+                    continue
+                self.redis_hits += 1
+                found[key] = self.codec.decode(value)
+                if self.local is not None:
+                    self.local.set(key, found[key], len(value))
         except Exception as e:
-            print(f"Cache get error: {e}")
-        return None 
\ No newline at end of file
+            self._redis_failed("get", e)
+        return found
+
+    def delete(self, key: str) -> None:
+        """Remove a value from both tiers and from other processes' local tiers"""
+        try:
+            if self.local is not None:
+                self.local.delete(key)
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.delete(key)
+            self._publish(pipe, b"k", key)
+            pipe.execute()
+        except Exception as e:
+            self._redis_failed("delete", e)
+
+    def delete_prefix(self, prefix: str, batch_size: int = 500) -> int:
+        """
+        Remove every key starting with prefix; walks the keyspace with SCAN
+        so Redis is never blocked, unlinking each batch in one round trip
+        """
+        deleted = 0
+        try:
+            if self.local is not None:
+                self.local.delete_prefix(prefix)
+            batch = []
+            for key in self.redis_client.scan_iter(match=f"{_escape_glob(prefix)}*", count=batch_size):
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    deleted += self.redis_client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += self.redis_client.unlink(*batch)
+            if self._listener is not None:
+                self._publish(self.redis_client, b"p", prefix)
+        except Exception as e:
+            self._redis_failed("delete", e)
+        return deleted
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int] = None,
+        stale_ttl: Optional[int] = None,
+        beta: Optional[float] = None,
+        vector: bool = False
+    ) -> Any:
+        """
+        Get the value for key, calling compute() on a miss with stampede
+        protection
+
+        Values are stored with their compute time and soft expiry. Within
+        ttl the value is served and, with probability rising towards the
+        expiry (scaled by beta and the compute time), refreshed in the
+        background. For stale_ttl seconds past the expiry the old value is
+        still served while one worker refreshes it. Otherwise the caller
+        recomputes, coalesced with every other caller of the key.
+        vector=True stores the value in the codec's float vector format.
+        """
+        stale_ttl = CACHE_CONFIG["stale_ttl"] if stale_ttl is None else stale_ttl
+        beta = CACHE_CONFIG["early_refresh_beta"] if beta is None else beta
+        entry = self.get(key)
+        if isinstance(entry, CacheEntry):
+            now = time.time()
+            fresh = entry.expires is None or now < entry.expires
+            if fresh and not _refresh_early(entry, now, beta):
+                return entry.value
+            if fresh or stale_ttl:
+                if not fresh:
+                    self.stale_served += 1
+                if self._refresh_in_background(key, compute, ttl, stale_ttl, vector) and fresh:
+                    self.early_refreshes += 1
+                return entry.value
+        return self.flights.do(key, lambda: self._recompute(key, compute, ttl, stale_ttl, vector, wait=True))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters per tier"""
+        lookups = self.redis_hits + self.redis_misses
+        return {
+            "local": self.local.stats() if self.local is not None else None,
+            "redis": {
+                "hits": self.redis_hits,
+                "misses": self.redis_misses,
+                "hit_rate": self.redis_hits / lookups if lookups else 0.0,
+                "errors": self.redis_errors
+            },
+            "invalidations": self.invalidations,
+            "recompute": {
+                "computes": self.computes,
+                "coalesced": self.flights.coalesced,
+                "early_refreshes": self.early_refreshes,
+                "stale_served": self.stale_served,
+                "lease_waits": self.lease_waits
+            }
+        }
+
+    def close(self) -> None:
+        """Stop listening for invalidations"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    def _recompute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int],
+        stale_ttl: int,
+        vector: bool,
+        wait: bool
+    ) -> Any:
+        """Compute and store the value if this process gets the lease; otherwise wait for the holder's value"""
+        token = self._acquire_lease(key)
+        if token is None:
+            if not wait:
+                return None  # Another process is already refreshing it
+            self.lease_waits += 1
+            entry = self._wait_for_lease(key)
+            if entry is not None:
+                return entry.value
+            token = self._acquire_lease(key)  # The holder gave up or died; compute anyway
+        try:
+            start = time.monotonic()
+            value = compute()
+            self.computes += 1
+            if value is not None:
+                entry = CacheEntry(value, time.monotonic() - start, time.time() + ttl if ttl else None, vector)
+                self.set(key, entry, expire_in=ttl + stale_ttl if ttl else None)
+            return value
+        finally:
+            if token is not None:
+                self._release_lease(key, token)
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int],
+        stale_ttl: int,
+        vector: bool
+    ) -> bool:
+        """Schedule a refresh unless one is already running here; True if scheduled"""
+        if self.flights.in_flight(key):
+            return False
+        with self._refresher_lock:
+            if self._refresher is None:
+                self._refresher = ThreadPoolExecutor(
+                    max_workers=CACHE_CONFIG["refresh_workers"], thread_name_prefix="cache-refresh"
+                )
+        self._refresher.submit(self._refresh, key, compute, ttl, stale_ttl, vector)
+        return True
+
+    def _refresh(self, key: str, compute: Callable[[], Any], ttl: Optional[int], stale_ttl: int, vector: bool) -> None:
+        try:
+            self.flights.do(key, lambda: self._recompute(key, compute, ttl, stale_ttl, vector, wait=False))
+        except Exception as e:
+            print(f"Cache refresh error for {key}: {e}")
+
+    def _acquire_lease(self, key: str) -> Optional[str]:
+        """A token if this process may compute key, None if another one holds the lease"""
+        token = uuid.uuid4().hex
+        if not CACHE_CONFIG["lease_ttl"] or not self._redis_up():
+            return token  # In-process coalescing only
+        try:
+            acquired = self.redis_client.set(f"lease:{key}", token, nx=True, px=int(CACHE_CONFIG["lease_ttl"] * 1000))
+            return token if acquired else None
+        except Exception as e:
+            self._redis_failed("lease", e)
+            return token
+
+    def _release_lease(self, key: str, token: str) -> None:
+        """Delete the lease only if it is still ours"""
+        if not CACHE_CONFIG["lease_ttl"] or not self._redis_up():
+            return
+        lease = f"lease:{key}"
+        try:
+            if CacheManager._release_script is not False:
+                try:
+                    if CacheManager._release_script is None:
+                        CacheManager._release_script = self.redis_client.register_script(
+                            "if redis.call('get', KEYS[1]) == ARGV[1] then "
+                            "return redis.call('del', KEYS[1]) end return 0"
+                        )
+                    CacheManager._release_script(keys=[lease], args=[token], client=self.redis_client)
+                    return
+                except redis.exceptions.ResponseError:
+                    CacheManager._release_script = False  # No scripting (e.g. some test servers)
+            with self.redis_client.pipeline() as pipe:
+                pipe.watch(lease)
+                if pipe.get(lease) == token.encode():
+                    pipe.multi()
+                    pipe.delete(lease)
+                    pipe.execute()
+        except redis.exceptions.WatchError:
+            pass  # Expired and taken over meanwhile; not ours to delete
+        except Exception as e:
+            self._redis_failed("lease", e)
+
+    def _wait_for_lease(self, key: str) -> Optional[CacheEntry]:
+        """Poll until the lease holder stores a fresh entry; None if the lease ends without one"""
+        deadline = time.monotonic() + CACHE_CONFIG["lease_ttl"]
+        while time.monotonic() < deadline:
+            time.sleep(CACHE_CONFIG["lease_poll"])
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.get(key)
+                pipe.exists(f"lease:{key}")
+                data, leased = pipe.execute()
+            except Exception as e:
+                self._redis_failed("lease", e)
+                return None
+            entry = self.codec.decode(data) if data else None
+            if isinstance(entry, CacheEntry) and (entry.expires is None or time.time() < entry.expires):
+                return entry
+            if not leased:
+                return None
+        return None
+
+    def _redis_up(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _redis_failed(self, operation: str, error: Exception) -> None:
+        self.redis_errors += 1
+        if isinstance(error, (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError)):
+            if self._redis_up():
+                print(f"Cache unavailable, using the local tier for {CACHE_CONFIG['retry_after']}s: {error}")
+            self._down_until = time.monotonic() + CACHE_CONFIG["retry_after"]
+        else:
+            print(f"Cache {operation} error: {error}")
+
+    def _publish(self, client: Any, kind: bytes, key: str) -> None:
+        """Queue an invalidation of a key (kind b"k") or prefix (b"p") on a client or pipeline"""
+        if self._listener is not None:
+            client.publish(CACHE_CONFIG["channel"], b" ".join([self.node_id, kind, key.encode()]))
+
+    def _subscribe(self) -> None:
+        try:
+            pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{CACHE_CONFIG["channel"]: self._on_invalidate})
+            self._listener = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+        except Exception as e:
+            print(f"Cache invalidation unavailable, local entries expire after their TTL: {e}")
+
+    def _on_invalidate(self, message: Dict[str, Any]) -> None:
+        node_id, kind, key = message["data"].split(b" ", 2)
+        if node_id == self.node_id:
+            return
+        if kind == b"p":
+            self.local.delete_prefix(key.decode())
+        else:
+            self.local.delete(key.decode())
+        self.invalidations += 1
+
+def _refresh_early(entry: CacheEntry, now: float, beta: float) -> bool:
+    """
+    XFetch: refresh before expiry with a probability that grows as it
+    nears, earlier for values that take longer to compute
+    """
+    if not beta or entry.expires is None or not entry.delta:
+        return False
+    return now - entry.delta * beta * math.log(1.0 - random.random()) >= entry.expires
+
+def _escape_glob(pattern: str) -> str:
+    """Escape Redis MATCH wildcards so a prefix is matched literally"""
+    for char in "\\*?[]":
+        pattern = pattern.replace(char, "\\" + char)
+    return pattern
+
+def cached(
+    ttl: Optional[int] = None,
+    key: Optional[Callable[..., Any]] = None,
+    stale_ttl: Optional[int] = None,
+    prefix: Optional[str] = None,
+    fields: Optional[Iterable[str]] = None,
+    enabled: bool = True,
+    cache: Optional[CacheManager] = None,
+    vector: bool = False
+):
+    """
+    Memoize a function or method through CacheManager
+
+    The key is derived from the call's arguments (without self), or from
+    whatever key(*args, **kwargs) returns; fields limits either to the
+    named arguments/keys. None results are not cached. Misses go through
+    CacheManager.get_or_compute, so concurrent callers share one call and
+    stale_ttl serves expired results while they are refreshed. vector=True
+    stores float-list results in the codec's raw vector format.
+    Memoization can be switched off globally with CACHE_CONFIG["memoize"].
+
+        @cached(ttl=600, key=lambda self, query, context: (query, context.get("tier")))
+        def handle(self, query, context): ...
+    """
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        if not enabled:
+            return fn
+        name = prefix or f"memo:{fn.__module__}.{fn.__qualname__}"
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not CACHE_CONFIG["memoize"]:
+                return fn(*args, **kwargs)
+            if key is not None:
+                data = key(*args, **kwargs)
+            else:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                data = {k: v for k, v in bound.arguments.items() if k != "self"}
+            store = cache or CacheManager.shared()
+            try:
+                cache_key = store.generate_key(name, data, fields)
+            except TypeError as e:
+                print(f"Not caching {name}: {e}")
+                return fn(*args, **kwargs)
+            return store.get_or_compute(cache_key, lambda: fn(*args, **kwargs), ttl, stale_ttl, vector=vector)
+        return wrapper
+    return decorator
@@ -0,0 +1,100 @@
+import hashlib
+import struct
+from typing import Any, Iterable, List, Optional
+import numpy as np
+
+_pack_double = struct.Struct("<d").pack
+
+def canonical_key(prefix: str, data: Any, fields: Optional[Iterable[str]] = None) -> str:
+    """
+    Stable cache key for data: "<prefix>:<32 hex chars of BLAKE2b>"
+
+    Equal content always gives the same key, whatever the dict insertion
+    order, and values of different types never collide ("1" vs 1 vs 1.0 vs
+    True). fields limits a dict to those top-level keys, so unrelated
+    context doesn't split the cache.
+    """
+    if fields is not None and isinstance(data, dict):
+        allowed = set(fields)
+        data = {k: v for k, v in data.items() if k in allowed}
+    parts: List[bytes] = []
+    _encode(data, parts)
+    return f"{prefix}:{hashlib.blake2b(b''.join(parts), digest_size=16).hexdigest()}"
+
+def _encode(value: Any, parts: List[bytes]) -> None:
+    """Append a type-tagged, length-prefixed encoding of value"""
+    append = parts.append
+    kind = type(value)
+    if kind is str:
+        data = value.encode("utf-8")
+        append(b"s%d:" % len(data))
+        append(data)
+    elif kind is dict:
+        append(b"d%d{" % len(value))
+        if all(type(k) is str for k in value):
+            for k in sorted(value):
+                data = k.encode("utf-8")
+                append(b"s%d:" % len(data))
+                append(data)
+                _encode(value[k], parts)
+        else:
+            # Mixed key types: order by each key's encoding
+            items = []
+            for k, v in value.items():
+                key_parts: List[bytes] = []
+                _encode(k, key_parts)
+                items.append((b"".join(key_parts), v))
+            items.sort(key=lambda item: item[0])
+            for key, v in items:
+                append(key)
+                _encode(v, parts)
+        append(b"}")
+    elif kind is list or kind is tuple:
+        append(b"%c%d[" % (108 if kind is list else 116, len(value)))  # b"l" / b"t"
+        if value and all(type(item) is str for item in value):
+            for item in value:
+                data = item.encode("utf-8")
+                append(b"s%d:" % len(data))
+                append(data)
+        elif value and all(type(item) is float for item in value):
+            # Float vectors: one packed buffer instead of one part per number
+            append(b"V")
+            append(np.array(value, dtype=np.float64).tobytes())
+        else:
+            for item in value:
+                _encode(item, parts)
+        append(b"]")
+    elif kind is float:
+        # NaN never equals itself; key every NaN the same
+        append(b"fnan;" if value != value else b"f" + _pack_double(value + 0.0))
+    elif kind is int:
+        append(b"i%d;" % value)
+    elif kind is bool:
+        append(b"T" if value else b"F")
+    elif value is None:
+        append(b"N")
+    elif kind is set or kind is frozenset:
+        members = []
+        for item in value:
+            member: List[bytes] = []
+            _encode(item, member)
+            members.append(b"".join(member))
+        append(b"S%d[" % len(members))
+        parts.extend(sorted(members))
+        append(b"]")
+    elif kind is bytes:
+        append(b"b%d:" % len(value))
+        append(value)
+    elif isinstance(value, np.ndarray):
+        # Raw buffer: hashing an embedding costs a memcpy, not a repr
+        array = np.ascontiguousarray(value)
+        append(f"a{array.dtype.str}{array.shape}:".encode())
+        append(array.tobytes())
+    elif isinstance(value, np.generic):
+        _encode(value.item(), parts)
+    elif isinstance(value, (str, int, float, dict, list, tuple)):
+        # Subclasses (enums, named tuples, ...) key like their base type
+        base = next(t for t in (str, int, float, dict, tuple, list) if isinstance(value, t))
+        _encode(base(value), parts)
+    else:
+        raise TypeError(f"Can't derive a cache key from {kind.__name__}; pass key= to select the fields")
@@ -0,0 +1,185 @@
+import json
+import math
+import pickle
+import struct
+from functools import lru_cache
+from typing import Any, Optional
+import numpy as np
+from ..config.settings import CACHE_CONFIG
+
+try:
+    import msgpack
+except ImportError:  # JSON is used for structured values instead
+    msgpack = None
+
+# Header byte 1: payload format. None of these can start a pickle
+# (b"\x80") so values written before the codec existed are recognized.
+MSGPACK = 0x01
+JSON = 0x02
+FLOAT32 = 0x03
+FLOAT16 = 0x04
+BYTES = 0x05
+ENTRY = 0x06  # CacheEntry: compute time and expiry, then the value with its own header
+
+# Header byte 2: compression in the low bits, flags above
+NONE = 0x00
+ZSTD = 0x01
+LZ4 = 0x02
+COMPRESSION_MASK = 0x0F
+AS_LIST = 0x10  # Vector was given as a Python list; decode back to one
+
+_COMPRESSIONS = {"none": NONE, "zstd": ZSTD, "lz4": LZ4}
+_VECTOR_DTYPES = {FLOAT32: np.dtype("<f4"), FLOAT16: np.dtype("<f2")}
+
+class CodecError(ValueError):
+    """Raised for values that can't be encoded or payloads that can't be decoded"""
+
+class CacheEntry:
+    """
+    A value stored by CacheManager.get_or_compute, with how long it took to
+    compute and its soft expiry (epoch seconds, None for never)
+
+    The codec keeps these in a fixed header in front of the value, so the
+    value itself is encoded as if stored on its own.
+    """
+    __slots__ = ("value", "delta", "expires", "vector")
+
+    def __init__(self, value: Any, delta: float, expires: Optional[float], vector: bool = False):
+        self.value = value
+        self.delta = delta
+        self.expires = expires
+        self.vector = vector  # Encode the value with vector=True
+
+class Codec:
+    """
+    Serializes cached values behind a two-byte header (format, compression
+    and flags), so values written with different settings can be mixed
+
+    - float vectors and matrices (NumPy float arrays, or lists of floats
+      and lists of such lists passed with vector=True) are stored as raw
+      little-endian float32 or float16 buffers with their row count, and
+      decoded with np.frombuffer; other lists round-trip exactly
+    - bytes are stored as-is
+    - everything else goes through msgpack, or JSON without it
+    - payloads of at least compress_min_bytes are compressed with zstd or
+      lz4 when that makes them smaller
+
+    Pickle is never written and is only read with allow_pickle, since
+    unpickling from a shared Redis can run arbitrary code.
+    """
+    def __init__(
+        self,
+        vector_dtype: Optional[str] = None,
+        compression: Optional[str] = None,
+        compress_min_bytes: Optional[int] = None,
+        allow_pickle: Optional[bool] = None
+    ):
+        vector_dtype = vector_dtype or CACHE_CONFIG["vector_dtype"]
+        self.vector_format = FLOAT16 if vector_dtype == "float16" else FLOAT32
+        self.compression = _COMPRESSIONS[compression or CACHE_CONFIG["compression"]]
+        self.compress_min_bytes = (
+            CACHE_CONFIG["compress_min_bytes"] if compress_min_bytes is None else compress_min_bytes
+        )
+        self.allow_pickle = CACHE_CONFIG["allow_pickle"] if allow_pickle is None else allow_pickle
+        self._compressor = _compressor(self.compression)
+
+    def encode(self, value: Any, vector: bool = False) -> bytes:
+        """Serialize a value; vector=True stores a list of floats (or of rows) as a raw vector"""
+        if isinstance(value, CacheEntry):
+            expires = math.nan if value.expires is None else value.expires
+            return bytes((ENTRY, 0)) + struct.pack("<dd", value.delta, expires) + self.encode(value.value, value.vector)
+        flags = 0
+        vector = _as_vector(value, vector)
+        if vector is not None:
+            fmt = self.vector_format
+            flags |= AS_LIST if not isinstance(value, np.ndarray) else 0
+            rows = vector.shape[0] if vector.ndim == 2 else 0
+            body = struct.pack("<I", rows) + vector.astype(_VECTOR_DTYPES[fmt], copy=False).tobytes()
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            fmt, body = BYTES, bytes(value)
+        else:
+            try:
+                if msgpack is not None:
+                    fmt, body = MSGPACK, msgpack.packb(value, use_bin_type=True)
+                else:
+                    fmt, body = JSON, json.dumps(value, separators=(",", ":")).encode("utf-8")
+            except (TypeError, ValueError) as e:
+                raise CodecError(f"Can't encode {type(value).__name__}: {e}")
+
+        if self._compressor is not None and len(body) >= self.compress_min_bytes:
+            compressed = self._compressor[0](body)
+            if len(compressed) < len(body):
+                body = compressed
+                flags |= self.compression
+        return bytes((fmt, flags)) + body
+
+    def decode(self, data: bytes) -> Any:
+        if data[:1] == b"\x80":
+            if not self.allow_pickle:
+                raise CodecError("Refusing to unpickle a cached value (allow_pickle is off)")
+            return pickle.loads(data)
+        if len(data) < 2:
+            raise CodecError("Truncated cache value")
+
+        fmt, flags = data[0], data[1]
+        body = memoryview(data)[2:]
+        if fmt == ENTRY:
+            delta, expires = struct.unpack_from("<dd", body)
+            return CacheEntry(self.decode(bytes(body[16:])), delta, None if math.isnan(expires) else expires)
+        compression = flags & COMPRESSION_MASK
+        if compression:
+            codec = _compressor(compression)
+            if codec is None:
+                raise CodecError(f"Cache value uses unavailable compression {compression}")
+            body = memoryview(codec[1](body))
+
+        if fmt in _VECTOR_DTYPES:
+            rows = struct.unpack_from("<I", body)[0]
+            vector = np.frombuffer(body, dtype=_VECTOR_DTYPES[fmt], offset=4)
+            if rows:
+                vector = vector.reshape(rows, -1)
+            return vector.tolist() if flags & AS_LIST else vector
+        if fmt == BYTES:
+            return bytes(body)
+        if fmt == MSGPACK:
+            if msgpack is None:
+                raise CodecError("Cache value was written with msgpack, which is not installed")
+            return msgpack.unpackb(body, raw=False)
+        if fmt == JSON:
+            return json.loads(bytes(body))
+        raise CodecError(f"Unknown cache value format {fmt}")
+
+def _as_vector(value: Any, requested: bool) -> Optional[np.ndarray]:
+    """
+    The value as a 1-D or 2-D float array when it is a NumPy float array
+    or the caller asked for the vector format, else None
+    """
+    if isinstance(value, np.ndarray) and value.dtype.kind == "f" and value.ndim in (1, 2) and value.size:
+        return value
+    if not requested:
+        return None
+    try:
+        vector = np.asarray(value, dtype=np.float64)
+    except (TypeError, ValueError) as e:
+        raise CodecError(f"Can't encode {type(value).__name__} as a vector: {e}")
+    if not vector.size:
+        return None  # Nothing to gain; e.g. no embeddings for no texts
+    if vector.ndim not in (1, 2):
+        raise CodecError(f"Can't encode a {vector.ndim}-D array as a vector")
+    return vector
+
+@lru_cache(maxsize=None)
+def _compressor(kind: int):
+    """(compress, decompress) for a compression id, or None if off or unavailable"""
+    try:
+        if kind == ZSTD:
+            import zstandard
+            # Module-level functions: compressor objects can't be shared across threads
+            return (lambda body: zstandard.compress(body, 3)), zstandard.decompress
+        if kind == LZ4:
+            import lz4.frame
+            return lz4.frame.compress, lz4.frame.decompress
+    except ImportError:
+        if kind:
+            print(f"Cache compression {kind} unavailable, storing values uncompressed")
+    return None
@@ -1,6 +1,5 @@
 from typing import Dict, Any, List
 import numpy as np
-from sklearn.cluster import KMeans
 from datetime import datetime
 from collections import Counter
 
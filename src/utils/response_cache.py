@@ -0,0 +1,91 @@
+import threading
+from typing import Any, Dict, List, Optional
+from .cache import CacheManager
+from ..config.settings import RESPONSE_CACHE_CONFIG
+
+class ResponseCache:
+    """
+    Exact-match cache for LLM responses, stored through CacheManager
+
+    Entries are keyed by model name, temperature, the normalized user
+    input and the conversation turns that actually make it into the
+    prompt. Requests sampled above max_temperature bypass the cache.
+    """
+    def __init__(
+        self,
+        cache: Optional[CacheManager] = None,
+        enabled: Optional[bool] = None,
+        ttl: Optional[int] = None,
+        max_temperature: Optional[float] = None
+    ):
+        self.cache = cache or CacheManager()
+        self.enabled = RESPONSE_CACHE_CONFIG["enabled"] if enabled is None else enabled
+        self.ttl = RESPONSE_CACHE_CONFIG["ttl"] if ttl is None else ttl
+        self.max_temperature = (
+            RESPONSE_CACHE_CONFIG["max_temperature"] if max_temperature is None else max_temperature
+        )
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: Optional[bool] = None, ttl: Optional[int] = None) -> None:
+        """Apply settings from the UI"""
+        if enabled is not None:
+            self.enabled = enabled
+        if ttl is not None:
+            self.ttl = ttl
+
+    def accepts(self, temperature: float) -> bool:
+        """Whether requests sampled at this temperature may be cached"""
+        return self.enabled and temperature <= self.max_temperature
+
+    def make_key(
+        self,
+        model_name: str,
+        temperature: float,
+        user_input: str,
+        memory: List[Dict[str, Any]]
+    ) -> Optional[str]:
+        """Get the cache key for a request, or None if it must bypass the cache"""
+        if not self.accepts(temperature):
+            self._count("bypassed")
+            return None
+
+        return self.cache.generate_key("llm_response", {
+            "model": model_name,
+            "temperature": temperature,
+            "input": self._normalize(user_input),
+            "memory": [
+                (self._normalize(turn.get("input", "")), self._normalize(turn.get("response", "")))
+                for turn in memory
+            ]
+        })
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached response"""
+        response = self.cache.get(key)
+        self._count("misses" if response is None else "hits")
+        return response
+
+    def set(self, key: str, response: str) -> None:
+        """Store a response for the configured TTL"""
+        self.cache.set(key, response, expire_in=self.ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _normalize(self, text: str) -> str:
+        """Case- and whitespace-insensitive form of the text"""
+        return " ".join(text.lower().split())
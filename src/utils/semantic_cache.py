@@ -0,0 +1,171 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, Optional, Sequence
+import numpy as np
+from .vector_index import create_index
+from ..config.settings import SEMANTIC_CACHE_CONFIG
+
+class SemanticCache:
+    """
+    Response cache that matches paraphrases: each query is embedded and
+    answered from the most similar cached query when the cosine
+    similarity clears the threshold
+
+    Entries are evicted least-recently-used once max_entries is reached
+    and expire after ttl seconds. Lookups search the search_k nearest
+    entries, so an expired neighbour doesn't hide a valid one, and expired
+    entries are swept out at most once per ttl.
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        embedding_model: Any,
+        threshold: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[int] = None,
+        index_backend: Optional[str] = None,
+        search_k: Optional[int] = None
+    ):
+        self.embedding_model = embedding_model
+        self.threshold = SEMANTIC_CACHE_CONFIG["threshold"] if threshold is None else threshold
+        self.max_entries = SEMANTIC_CACHE_CONFIG["max_entries"] if max_entries is None else max_entries
+        self.ttl = SEMANTIC_CACHE_CONFIG["ttl"] if ttl is None else ttl
+        self.index_backend = index_backend or SEMANTIC_CACHE_CONFIG["index"]
+        self.search_k = SEMANTIC_CACHE_CONFIG["search_k"] if search_k is None else search_k
+        self.index = None
+        self.entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._next_id = 0
+        self._last_sweep = time.time()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.latency_saved = 0.0
+        # Best-match similarity of recent lookups, for tuning the threshold
+        self.similarities = deque(maxlen=10000)
+
+    @classmethod
+    def shared(cls) -> "SemanticCache":
+        """Get the process-wide cache, loading the embedding model on first use"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                from ..models.embedding_batcher import EmbeddingBatcher
+                cls._shared = cls(EmbeddingBatcher.shared())
+            return cls._shared
+
+    def embed(self, query: str) -> np.ndarray:
+        """Embed a query for lookup/store"""
+        return np.asarray(self.embedding_model.get_embeddings(query), dtype=np.float32)
+
+    def lookup(self, query: str, embedding: Optional[np.ndarray] = None) -> Optional[str]:
+        """Get the cached response for the closest earlier query, if similar enough"""
+        if embedding is None:
+            embedding = self.embed(query)
+
+        with self._lock:
+            entry = None
+            if self.index is not None:
+                matches = self.index.search(embedding, k=self.search_k)
+                if matches:
+                    self.similarities.append(matches[0][1])
+                now = time.time()
+                for entry_id, similarity in matches:
+                    if similarity < self.threshold:
+                        break
+                    if now - self.entries[entry_id]["created"] > self.ttl:
+                        self._drop(entry_id)
+                        continue
+                    entry = self.entries[entry_id]
+                    self.entries.move_to_end(entry_id)
+                    break
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.latency_saved += entry["latency"]
+            return entry["response"]
+
+    def store(
+        self,
+        query: str,
+        response: str,
+        embedding: Optional[np.ndarray] = None,
+        latency: float = 0.0
+    ) -> None:
+        """
+        Cache a response
+
+        Args:
+            latency: Upstream time it took to produce the response, credited
+                to latency_saved on every hit
+        """
+        if embedding is None:
+            embedding = self.embed(query)
+
+        with self._lock:
+            if self.index is None:
+                self.index = create_index(len(embedding), self.index_backend)
+            self._sweep()
+            entry_id = self._next_id
+            self._next_id += 1
+            self.index.add(entry_id, embedding)
+            self.entries[entry_id] = {
+                "query": query,
+                "response": response,
+                "created": time.time(),
+                "latency": latency
+            }
+            while len(self.entries) > self.max_entries:
+                evicted_id, _ = self.entries.popitem(last=False)
+                self.index.remove(evicted_id)
+                self.evictions += 1
+
+    def _drop(self, entry_id: int) -> None:
+        del self.entries[entry_id]
+        self.index.remove(entry_id)
+
+    def _sweep(self) -> None:
+        """Drop every expired entry, at most once per ttl"""
+        now = time.time()
+        if now - self._last_sweep < self.ttl:
+            return
+        self._last_sweep = now
+        for entry_id in [i for i, e in self.entries.items() if now - e["created"] > self.ttl]:
+            self._drop(entry_id)
+
+    def stats(self, thresholds: Sequence[float] = (0.8, 0.85, 0.9, 0.95)) -> Dict[str, Any]:
+        """
+        Get hit-rate, latency-saved and similarity-distribution metrics
+
+        projected_hit_rate is the share of recent lookups whose best match
+        would have cleared each candidate threshold.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            similarities = np.array(self.similarities, dtype=np.float32)
+
+        histogram, edges = np.histogram(similarities, bins=20, range=(0.0, 1.0))
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "latency_saved": self.latency_saved,
+            "threshold": self.threshold,
+            "similarity_histogram": {
+                f"{edges[i]:.2f}-{edges[i + 1]:.2f}": int(count)
+                for i, count in enumerate(histogram)
+            },
+            "projected_hit_rate": {
+                t: float((similarities >= t).mean()) if len(similarities) else 0.0
+                for t in thresholds
+            }
+        }
+
@@ -0,0 +1,148 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one execution
+
+    The first caller for a key runs the function; callers arriving while
+    it runs wait for and share its result (or exception). Nothing is
+    remembered afterwards, so this complements a cache rather than being
+    one. do() serves threads, ado() coroutines on the same event loop and
+    stream() fans one iterator out to every concurrent consumer.
+    """
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._tasks: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task] = {}
+        self._streams: Dict[Hashable, "_Broadcast"] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn for key, or wait for the run already in flight"""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async version of do; coalesces coroutines running on the same event loop"""
+        loop = asyncio.get_running_loop()
+        task_key = (loop, key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = loop.create_task(fn())
+                self._tasks[task_key] = task
+                task.add_done_callback(lambda _: self._forget_task(task_key))
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        # A cancelled caller must not cancel the call the others are waiting on
+        return await asyncio.shield(task)
+
+    def stream(self, key: Hashable, make_iterator: Callable[[], Iterator[Any]]) -> Iterator[Any]:
+        """
+        Iterate make_iterator() once per key however many callers consume it
+
+        A background thread drives the iterator, so one consumer going
+        away never stalls the others; late joiners get the items they
+        missed first, then the rest as they arrive.
+        """
+        with self._lock:
+            broadcast = self._streams.get(key)
+            if broadcast is None:
+                broadcast = _Broadcast()
+                self._streams[key] = broadcast
+                self.executions += 1
+                threading.Thread(
+                    target=self._produce, args=(key, broadcast, make_iterator),
+                    name="single-flight-stream", daemon=True
+                ).start()
+            else:
+                self.coalesced += 1
+        return broadcast.subscribe()
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls) + len(self._tasks) + len(self._streams)
+        }
+
+    def _forget_task(self, task_key: Tuple[asyncio.AbstractEventLoop, Hashable]) -> None:
+        with self._lock:
+            self._tasks.pop(task_key, None)
+
+    def _produce(self, key: Hashable, broadcast: "_Broadcast", make_iterator: Callable[[], Iterator[Any]]) -> None:
+        error = None
+        try:
+            for item in make_iterator():
+                broadcast.put(item)
+        except BaseException as e:
+            error = e
+        finally:
+            with self._lock:
+                if self._streams.get(key) is broadcast:
+                    del self._streams[key]
+            broadcast.close(error)
+
+class _Broadcast:
+    """Items of one stream, kept so every subscriber can replay them"""
+    def __init__(self):
+        self.items: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._changed = threading.Condition()
+
+    def put(self, item: Any) -> None:
+        with self._changed:
+            self.items.append(item)
+            self._changed.notify_all()
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        with self._changed:
+            self.done = True
+            self.error = error
+            self._changed.notify_all()
+
+    def subscribe(self) -> Iterator[Any]:
+        position = 0
+        while True:
+            with self._changed:
+                while position == len(self.items) and not self.done:
+                    self._changed.wait()
+                items = self.items[position:]
+                done, error = self.done, self.error
+            position += len(items)
+            yield from items
+            if done and position == len(self.items):
+                if error is not None:
+                    raise error
+                return
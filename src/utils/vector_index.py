@@ -0,0 +1,169 @@
+import importlib.util
+from typing import Dict, List, Tuple
+import numpy as np
+
+class VectorIndex:
+    """
+    Exact cosine-similarity index: vectors are normalized on insert and
+    searched with one matrix-vector product over a preallocated matrix
+    """
+    def __init__(self, dim: int, capacity: int = 1024):
+        self.dim = dim
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._ids = np.full(capacity, -1, dtype=np.int64)
+        self._rows: Dict[int, int] = {}
+        self._free: List[int] = []
+        self._size = 0
+
+    def add(self, item_id: int, vector) -> None:
+        """Insert or replace the vector stored under item_id"""
+        if item_id in self._rows:
+            row = self._rows[item_id]
+        elif self._free:
+            row = self._free.pop()
+        else:
+            if self._size == len(self._vectors):
+                self._grow()
+            row = self._size
+            self._size += 1
+        self._vectors[row] = _normalize(vector)
+        self._ids[row] = item_id
+        self._rows[item_id] = row
+
+    def add_many(self, item_ids, vectors) -> None:
+        """Bulk insert of new item_ids, e.g. when loading a persisted store"""
+        vectors = _normalize_rows(vectors)
+        while self._size + len(vectors) > len(self._vectors):
+            self._grow()
+        rows = np.arange(self._size, self._size + len(vectors))
+        self._vectors[rows] = vectors
+        self._ids[rows] = item_ids
+        self._rows.update(zip((int(i) for i in item_ids), (int(r) for r in rows)))
+        self._size += len(vectors)
+
+    def remove(self, item_id: int) -> None:
+        """Remove a vector; its row is reused by the next insert"""
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return
+        self._ids[row] = -1
+        self._vectors[row] = 0.0
+        self._free.append(row)
+
+    def search(self, vector, k: int = 1) -> List[Tuple[int, float]]:
+        """Get up to k (item_id, cosine similarity) pairs, most similar first"""
+        if not self._rows:
+            return []
+        scores = self._vectors[:self._size] @ _normalize(vector)
+        scores[self._ids[:self._size] < 0] = -np.inf
+        k = min(k, len(self._rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self._ids[row]), float(scores[row])) for row in top]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _grow(self) -> None:
+        capacity = len(self._vectors) * 2
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        ids = np.full(capacity, -1, dtype=np.int64)
+        ids[:self._size] = self._ids[:self._size]
+        self._vectors, self._ids = vectors, ids
+
+class HNSWIndex:
+    """
+    Approximate cosine-similarity index backed by hnswlib, for stores
+    large enough that a brute-force scan is too slow
+    """
+    def __init__(self, dim: int, capacity: int = 1024, ef: int = 64, m: int = 16):
+        import hnswlib
+
+        self.dim = dim
+        self._index = hnswlib.Index(space="cosine", dim=dim)
+        self._index.init_index(
+            max_elements=capacity,
+            ef_construction=200,
+            M=m,
+            allow_replace_deleted=True
+        )
+        self._index.set_ef(ef)
+        self._live = set()
+
+    def add(self, item_id: int, vector) -> None:
+        """Insert or replace the vector stored under item_id"""
+        if item_id in self._live:
+            self._index.mark_deleted(item_id)
+            self._live.discard(item_id)
+        if self._index.get_current_count() >= self._index.get_max_elements():
+            self._index.resize_index(self._index.get_max_elements() * 2)
+        self._index.add_items(
+            _normalize(vector)[None, :],
+            np.array([item_id]),
+            replace_deleted=True
+        )
+        self._live.add(item_id)
+
+    def add_many(self, item_ids, vectors) -> None:
+        """Bulk insert of new item_ids, e.g. when loading a persisted store"""
+        item_ids = np.asarray(item_ids, dtype=np.int64)
+        needed = self._index.get_current_count() + len(item_ids)
+        if needed > self._index.get_max_elements():
+            self._index.resize_index(max(needed, self._index.get_max_elements() * 2))
+        self._index.add_items(_normalize_rows(vectors), item_ids)
+        self._live.update(int(i) for i in item_ids)
+
+    def remove(self, item_id: int) -> None:
+        """Remove a vector; its slot is reused by a later insert"""
+        if item_id in self._live:
+            self._index.mark_deleted(item_id)
+            self._live.discard(item_id)
+
+    def search(self, vector, k: int = 1) -> List[Tuple[int, float]]:
+        """Get up to k (item_id, cosine similarity) pairs, most similar first"""
+        if not self._live:
+            return []
+        k = min(k, len(self._live))
+        labels, distances = self._index.knn_query(_normalize(vector)[None, :], k=k)
+        return [(int(label), 1.0 - float(dist)) for label, dist in zip(labels[0], distances[0])]
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def save(self, path: str) -> None:
+        """Write the graph to disk so a restart does not have to rebuild it"""
+        self._index.save_index(str(path))
+
+    @classmethod
+    def load(cls, path: str, dim: int, ef: int = 64) -> "HNSWIndex":
+        import hnswlib
+
+        index = cls.__new__(cls)
+        index.dim = dim
+        index._index = hnswlib.Index(space="cosine", dim=dim)
+        index._index.load_index(str(path), allow_replace_deleted=True)
+        index._index.set_ef(ef)
+        index._live = set(index._index.get_ids_list())
+        return index
+
+def create_index(dim: int, backend: str = "numpy", capacity: int = 1024):
+    """Create a vector index; backend is "numpy" (exact) or "hnsw" (approximate)"""
+    if backend == "hnsw":
+        if importlib.util.find_spec("hnswlib") is not None:
+            return HNSWIndex(dim, capacity)
+        print("hnswlib isn't installed; using the exact NumPy index (pip install hnswlib)")
+        backend = "numpy"
+    if backend == "numpy":
+        return VectorIndex(dim, capacity)
+    raise ValueError(f"Unknown vector index backend: {backend}")
+
+def _normalize(vector) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+def _normalize_rows(vectors) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
@@ -7,23 +7,43 @@ sys.path.append(str(project_root))
 
 import streamlit as st
 from src.agent.base_agent import AIAgent
+from src.models.client_pool import ClientPool
 from src.utils.error_handlers import handle_agent_error
 from src.utils.analytics import ConversationAnalytics
 from src.utils.cache import CacheManager
-import plotly.express as px
+from src.utils.response_cache import ResponseCache
+from src.utils.semantic_cache import SemanticCache
+from src.config.settings import SEMANTIC_CACHE_CONFIG
 import time
 
 class StreamlitApp:
     def __init__(self):
         self.initialize_session_state()
-        self.agent = AIAgent()
+        self.cache = st.session_state.cache
+        self.agent = st.session_state.agent
+        self.response_cache = self.agent.llm.cache
+        self.semantic_cache = self.agent.llm.semantic_cache
+        # Widget values from the Settings tab persist in session state across reruns
+        cache_duration = st.session_state.get("cache_duration")
+        self.response_cache.configure(
+            enabled=st.session_state.get("cache_enabled", True),
+            ttl=int(cache_duration) * 60 if cache_duration else None
+        )
         self.analytics = ConversationAnalytics()
-        self.cache = CacheManager()
         
     def initialize_session_state(self):
         """Initialize session state variables"""
         if 'chat_history' not in st.session_state:
             st.session_state.chat_history = []
+        # Built once per session rather than on every rerun; the models
+        # behind them are shared process-wide
+        if 'cache' not in st.session_state:
+            st.session_state.cache = CacheManager.shared()
+        if 'agent' not in st.session_state:
+            st.session_state.agent = AIAgent(
+                response_cache=ResponseCache(st.session_state.cache),
+                semantic_cache=SemanticCache.shared() if SEMANTIC_CACHE_CONFIG["enabled"] else None
+            )
             
     def run(self):
         """Run the Streamlit application"""
@@ -67,8 +87,18 @@ class StreamlitApp:
             st.error(f"Error processing input: {str(e)}")
             return {"response": "I encountered an error processing your request."}
     
+    def process_input_stream(self, user_input: str):
+        """Process user input through the agent, yielding tokens as they arrive"""
+        try:
+            yield from self.agent.process_stream(user_input)
+        except Exception as e:
+            st.error(f"Error processing input: {str(e)}")
+            yield "I encountered an error processing your request."
+    
     def render_analytics(self):
         """Render analytics dashboard"""
+        import plotly.express as px
+        
         st.header("Conversation Analytics")
         
         # Get analytics data
@@ -119,14 +149,51 @@ class StreamlitApp:
         
         # Cache settings
         st.subheader("Cache Settings")
-        cache_enabled = st.toggle("Enable Response Caching", value=True)
+        cache_enabled = st.toggle("Enable Response Caching", value=True, key="cache_enabled")
+        cache_ttl = None
         if cache_enabled:
             cache_duration = st.number_input(
                 "Cache Duration (minutes)",
                 min_value=1,
                 max_value=1440,
-                value=60
+                value=60,
+                key="cache_duration"
+            )
+            cache_ttl = int(cache_duration) * 60
+        self.response_cache.configure(enabled=cache_enabled, ttl=cache_ttl)
+        
+        cache_stats = self.response_cache.stats()
+        st.caption(
+            f"Cache hits: {cache_stats['hits']} · misses: {cache_stats['misses']} · "
+            f"hit rate: {cache_stats['hit_rate']:.0%}"
+        )
+        tier_stats = self.cache.stats()
+        if tier_stats['local']:
+            st.caption(
+                f"Local tier hit rate: {tier_stats['local']['hit_rate']:.0%} · "
+                f"Redis hit rate: {tier_stats['redis']['hit_rate']:.0%} · "
+                f"{tier_stats['local']['entries']} local entries"
             )
+        pool_stats = ClientPool.shared().stats()
+        st.caption(
+            f"LLM calls: {pool_stats['upstream_calls']} upstream · "
+            f"{pool_stats['coalesced']} coalesced with an identical request in flight"
+        )
+        if self.semantic_cache:
+            semantic_stats = self.semantic_cache.stats()
+            st.caption(
+                f"Semantic cache hit rate: {semantic_stats['hit_rate']:.0%} · "
+                f"latency saved: {semantic_stats['latency_saved']:.1f}s"
+            )
+            st.bar_chart(semantic_stats['similarity_histogram'])
+            embedding_cache = getattr(self.semantic_cache.embedding_model, "cache", None)
+            if embedding_cache:
+                embedding_stats = embedding_cache.stats()
+                st.caption(
+                    f"Embedding cache hit rate: {embedding_stats['hit_rate']:.0%} · "
+                    f"{embedding_stats['rows']} vectors · "
+                    f"{embedding_stats['bytes_mapped'] / 2**20:.1f} MiB mapped"
+                )
 
     def render_chat_interface(self):
         """Render the chat interface"""
@@ -147,13 +214,11 @@ class StreamlitApp:
             # Get AI response
             try:
                 with st.chat_message("assistant"):
-                    with st.spinner("Thinking..."):
-                        response = self.process_input(prompt)
-                        st.write(response["response"])
+                    response_text = st.write_stream(self.process_input_stream(prompt))
                         
                 # Add assistant response to chat history
                 st.session_state.messages.append(
-                    {"role": "assistant", "content": response["response"]}
+                    {"role": "assistant", "content": response_text}
                 )
                 
             except Exception as e:
@@ -177,6 +242,7 @@ class StreamlitApp:
             st.subheader("Quick Actions")
             if st.button("Clear Chat History"):
                 st.session_state.messages = []
+                self.agent.memory.clear()
                 st.rerun()
                 
             if st.button("Export Conversation"):
@@ -0,0 +1,62 @@
+"""
+Rebuild the tiny encoder and sentiment head used by tests/test_sentiment_head.py
+
+    python tests/fixtures/build_sentiment_fixture.py
+
+The encoder is a one-layer BERT with a word-level vocabulary of the seed
+examples and fixed random weights; the head is trained on it with
+src.models.train_sentiment_head, exactly as for the real encoder.
+"""
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import torch
+from tokenizers import Tokenizer, models, normalizers, pre_tokenizers, processors
+from transformers import BertConfig, BertModel, PreTrainedTokenizerFast
+
+FIXTURES = Path(__file__).resolve().parent
+ROOT = FIXTURES.parent.parent
+sys.path.append(str(ROOT))
+
+from src.models.embedding_model import EmbeddingModel
+from src.models.train_sentiment_head import load_examples, train
+
+# Relative to the repository root, which is where the tests load it from
+ENCODER = "tests/fixtures/tiny_encoder"
+HEAD = "tests/fixtures/sentiment_head.npz"
+SPECIAL = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+
+def build_encoder(texts):
+    words = sorted({w for text in texts for w in re.findall(r"\w+|[^\w\s]", text.lower())})
+    vocab = {token: i for i, token in enumerate(SPECIAL + words)}
+    tokenizer = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    tokenizer.normalizer = normalizers.Lowercase()
+    tokenizer.pre_tokenizer = pre_tokenizers.BertPreTokenizer()
+    tokenizer.post_processor = processors.TemplateProcessing(
+        single="[CLS] $A [SEP]", special_tokens=[("[CLS]", vocab["[CLS]"]), ("[SEP]", vocab["[SEP]"])]
+    )
+    PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer, model_max_length=128,
+        unk_token="[UNK]", pad_token="[PAD]", cls_token="[CLS]", sep_token="[SEP]", mask_token="[MASK]"
+    ).save_pretrained(ROOT / ENCODER)
+
+    torch.manual_seed(0)
+    config = BertConfig(vocab_size=len(vocab), hidden_size=64, num_hidden_layers=1,
+                        num_attention_heads=2, intermediate_size=128, max_position_embeddings=128)
+    BertModel(config).save_pretrained(ROOT / ENCODER)
+
+def main():
+    texts, labels = load_examples()
+    build_encoder(texts)
+    model = EmbeddingModel({"model_name": ENCODER, "sentiment_head_path": ROOT / HEAD,
+                            "backend": "torch", "quantize": False})
+    embeddings = np.asarray(model.get_embeddings(texts), dtype=np.float32)
+    head = train(embeddings, labels, ENCODER)
+    head.save(ROOT / HEAD)
+    predicted = [head.labels[i] for i in np.argmax(head.probabilities(embeddings), axis=1)]
+    print(f"Training accuracy {np.mean([p == l for p, l in zip(predicted, labels)]):.1%}")
+
+if __name__ == "__main__":
+    main()
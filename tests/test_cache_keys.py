@@ -0,0 +1,45 @@
+import re
+
+import numpy as np
+import pytest
+
+from src.utils.cache_keys import canonical_key
+
+def test_key_format():
+    assert re.fullmatch(r"tool:[0-9a-f]{32}", canonical_key("tool", {"query": "hi"}))
+
+def test_dict_order_does_not_matter():
+    a = {"query": "hi", "context": {"tier": "gold", "lang": "en"}}
+    b = {"context": {"lang": "en", "tier": "gold"}, "query": "hi"}
+    assert canonical_key("p", a) == canonical_key("p", b)
+
+def test_types_never_collide():
+    keys = {canonical_key("p", value) for value in ["1", 1, 1.0, True, None, b"1", [1], (1,)]}
+    assert len(keys) == 8
+
+def test_lengths_prevent_concatenation_collisions():
+    assert canonical_key("p", ["ab", "c"]) != canonical_key("p", ["a", "bc"])
+
+def test_prefix_separates_namespaces():
+    assert canonical_key("a", "x") != canonical_key("b", "x")
+
+def test_fields_limit_dicts_to_the_named_keys():
+    full = {"query": "hi", "tier": "gold", "request_id": "123"}
+    assert canonical_key("p", full, fields=["query", "tier"]) == canonical_key("p", {"query": "hi", "tier": "gold"})
+
+def test_sets_and_nan_are_stable():
+    assert canonical_key("p", {3, 1, 2}) == canonical_key("p", {2, 3, 1})
+    assert canonical_key("p", float("nan")) == canonical_key("p", float("nan"))
+    assert canonical_key("p", 0.0) == canonical_key("p", -0.0)
+
+def test_float_lists_and_arrays():
+    vector = [0.1, 0.2, 0.3]
+    assert canonical_key("p", vector) == canonical_key("p", list(vector))
+    assert canonical_key("p", vector) != canonical_key("p", [0.1, 0.2, 0.30000001])
+    array = np.array(vector, dtype=np.float32)
+    assert canonical_key("p", array) == canonical_key("p", array.copy())
+    assert canonical_key("p", array) != canonical_key("p", array.astype(np.float64))
+
+def test_unsupported_types_raise():
+    with pytest.raises(TypeError):
+        canonical_key("p", object())
@@ -0,0 +1,98 @@
+import pytest
+
+from src.config.settings import CACHE_CONFIG
+from src.utils.cache import CacheManager, cached
+
+fakeredis = pytest.importorskip("fakeredis")
+
+@pytest.fixture
+def cache():
+    manager = CacheManager(redis_client=fakeredis.FakeRedis(), invalidation=False)
+    yield manager
+    manager.close()
+
+def test_memoizes_by_arguments(cache):
+    calls = []
+
+    @cached(ttl=60, cache=cache)
+    def square(x, scale=1):
+        calls.append(x)
+        return x * x * scale
+
+    assert square(3) == 9
+    assert square(3) == 9
+    assert square(x=3, scale=1) == 9  # Same bound arguments, same key
+    assert square(3, scale=2) == 18
+    assert calls == [3, 3]
+
+def test_methods_key_without_self_and_with_a_custom_key(cache):
+    class Tool:
+        def __init__(self):
+            self.calls = 0
+
+        @cached(ttl=60, cache=cache, key=lambda self, query, context: (query, context.get("tier")))
+        def handle(self, query, context):
+            self.calls += 1
+            return f"{query} for {context.get('tier')}"
+
+    first, second = Tool(), Tool()
+    assert first.handle("hi", {"tier": "gold", "session": 1}) == "hi for gold"
+    # Another instance and unrelated context hit the same entry
+    assert second.handle("hi", {"tier": "gold", "session": 2}) == "hi for gold"
+    assert (first.calls, second.calls) == (1, 0)
+
+def test_none_results_are_not_cached(cache):
+    calls = []
+
+    @cached(ttl=60, cache=cache)
+    def lookup(x):
+        calls.append(x)
+        return None
+
+    lookup(1)
+    lookup(1)
+    assert calls == [1, 1]
+
+def test_memoize_switch_and_enabled_flag(cache, monkeypatch):
+    calls = []
+
+    @cached(ttl=60, cache=cache)
+    def f(x):
+        calls.append(x)
+        return x
+
+    @cached(ttl=60, cache=cache, enabled=False)
+    def g(x):
+        calls.append(x)
+        return x
+
+    monkeypatch.setitem(CACHE_CONFIG, "memoize", False)
+    f(1)
+    f(1)
+    monkeypatch.setitem(CACHE_CONFIG, "memoize", True)
+    g(2)
+    g(2)
+    assert calls == [1, 1, 2, 2]
+
+def test_unkeyable_arguments_skip_the_cache(cache, capsys):
+    calls = []
+
+    @cached(ttl=60, cache=cache)
+    def f(x):
+        calls.append(x)
+        return "ok"
+
+    marker = object()
+    assert f(marker) == "ok"
+    assert f(marker) == "ok"
+    assert len(calls) == 2
+    assert "Not caching" in capsys.readouterr().out
+
+def test_vector_results_are_stored_raw(cache):
+    @cached(ttl=60, cache=cache, vector=True, prefix="emb")
+    def embed(text):
+        return [0.25] * 64
+
+    assert embed("hi") == [0.25] * 64
+    (key,) = cache.redis_client.keys("emb:*")
+    assert len(cache.redis_client.get(key)) == 2 + 16 + 2 + 4 + 64 * 4
@@ -0,0 +1,51 @@
+import types
+
+import pytest
+
+from src.config.settings import MODEL_CONFIG
+from src.models.client_pool import ClientPool
+from src.models.fake_llm import FakeChatNVIDIA
+from src.models.resilience import DeadlineExceeded, ResilientClient, is_overload
+
+def test_overload_signals():
+    assert is_overload(Exception("[429] Too Many Requests"))
+    assert is_overload(Exception("[503] Service Unavailable"))
+    assert is_overload(DeadlineExceeded())
+    assert not is_overload(Exception("[400] Bad Request"))
+    assert not is_overload(Exception("[404] Not Found"))
+    assert not is_overload(ConnectionError("refused"))
+    assert not is_overload(ValueError("bad prompt"))
+
+def fail_in_slot(pool, error):
+    with pytest.raises(type(error)):
+        with pool.slot():
+            raise error
+
+@pytest.mark.parametrize("error,decreases", [
+    (Exception("[503] Service Unavailable"), 1),
+    (Exception("[429] Too Many Requests"), 1),
+    (Exception("[400] Bad Request"), 0),
+    (ConnectionError("refused"), 0),
+    (ValueError("bad prompt"), 0)
+])
+def test_only_overload_cuts_the_adaptive_limit(error, decreases):
+    pool = ClientPool(8, adaptive=True)
+    fail_in_slot(pool, error)
+    stats = pool.stats()["adaptive"]
+    assert stats["decreases"] == decreases
+    assert stats["in_flight"] == 0
+
+def test_http_pool_fits_the_highest_adaptive_limit():
+    pool = ClientPool(8, adaptive=True)
+    client = types.SimpleNamespace(_client=types.SimpleNamespace(get_session_fn=None, verify_ssl=True))
+    pool.get_client("k", lambda: client)
+    adapter = client._client.get_session_fn().get_adapter("https://example.com")
+    assert adapter._pool_maxsize == pool.limiter.max_limit == max(8, MODEL_CONFIG["llm"]["max_concurrency_limit"])
+
+def test_executor_fits_the_highest_adaptive_limit_with_hedges(monkeypatch):
+    monkeypatch.setitem(MODEL_CONFIG["llm"], "adaptive_concurrency", True)
+    monkeypatch.setitem(MODEL_CONFIG["llm"], "max_concurrency", 16)
+    monkeypatch.setitem(MODEL_CONFIG["llm"], "max_concurrency_limit", 64)
+    assert ResilientClient(FakeChatNVIDIA())._executor._max_workers == 128
+    monkeypatch.setitem(MODEL_CONFIG["llm"], "adaptive_concurrency", False)
+    assert ResilientClient(FakeChatNVIDIA())._executor._max_workers == 32
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from src.utils.codecs import ENTRY, FLOAT32, CacheEntry, Codec, CodecError
+
+@pytest.fixture
+def codec():
+    return Codec(vector_dtype="float32", compression="none")
+
+def test_float_lists_round_trip_exactly_by_default(codec):
+    # e.g. a list of prices or scores: float64 precision must survive
+    values = [0.1 * i for i in range(64)]
+    data = codec.encode(values)
+    assert data[0] != FLOAT32
+    assert codec.decode(data) == values
+
+def test_vector_flag_stores_floats_as_float32(codec):
+    values = [0.1 * i for i in range(64)]
+    data = codec.encode(values, vector=True)
+    assert data[0] == FLOAT32
+    assert len(data) == 2 + 4 + 64 * 4
+    decoded = codec.decode(data)
+    assert isinstance(decoded, list)
+    assert np.allclose(decoded, values, atol=1e-6)
+
+def test_matrix_with_vector_flag_keeps_its_rows(codec):
+    rows = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    assert codec.decode(codec.encode(rows, vector=True)) == rows
+
+def test_numpy_float_arrays_use_the_vector_format(codec):
+    array = np.arange(12, dtype=np.float32).reshape(3, 4)
+    data = codec.encode(array)
+    assert data[0] == FLOAT32
+    decoded = codec.decode(data)
+    assert isinstance(decoded, np.ndarray)
+    assert np.array_equal(decoded, array)
+
+def test_vector_flag_rejects_non_numeric_values(codec):
+    with pytest.raises(CodecError):
+        codec.encode(["a", "b"], vector=True)
+    with pytest.raises(CodecError):
+        codec.encode([[[1.0]]], vector=True)
+
+def test_empty_list_with_vector_flag_round_trips(codec):
+    assert codec.decode(codec.encode([], vector=True)) == []
+
+def test_cache_entry_keeps_its_value_in_the_vector_format(codec):
+    embedding = [0.5] * 384
+    data = codec.encode(CacheEntry(embedding, 0.02, 1700000000.0, vector=True))
+    assert data[0] == ENTRY
+    assert data[18] == FLOAT32
+    assert len(data) == 2 + 16 + 2 + 4 + 384 * 4
+    entry = codec.decode(data)
+    assert entry.value == embedding
+    assert (entry.delta, entry.expires) == (0.02, 1700000000.0)
+
+def test_cache_entry_without_expiry(codec):
+    entry = codec.decode(codec.encode(CacheEntry({"answer": 42}, 0.0, None)))
+    assert entry.value == {"answer": 42}
+    assert entry.expires is None
@@ -0,0 +1,156 @@
+import threading
+import time
+
+import pytest
+
+from src.config.settings import CACHE_CONFIG
+from src.utils import cache as cache_module
+from src.utils.cache import CacheManager
+from src.utils.codecs import CacheEntry
+
+fakeredis = pytest.importorskip("fakeredis")
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+@pytest.fixture
+def make_node(server, monkeypatch):
+    """CacheManagers standing in for processes that share one Redis"""
+    monkeypatch.setitem(CACHE_CONFIG, "lease_poll", 0.01)
+    nodes = []
+
+    def make():
+        node = CacheManager(redis_client=fakeredis.FakeRedis(server=server), local_entries=0, invalidation=False)
+        nodes.append(node)
+        return node
+    yield make
+    for node in nodes:
+        node.close()
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+class SlowCompute:
+    def __init__(self, value="fresh", delay=0.1):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return self.value
+
+def test_concurrent_misses_compute_once(make_node):
+    node = make_node()
+    compute = SlowCompute()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(node.get_or_compute("k", compute, ttl=60)))
+               for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["fresh"] * 20
+    assert compute.calls == 1
+    assert node.get_or_compute("k", compute, ttl=60) == "fresh"
+    assert compute.calls == 1
+
+def test_lease_makes_other_processes_wait_for_the_holder(make_node):
+    holder, waiter = make_node(), make_node()
+    holder_compute, waiter_compute = SlowCompute("from holder", 0.2), SlowCompute("from waiter")
+    thread = threading.Thread(target=lambda: holder.get_or_compute("k", holder_compute, ttl=60))
+    thread.start()
+    assert wait_for(lambda: holder.redis_client.exists("lease:k"))
+    assert waiter.get_or_compute("k", waiter_compute, ttl=60) == "from holder"
+    thread.join()
+    assert (holder_compute.calls, waiter_compute.calls) == (1, 0)
+    assert waiter.stats()["recompute"]["lease_waits"] == 1
+    assert not holder.redis_client.exists("lease:k")  # Released by its owner
+
+def test_abandoned_lease_expires_and_the_waiter_computes(make_node, monkeypatch):
+    monkeypatch.setitem(CACHE_CONFIG, "lease_ttl", 0.2)
+    node = make_node()
+    node.redis_client.set("lease:k", "dead-process", px=200)
+    compute = SlowCompute(delay=0.0)
+    start = time.monotonic()
+    assert node.get_or_compute("k", compute, ttl=60) == "fresh"
+    assert compute.calls == 1
+    assert time.monotonic() - start < 1.0
+
+def test_early_refresh_serves_the_value_and_refreshes_in_background(make_node, monkeypatch):
+    node = make_node()
+    # Fresh for another 0.5 s, but it took 1 s to compute last time
+    node.set("k", CacheEntry("old", 1.0, time.time() + 0.5), expire_in=60)
+    monkeypatch.setattr(cache_module.random, "random", lambda: 0.99)
+    compute = SlowCompute("new", 0.0)
+    assert node.get_or_compute("k", compute, ttl=60) == "old"
+    assert wait_for(lambda: node.get("k").value == "new")
+    assert compute.calls == 1
+    assert node.stats()["recompute"]["early_refreshes"] == 1
+
+def test_no_early_refresh_far_from_expiry_or_with_beta_zero(make_node, monkeypatch):
+    node = make_node()
+    monkeypatch.setattr(cache_module.random, "random", lambda: 0.5)
+    node.set("far", CacheEntry("old", 0.01, time.time() + 600), expire_in=900)
+    node.set("near", CacheEntry("old", 1.0, time.time() + 0.5), expire_in=60)
+    compute = SlowCompute("new", 0.0)
+    assert node.get_or_compute("far", compute, ttl=60) == "old"
+    assert node.get_or_compute("near", compute, ttl=60, beta=0) == "old"
+    time.sleep(0.1)
+    assert compute.calls == 0
+
+def test_stale_value_is_served_while_it_refreshes(make_node):
+    node = make_node()
+    node.set("k", CacheEntry("stale", 0.1, time.time() - 1), expire_in=60)
+    compute = SlowCompute("new", 0.2)
+    start = time.monotonic()
+    assert node.get_or_compute("k", compute, ttl=60, stale_ttl=30) == "stale"
+    assert time.monotonic() - start < 0.1
+    # Concurrent readers keep getting the stale value; one refresh runs
+    assert node.get_or_compute("k", compute, ttl=60, stale_ttl=30) == "stale"
+    assert wait_for(lambda: node.get("k").value == "new")
+    assert compute.calls == 1
+    assert node.stats()["recompute"]["stale_served"] == 2
+
+def test_expired_value_without_stale_ttl_is_recomputed(make_node):
+    node = make_node()
+    node.set("k", CacheEntry("stale", 0.1, time.time() - 1), expire_in=60)
+    compute = SlowCompute("new", 0.0)
+    assert node.get_or_compute("k", compute, ttl=60, stale_ttl=0) == "new"
+    assert compute.calls == 1
+
+def test_errors_reach_every_waiter_and_nothing_is_cached(make_node):
+    node = make_node()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        time.sleep(0.1)
+        raise RuntimeError("upstream down")
+
+    errors = []
+
+    def call():
+        try:
+            node.get_or_compute("k", failing, ttl=60)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == ["upstream down"] * 5
+    assert len(calls) == 1
+    assert node.get("k") is None
+    assert not node.redis_client.exists("lease:k")
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+pytest.importorskip("langchain_nvidia_ai_endpoints")
+
+from src.models.fake_llm import FakeChatNVIDIA, FakeMessage
+from src.models.llm_model import LLMModel
+
+TEXTS = [
+    "Assistant: Hello there, how can I help?",
+    "  Assistant:Hello",
+    "Sure. Assistant: the answer is 42.",
+    "It costs $5. Assist me? Assistant",
+    '{"response": "wrapped answer"}',
+    'Assistant: {"response": "wrapped after marker"}',
+    '{"response": broken json',
+    "Plain answer with trailing space   ",
+    "Assistant:",
+    "AssAssistant:istant: nested marker",
+    '  {"resp',
+    "a   \n  b  \t",
+    ""
+]
+
+def chunkings(text):
+    """Whole text, one char at a time and a few fixed sizes"""
+    yield [text]
+    for size in [1, 2, 3, 7]:
+        yield [text[i:i + size] for i in range(0, len(text), size)]
+
+@pytest.fixture
+def llm():
+    return LLMModel(client=FakeChatNVIDIA())
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_stream_matches_clean_response(llm, text):
+    expected = llm._clean_response(text)
+    for chunks in chunkings(text):
+        streamed = "".join(llm._clean_stream(FakeMessage(c) for c in chunks))
+        assert streamed == expected, chunks
+
+def test_stream_emits_before_the_end(llm):
+    chunks = iter(FakeMessage(c) for c in ["Assistant: ", "Hello", " world", " again"])
+    stream = llm._clean_stream(chunks)
+    assert next(stream) == "Hello"
+
+def test_generate_and_generate_stream_agree(llm):
+    llm.client = FakeChatNVIDIA("Assistant: one Assistant: two", 0.0, 0.0)
+    state = {"input": "hi", "memory": []}
+    assert "".join(llm.generate_stream(state)) == llm.generate(state)["response"] == "one  two"
+
+def test_stream_scans_each_chunk_once(llm, monkeypatch):
+    # Re-cleaning the accumulated text per chunk made long streams quadratic
+    monkeypatch.setattr(llm, "_clean_response", lambda text: pytest.fail("re-cleaned the whole text"))
+    text = "Assistant: " + "word " * 5000
+    streamed = "".join(llm._clean_stream(FakeMessage(c) for c in text))
+    assert streamed == text.replace("Assistant:", "").strip()
+
+def test_stream_matches_clean_response_on_random_text(llm):
+    rng = random.Random(0)
+    pieces = ["Assistant:", "Ass", "istant:", "A", " ", "\n", '{"response":', ' "x"}', "word", "{"]
+    for _ in range(300):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+        cuts = sorted(rng.sample(range(1, len(text)), min(3, max(len(text) - 1, 0)))) if len(text) > 1 else []
+        chunks = [text[i:j] for i, j in zip([0] + cuts, cuts + [len(text)])]
+        streamed = "".join(llm._clean_stream(FakeMessage(c) for c in chunks))
+        assert streamed == llm._clean_response(text), chunks
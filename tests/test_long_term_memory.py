@@ -0,0 +1,97 @@
+import threading
+import time
+
+import numpy as np
+
+from src.memory import long_term
+from src.memory.long_term import LongTermMemory, UserMemory
+
+class HashEmbeddings:
+    """Deterministic 8-d vectors, one per text"""
+    def get_embeddings(self, text):
+        return np.random.default_rng(abs(hash(text)) % 2 ** 32).normal(size=8).tolist()
+
+def test_recall_finds_an_earlier_turn(tmp_path):
+    memory = LongTermMemory(HashEmbeddings(), directory=tmp_path, index_backend="numpy")
+    for i in range(6):
+        memory.remember("alice", f"question {i}", f"answer {i}", background=False)
+    text = "User: question 0\nAssistant: answer 0"
+    turns = memory.recall("alice", text, k=1, embedding=HashEmbeddings().get_embeddings(text))
+    assert [t["input"] for t in turns] == ["question 0"]
+
+def test_slow_load_does_not_block_other_users(tmp_path, monkeypatch):
+    load = UserMemory._load
+    loads = []
+
+    def slow_load(self):
+        loads.append(self.directory)
+        if len(loads) == 1:
+            time.sleep(0.5)
+        load(self)
+
+    monkeypatch.setattr(UserMemory, "_load", slow_load)
+    memory = LongTermMemory(HashEmbeddings(), directory=tmp_path, index_backend="numpy")
+
+    slow_users = []
+    threads = [threading.Thread(target=lambda: slow_users.append(memory._user("alice"))) for _ in range(4)]
+    threads[0].start()
+    time.sleep(0.05)
+    for thread in threads[1:]:
+        thread.start()
+
+    start = time.perf_counter()
+    memory._user("bob")
+    assert time.perf_counter() - start < 0.25
+
+    for thread in threads:
+        thread.join()
+    # Concurrent first uses of one user share a single load
+    assert len(loads) == 2
+    assert all(user is slow_users[0] for user in slow_users)
+
+def test_hnsw_without_hnswlib_falls_back_to_exact_search(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(long_term.importlib.util, "find_spec", lambda name: None)
+    monkeypatch.setattr(long_term, "_warned_no_hnswlib", False)
+    memory = LongTermMemory(HashEmbeddings(), directory=tmp_path, index_backend="hnsw")
+    memory.remember("alice", "hi", "hello", background=False)
+    assert memory._user("alice").backend == "numpy"
+    assert "hnswlib isn't installed" in capsys.readouterr().out
+
+def test_store_being_written_is_not_evicted_or_reloaded(tmp_path, monkeypatch):
+    add, load = UserMemory.add, UserMemory._load
+    writing, release = threading.Event(), threading.Event()
+    loads = []
+
+    def slow_add(self, turn, vector):
+        if turn["input"] == "slow":
+            writing.set()
+            assert release.wait(5)
+        add(self, turn, vector)
+
+    def counting_load(self):
+        loads.append(self.directory.name)
+        load(self)
+
+    monkeypatch.setattr(UserMemory, "add", slow_add)
+    monkeypatch.setattr(UserMemory, "_load", counting_load)
+    memory = LongTermMemory(HashEmbeddings(), directory=tmp_path, index_backend="numpy", max_loaded_users=1)
+    for i in range(4):
+        memory.remember("alice", f"question {i}", f"answer {i}", background=False)
+
+    future = memory.remember("alice", "slow", "write")
+    assert writing.wait(5)
+    # Loading bob would evict alice, but her write is still in flight
+    memory.recall("bob", "anything", embedding=HashEmbeddings().get_embeddings("anything"))
+    assert "alice" in memory.users
+    text = "User: question 0\nAssistant: answer 0"
+    turns = memory.recall("alice", text, k=1, embedding=HashEmbeddings().get_embeddings(text))
+    assert [t["input"] for t in turns] == ["question 0"]
+    assert len(loads) == 2  # alice and bob once each; alice's files were never reloaded mid-write
+
+    release.set()
+    future.result(timeout=5)
+    assert len(memory.users) == 1
+
+    reloaded = LongTermMemory(HashEmbeddings(), directory=tmp_path, index_backend="numpy")._user("alice")
+    assert [t["input"] for t in reloaded.turns] == ["question 0", "question 1", "question 2", "question 3", "slow"]
+    assert reloaded.vectors_path.stat().st_size == 5 * reloaded.dim * 4
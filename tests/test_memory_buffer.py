@@ -0,0 +1,89 @@
+from concurrent.futures import Future
+
+import pytest
+
+from src.config.settings import MEMORY_CONFIG
+from src.memory import buffer as buffer_module
+from src.memory.buffer import WindowBuffer
+
+class ManualSummarizer:
+    """Hands out futures the test resolves when it wants"""
+    def __init__(self):
+        self.requests = []
+
+    def submit(self, summary, turns):
+        future = Future()
+        self.requests.append((summary, [t["input"] for t in turns], future))
+        return future
+
+@pytest.fixture(autouse=True)
+def regex_token_counts(monkeypatch):
+    """Count tokens with the regex estimate instead of downloading a tokenizer"""
+    monkeypatch.setattr(buffer_module, "_tokenizer", lambda name: None)
+
+@pytest.fixture
+def summarizer():
+    return ManualSummarizer()
+
+def fill(buffer, count, start=0):
+    for i in range(start, start + count):
+        buffer.add(f"question {i}", f"answer {i}")
+
+def test_clear_drops_turns_summary_and_pending_compaction(summarizer, monkeypatch):
+    monkeypatch.setitem(MEMORY_CONFIG, "keep_recent", 1)
+    buffer = WindowBuffer(max_size=3, max_tokens=10000, summarizer=summarizer)
+    fill(buffer, 3)
+    summarizer.requests[0][2].set_result("earlier: questions 0-1")
+    assert buffer.summary == "earlier: questions 0-1"
+
+    fill(buffer, 2, start=3)
+    assert len(summarizer.requests) == 2
+    buffer.clear()
+    assert len(buffer) == 0
+    assert buffer.summary == ""
+    assert buffer.get_formatted_history() == ""
+
+    # The summary of the cleared conversation lands after the clear
+    summarizer.requests[1][2].set_result("earlier: questions 0-3")
+    assert buffer.summary == ""
+    assert len(buffer) == 0
+
+    # A new conversation compacts on its own again
+    fill(buffer, 3, start=10)
+    assert summarizer.requests[2][0] == ""
+    assert summarizer.requests[2][1] == ["question 10", "question 11"]
+
+def test_turns_evicted_by_the_token_budget_are_summarized(summarizer, monkeypatch):
+    monkeypatch.setitem(MEMORY_CONFIG, "keep_recent", 1)
+    buffer = WindowBuffer(max_size=10, max_tokens=40, summarizer=summarizer)
+    fill(buffer, 2)
+    assert summarizer.requests == []
+    # One long turn pushes both earlier ones out of the budget at once
+    buffer.add("long question " + "word " * 30, "answer")
+    assert len(buffer) == 1
+    assert summarizer.requests[0][1] == ["question 0", "question 1"]
+
+    summarizer.requests[0][2].set_result("earlier: questions 0-1")
+    fill(buffer, 1, start=2)
+    assert all("question 0" not in r[1] for r in summarizer.requests[1:])
+
+def test_failed_summary_keeps_evicted_turns_for_the_next_one(summarizer, monkeypatch):
+    monkeypatch.setitem(MEMORY_CONFIG, "keep_recent", 1)
+    buffer = WindowBuffer(max_size=3, max_tokens=10000, summarizer=summarizer)
+    fill(buffer, 3)
+    assert summarizer.requests[0][1] == ["question 0", "question 1"]
+    # The window moves on while the summary is in flight, then it fails
+    fill(buffer, 1, start=3)
+    summarizer.requests[0][2].set_result(None)
+    fill(buffer, 1, start=4)
+    assert summarizer.requests[1][1] == ["question 0", "question 1", "question 2", "question 3"]
+
+def test_formatted_history_is_joined_once_per_change():
+    buffer = WindowBuffer(max_size=2, max_tokens=10000)
+    assert buffer.get_formatted_history() == ""
+    fill(buffer, 3)
+    history = buffer.get_formatted_history()
+    assert history == "User: question 1\nAssistant: answer 1\nUser: question 2\nAssistant: answer 2"
+    assert buffer.get_formatted_history() is history
+    fill(buffer, 1, start=3)
+    assert buffer.get_formatted_history() == "User: question 2\nAssistant: answer 2\nUser: question 3\nAssistant: answer 3"
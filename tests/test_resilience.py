@@ -0,0 +1,180 @@
+import asyncio
+import time
+
+import pytest
+
+from src.models import resilience
+from src.models.fake_llm import FakeChatNVIDIA
+from src.models.resilience import (
+    CircuitBreaker, CircuitOpenError, DeadlineExceeded, ResilientClient, is_retryable
+)
+
+def latencies(*delays):
+    """Latency sampler for FakeChatNVIDIA: one delay per request, in order"""
+    remaining = list(delays)
+    return lambda: remaining.pop(0) if remaining else 0.0
+
+def test_retryable_errors():
+    assert is_retryable(Exception("[503] Service Unavailable"))
+    assert is_retryable(Exception("[429] Too Many Requests"))
+    assert is_retryable(TimeoutError())
+    assert not is_retryable(Exception("[400] Bad Request"))
+    assert not is_retryable(ValueError("bad prompt"))
+    assert not is_retryable(CircuitOpenError())
+
+def test_breaker_opens_probes_and_closes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert (breaker.state, breaker.trips) == ("open", 1)
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+    time.sleep(0.12)
+    breaker.allow()  # The single probe
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    breaker.record_failure()
+    assert (breaker.state, breaker.trips) == ("open", 2)
+
+    time.sleep(0.12)
+    breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.rejected == 2
+
+def test_client_trips_the_breaker_and_stops_calling_upstream():
+    fake = FakeChatNVIDIA("Fine.", 0.0, 0.0, error_rate=1.0)
+    client = ResilientClient(fake, timeout=5, retries=0, breaker=CircuitBreaker(3, 30))
+    for _ in range(3):
+        with pytest.raises(Exception, match=r"\[503\]"):
+            client.invoke("hi")
+    with pytest.raises(CircuitOpenError):
+        client.invoke("hi")
+    assert fake.calls == 3
+    assert client.stats()["breaker"] == "open"
+
+def test_retries_are_bounded_and_jittered(monkeypatch):
+    bounds = []
+    uniform = resilience.random.uniform
+
+    def recording_uniform(low, high):
+        bounds.append((low, high))
+        return uniform(low, high)
+
+    monkeypatch.setattr(resilience.random, "uniform", recording_uniform)
+    fake = FakeChatNVIDIA("Fine.", 0.0, 0.0, error_rate=1.0)
+    client = ResilientClient(fake, timeout=5, retries=3, backoff_base=0.01, backoff_max=0.03,
+                             breaker=CircuitBreaker(100))
+    start = time.monotonic()
+    with pytest.raises(Exception, match=r"\[503\]"):
+        client.invoke("hi")
+    assert fake.calls == 4
+    assert client.retried == 3
+    # Full jitter: uniform(0, min(backoff_max, base * 2^attempt))
+    assert bounds == [(0, 0.01), (0, 0.02), (0, 0.03)]
+    assert time.monotonic() - start < 0.06 + 0.05
+
+def bad_request(prompt):
+    raise Exception("[400] Bad Request\nPrompt too long")
+
+def test_errors_the_upstream_meant_are_not_retried():
+    fake = FakeChatNVIDIA(bad_request, 0.0, 0.0)
+    client = ResilientClient(fake, timeout=5, retries=3)
+    with pytest.raises(Exception, match=r"\[400\]"):
+        client.invoke("hi")
+    assert fake.calls == 1
+    assert client.breaker.failures == 0
+
+def test_deadline_covers_retries():
+    # Every attempt hangs 0.15 s and fails; a 0.4 s deadline allows two or three
+    fake = FakeChatNVIDIA("Fine.", 0.15, 0.0, error_rate=1.0)
+    client = ResilientClient(fake, timeout=0.4, retries=10, backoff_base=0.01, breaker=CircuitBreaker(100))
+    start = time.monotonic()
+    with pytest.raises(Exception, match=r"\[503\]|deadline"):
+        client.invoke("hi")
+    assert time.monotonic() - start < 0.5
+    assert fake.calls <= 3
+
+def test_slow_upstream_hits_the_deadline():
+    fake = FakeChatNVIDIA("Fine.", 1.0, 0.0)
+    client = ResilientClient(fake, timeout=0.2, retries=2)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        client.invoke("hi")
+    assert time.monotonic() - start < 0.3
+    assert client.timeouts == 1
+
+def warm(client, seconds=0.05, samples=20):
+    for _ in range(samples):
+        client.latencies.add(seconds)
+
+def test_hedge_wins_over_a_slow_request():
+    fake = FakeChatNVIDIA("Fine.", 0.0, 0.0, latency=latencies(1.0, 0.02))
+    client = ResilientClient(fake, timeout=5, hedge=True)
+    warm(client)
+    start = time.monotonic()
+    assert client.invoke("hi").content == "Fine."
+    assert time.monotonic() - start < 0.3
+    assert (client.hedges, client.hedge_wins, fake.calls) == (1, 1, 2)
+
+def test_no_hedge_before_enough_samples():
+    fake = FakeChatNVIDIA("Fine.", 0.0, 0.0, latency=latencies(0.2))
+    client = ResilientClient(fake, timeout=5, hedge=True)
+    client.invoke("hi")
+    assert (client.hedges, fake.calls) == (0, 1)
+
+class CancellableFake(FakeChatNVIDIA):
+    """Counts ainvoke calls cancelled while waiting on the upstream"""
+    cancelled = 0
+
+    async def ainvoke(self, prompt):
+        try:
+            return await super().ainvoke(prompt)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+def test_async_hedge_loser_is_cancelled():
+    fake = CancellableFake("Fine.", 0.0, 0.0, latency=latencies(1.0, 0.02))
+    client = ResilientClient(fake, timeout=5, hedge=True)
+    warm(client)
+
+    async def main():
+        response = await client.ainvoke("hi")
+        await asyncio.sleep(0)  # Let the cancellation land
+        return response
+
+    assert asyncio.run(main()).content == "Fine."
+    assert (client.hedge_wins, fake.cancelled) == (1, 1)
+
+def test_async_deadline_cancels_the_request():
+    fake = CancellableFake("Fine.", 1.0, 0.0)
+    client = ResilientClient(fake, timeout=0.1, retries=0)
+
+    async def main():
+        with pytest.raises(DeadlineExceeded):
+            await client.ainvoke("hi")
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert fake.cancelled == 1
+
+def test_stream_deadline_is_time_to_first_token():
+    slow_start = FakeChatNVIDIA("one two three", 1.0, 0.0)
+    with pytest.raises(DeadlineExceeded):
+        list(ResilientClient(slow_start, timeout=0.2, retries=0).stream("hi"))
+
+    # Tokens keep flowing past the deadline once the first one arrived
+    long_answer = FakeChatNVIDIA("one two three four five", 0.05, 0.1)
+    chunks = list(ResilientClient(long_answer, timeout=0.2, retries=0).stream("hi"))
+    assert "".join(c.content for c in chunks) == "one two three four five"
+
+def test_stream_retries_a_failed_start():
+    fake = FakeChatNVIDIA("one two", 0.0, 0.0, error_rate=0.5, seed=3)
+    client = ResilientClient(fake, timeout=5, retries=5, backoff_base=0.0, breaker=CircuitBreaker(100))
+    assert "".join(c.content for c in client.stream("hi")) == "one two"
+    assert fake.calls == fake.errors + 1
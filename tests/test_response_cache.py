@@ -0,0 +1,43 @@
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from src.config.settings import MODEL_CONFIG, RESPONSE_CACHE_CONFIG
+from src.utils.cache import CacheManager
+from src.utils.response_cache import ResponseCache
+
+@pytest.fixture
+def cache():
+    return ResponseCache(CacheManager(redis_client=fakeredis.FakeRedis(), invalidation=False), enabled=True)
+
+def test_default_caches_the_default_sampling_temperature():
+    assert MODEL_CONFIG["llm"]["temperature"] <= RESPONSE_CACHE_CONFIG["max_temperature"]
+
+def test_repeated_prompt_is_served_from_cache_with_shipped_config():
+    pytest.importorskip("langchain_nvidia_ai_endpoints")
+    from src.models.fake_llm import FakeChatNVIDIA
+    from src.models.llm_model import LLMModel
+
+    client = FakeChatNVIDIA("an answer", 0.0, 0.0)
+    llm = LLMModel(client=client, cache=ResponseCache(CacheManager(redis_client=fakeredis.FakeRedis(), invalidation=False)))
+    state = {"input": "What can you help me with?", "memory": []}
+    assert llm.generate(state)["response"] == "an answer"
+    assert llm.generate(dict(state, input="what can you help me with?"))["response"] == "an answer"
+    assert client.calls == 1
+    assert llm.cache.stats()["hits"] == 1
+
+def test_sampled_requests_bypass_the_cache(cache):
+    cache.max_temperature = 0.0
+    assert cache.make_key("m", 0.7, "hello", []) is None
+    assert cache.stats()["bypassed"] == 1
+
+def test_greedy_requests_are_cached(cache):
+    cache.max_temperature = 0.0
+    key = cache.make_key("m", 0.0, "Hello  World", [])
+    assert key is not None
+    cache.set(key, "hi")
+    assert cache.get(cache.make_key("m", 0.0, "hello world", [])) == "hi"
+
+def test_disabled_cache_bypasses(cache):
+    cache.configure(enabled=False)
+    assert cache.make_key("m", 0.0, "hello", []) is None
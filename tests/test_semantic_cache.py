@@ -0,0 +1,80 @@
+import time
+
+import numpy as np
+import pytest
+
+from src.utils.semantic_cache import SemanticCache
+
+class FixedEmbeddings:
+    """Maps known queries to fixed vectors"""
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def get_embeddings(self, text):
+        return self.vectors[text]
+
+VECTORS = {
+    "what is ai": np.array([1.0, 0.0, 0.0]),
+    "what's ai": np.array([0.99, 0.1, 0.0]),
+    "define ai": np.array([0.97, 0.2, 0.0]),
+    "weather today": np.array([0.0, 0.0, 1.0])
+}
+
+@pytest.fixture
+def cache():
+    return SemanticCache(FixedEmbeddings(VECTORS), threshold=0.9, max_entries=10, ttl=60, index_backend="numpy")
+
+def test_paraphrase_hits_and_unrelated_misses(cache):
+    cache.store("what is ai", "AI is ...")
+    assert cache.lookup("what's ai") == "AI is ..."
+    assert cache.lookup("weather today") is None
+
+def test_expired_nearest_neighbour_does_not_hide_a_valid_match(cache):
+    cache.store("what's ai", "old answer")
+    cache.store("define ai", "fresh answer")
+    old_id = next(i for i, e in cache.entries.items() if e["response"] == "old answer")
+    cache.entries[old_id]["created"] -= 120
+    assert cache.lookup("what is ai") == "fresh answer"
+    assert old_id not in cache.entries
+
+def test_expired_entries_are_swept_on_store(cache):
+    cache.store("weather today", "sunny")
+    for entry in cache.entries.values():
+        entry["created"] -= 120
+    cache._last_sweep -= 120
+    cache.store("what is ai", "AI is ...")
+    assert [e["response"] for e in cache.entries.values()] == ["AI is ..."]
+    assert len(cache.index) == 1
+
+@pytest.fixture
+def llm_with_caches(cache):
+    """LLMModel answering "live answer", with "what is ai" in the semantic cache"""
+    pytest.importorskip("langchain_nvidia_ai_endpoints")
+    fakeredis = pytest.importorskip("fakeredis")
+    from src.models.fake_llm import FakeChatNVIDIA
+    from src.models.llm_model import LLMModel
+    from src.utils.cache import CacheManager
+    from src.utils.response_cache import ResponseCache
+
+    cache.store("what is ai", "cached answer")
+    response_cache = ResponseCache(
+        CacheManager(redis_client=fakeredis.FakeRedis(), invalidation=False), enabled=True, max_temperature=1.0
+    )
+    return LLMModel(client=FakeChatNVIDIA("live answer", 0.0, 0.0), cache=response_cache, semantic_cache=cache)
+
+def test_llm_skips_semantic_cache_when_caching_is_off(cache, llm_with_caches):
+    llm, response_cache = llm_with_caches, llm_with_caches.cache
+    state = {"input": "what's ai", "memory": []}
+    assert llm.generate(state)["response"] == "cached answer"
+    response_cache.configure(enabled=False)
+    assert llm.generate(state)["response"] == "live answer"
+    assert len(cache.entries) == 1
+
+def test_llm_skips_semantic_cache_above_max_temperature(llm_with_caches):
+    # Same rule as ResponseCache.make_key: sampling hotter than max_temperature is never replayed
+    llm = llm_with_caches
+    state = {"input": "what's ai", "memory": []}
+    llm.cache.max_temperature = llm.config["temperature"] - 0.1
+    assert llm.generate(state)["response"] == "live answer"
+    llm.cache.max_temperature = llm.config["temperature"]
+    assert llm.generate(state)["response"] == "cached answer"
@@ -0,0 +1,93 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.config.settings import EMBEDDING_CACHE_CONFIG
+from src.models.sentiment_head import SentimentHead
+from src.models.train_sentiment_head import train
+
+LABELS = ["negative", "neutral", "positive"]
+
+@pytest.fixture
+def head():
+    """Each label fires on one axis of a 3-d embedding"""
+    return SentimentHead(np.eye(3) * 4.0, np.zeros(3), LABELS, model_name="tiny-encoder")
+
+def test_predicts_the_label_of_the_dominant_axis(head):
+    assert head.predict([0.1, 0.0, 2.0])["sentiment"] == "positive"
+    assert head.predict([3.0, 0.2, 0.1])["sentiment"] == "negative"
+    prediction = head.predict([0.0, 5.0, 0.0])
+    assert prediction["sentiment"] == "neutral"
+    assert prediction["confidence"] == pytest.approx(np.exp(4) / (np.exp(4) + 2))
+    assert sum(prediction["scores"].values()) == pytest.approx(1.0)
+
+def test_prediction_ignores_embedding_scale(head):
+    assert head.predict([1.0, 0.5, 0.2]) == head.predict([10.0, 5.0, 2.0])
+
+def test_save_and_load_round_trip(head, tmp_path):
+    path = tmp_path / "head.npz"
+    head.save(path)
+    loaded = SentimentHead.load(path)
+    assert loaded.labels == LABELS
+    assert loaded.model_name == "tiny-encoder"
+    assert loaded.predict([0.2, 0.3, 1.0]) == head.predict([0.2, 0.3, 1.0])
+
+def test_train_separates_labeled_clusters():
+    rng = np.random.default_rng(0)
+    centers = {"negative": [1, 0, 0, 0], "positive": [0, 1, 0, 0]}
+    embeddings, labels = [], []
+    for label, center in centers.items():
+        embeddings.append(np.array(center) + rng.normal(0, 0.1, (20, 4)))
+        labels += [label] * 20
+    head = train(np.vstack(embeddings), labels, model_name="tiny-encoder")
+    assert head.predict([0.9, 0.1, 0.0, 0.0])["sentiment"] == "negative"
+    assert head.predict([0.1, 0.9, 0.0, 0.0])["sentiment"] == "positive"
+
+@pytest.fixture
+def embedding_model(tmp_path):
+    """EmbeddingModel with only the sentiment-head wiring, no encoder loaded"""
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    from src.models.embedding_model import EmbeddingModel
+    model = EmbeddingModel.__new__(EmbeddingModel)
+    model.config = {"model_name": "tiny-encoder", "sentiment_head_path": tmp_path / "head.npz"}
+    return model
+
+def test_missing_weights_fall_back_to_neutral_and_say_so(embedding_model):
+    embedding_model.sentiment_head = embedding_model._load_sentiment_head()
+    assert embedding_model.sentiment_head is None
+    assert embedding_model.sentiment_head_status.startswith("No sentiment head")
+    assert embedding_model.classify_sentiment([0.0, 0.0, 1.0]) == {"sentiment": "neutral", "confidence": 0.0}
+
+def test_weights_for_another_encoder_are_ignored(embedding_model, head):
+    head.model_name = "other-encoder"
+    head.save(embedding_model.config["sentiment_head_path"])
+    assert embedding_model._load_sentiment_head() is None
+    assert "trained on other-encoder" in embedding_model.sentiment_head_status
+
+def test_saved_weights_are_used(embedding_model, head):
+    head.save(embedding_model.config["sentiment_head_path"])
+    embedding_model.sentiment_head = embedding_model._load_sentiment_head()
+    assert embedding_model.sentiment_head_status == "loaded"
+    assert embedding_model.classify_sentiment([0.0, 0.0, 1.0])["sentiment"] == "positive"
+
+def test_shipped_fixture_head_separates_positive_and_negative(monkeypatch):
+    # tests/fixtures/build_sentiment_fixture.py trained it on the tiny encoder next to it
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    from src.models.embedding_model import EmbeddingModel
+    monkeypatch.chdir(Path(__file__).resolve().parent.parent)
+    monkeypatch.setitem(EMBEDDING_CACHE_CONFIG, "enabled", False)
+    model = EmbeddingModel({
+        "model_name": "tests/fixtures/tiny_encoder",
+        "sentiment_head_path": "tests/fixtures/sentiment_head.npz",
+        "backend": "torch",
+        "quantize": False
+    })
+    assert model.sentiment_head_status == "loaded"
+    positive = model.analyze("Thank you so much, that was really helpful!")["sentiment"]
+    negative = model.analyze("This is the worst service I have ever used")["sentiment"]
+    assert positive["sentiment"] == "positive"
+    assert negative["sentiment"] == "negative"
+    assert positive["scores"]["positive"] > negative["scores"]["positive"]
@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.utils.single_flight import SingleFlight
+
+def run_threads(count, target):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(target())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+def test_do_runs_once_for_concurrent_callers():
+    flights = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.1)
+        return "answer"
+
+    results, errors = run_threads(10, lambda: flights.do("k", slow))
+    assert results == ["answer"] * 10 and not errors
+    assert len(calls) == 1
+    assert flights.stats() == {"executions": 1, "coalesced": 9, "in_flight": 0}
+    # Nothing is remembered once the call is done
+    assert flights.do("k", lambda: "again") == "again"
+
+def test_do_shares_the_exception_and_keeps_keys_apart():
+    flights = SingleFlight()
+
+    def failing():
+        time.sleep(0.1)
+        raise ValueError("boom")
+
+    results, errors = run_threads(5, lambda: flights.do("bad", failing))
+    assert not results
+    assert [str(e) for e in errors] == ["boom"] * 5
+    assert not flights.in_flight("bad")
+    assert flights.do("good", lambda: 1) == 1
+
+def test_ado_coalesces_coroutines_and_survives_a_cancelled_caller():
+    flights = SingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "answer"
+
+    async def main():
+        first = asyncio.ensure_future(flights.ado("k", slow))
+        others = [asyncio.ensure_future(flights.ado("k", slow)) for _ in range(4)]
+        await asyncio.sleep(0.01)
+        first.cancel()
+        results = await asyncio.gather(*others)
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return results
+
+    assert asyncio.run(main()) == ["answer"] * 4
+    assert len(calls) == 1
+    assert flights.stats()["in_flight"] == 0
+
+def test_ado_propagates_errors():
+    flights = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.05)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(*[flights.ado("k", failing) for _ in range(3)], return_exceptions=True)
+
+    assert [str(e) for e in asyncio.run(main())] == ["boom"] * 3
+    assert flights.executions == 1
+
+def chunks(items, delay=0.02, error=None, calls=None):
+    def make():
+        if calls is not None:
+            calls.append(1)
+        for item in items:
+            time.sleep(delay)
+            yield item
+        if error is not None:
+            raise error
+    return make
+
+def test_stream_fans_one_iterator_out_to_every_consumer():
+    flights = SingleFlight()
+    calls = []
+    make = chunks(["a", "b", "c", "d"], calls=calls)
+    results, errors = run_threads(5, lambda: list(flights.stream("k", make)))
+    assert results == [["a", "b", "c", "d"]] * 5 and not errors
+    assert len(calls) == 1
+
+def test_stream_late_joiner_replays_missed_items():
+    flights = SingleFlight()
+    first = flights.stream("k", chunks(["a", "b", "c", "d"], delay=0.05))
+    assert next(first) == "a"
+    assert next(first) == "b"
+    late = flights.stream("k", chunks(["never used"]))
+    assert list(late) == ["a", "b", "c", "d"]
+    assert list(first) == ["c", "d"]
+    assert flights.stats()["coalesced"] == 1
+
+def test_stream_error_reaches_consumers_after_the_items():
+    flights = SingleFlight()
+    make = chunks(["a", "b"], error=RuntimeError("cut off"))
+    outcomes = []
+
+    def consume():
+        items = []
+        try:
+            for item in flights.stream("k", make):
+                items.append(item)
+        except RuntimeError as e:
+            outcomes.append((items, str(e)))
+
+    run_threads(3, consume)
+    assert outcomes == [(["a", "b"], "cut off")] * 3
+
+def test_abandoned_stream_consumer_does_not_stall_the_others():
+    flights = SingleFlight()
+    make = chunks(["a", "b", "c"])
+    quitter = flights.stream("k", make)
+    assert next(quitter) == "a"
+    quitter.close()
+    assert list(flights.stream("k", make)) == ["a", "b", "c"]
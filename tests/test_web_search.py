@@ -0,0 +1,33 @@
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("bs4")
+
+from src.tools.web_search import WebSearchTool
+from src.utils.cache import CacheManager
+
+@pytest.fixture
+def tool(monkeypatch):
+    manager = CacheManager(redis_client=fakeredis.FakeRedis(), invalidation=False)
+    monkeypatch.setattr(CacheManager, "_shared", manager)
+    yield WebSearchTool()
+    manager.close()
+
+def test_repeated_search_is_fetched_once_but_freshly_timestamped(tool, monkeypatch):
+    fetched = []
+    mock_search = tool._mock_search
+    monkeypatch.setattr(tool, "_mock_search", lambda query: fetched.append(query) or mock_search(query))
+    now = iter([100.0, 200.0, 300.0, 400.0])
+    monkeypatch.setattr(tool, "_get_timestamp", lambda: next(now))
+
+    first = tool.search("electric cars")
+    second = tool.search("electric cars")
+    assert fetched == ["electric cars"]
+    assert [r["title"] for r in second] == [r["title"] for r in first]
+    assert [r["metadata"]["timestamp"] for r in first] == [100.0, 200.0]
+    assert [r["metadata"]["timestamp"] for r in second] == [300.0, 400.0]
+
+def test_max_results_applies_to_cached_results(tool):
+    tool.search("electric cars")
+    tool.config = {**tool.config, "max_results": 1}
+    assert len(tool.search("electric cars")) == 1
@@ -0,0 +1,79 @@
+import time
+
+import pytest
+
+pytest.importorskip("langchain_nvidia_ai_endpoints")
+
+from src.agent.workflow import AgentWorkflow
+
+DELAY = 0.2
+
+class FakeEmbeddings:
+    def get_embeddings(self, text):
+        return [1.0, 0.0, 0.0]
+
+    def classify_sentiment(self, embedding):
+        return {"sentiment": "positive", "confidence": 0.9}
+
+class AmbiguousIntents:
+    """Never confident, so every input pays for the LLM fallback"""
+    def classify(self, embedding):
+        return "web_search", 0.0
+
+    def match_intent_text(self, text):
+        return "web_search"
+
+class SlowLLM:
+    def __init__(self):
+        self.states = []
+
+    def generate(self, state):
+        time.sleep(DELAY)
+        self.states.append(state)
+        return {"response": "web_search"}
+
+class SlowMemory:
+    def recall(self, user_id, query, embedding=None):
+        time.sleep(DELAY)
+        return [{"input": "I drive an EV", "response": "Noted."}]
+
+class FakeSearch:
+    def search(self, query):
+        return {"results": [query]}
+
+class FakeTools:
+    def get(self, name):
+        return FakeSearch()
+
+@pytest.fixture
+def workflow():
+    workflow = AgentWorkflow.__new__(AgentWorkflow)
+    workflow.embedding_model = FakeEmbeddings()
+    workflow.intent_classifier = AmbiguousIntents()
+    workflow.llm_model = SlowLLM()
+    workflow.long_term_memory = SlowMemory()
+    workflow.tools = FakeTools()
+    workflow.executor = workflow.build_executor()
+    return workflow
+
+def test_recall_and_sentiment_run_alongside_intent(workflow):
+    state = workflow.run("reviews of electric cars", user_id="alice")
+    timings = state["timings"]
+    nodes = timings["nodes"]
+
+    # Recall starts before the intent's LLM round trip is over
+    assert nodes["recall_memory"]["start"] < nodes["classify_intent"]["end"]
+    assert nodes["classify_sentiment"]["start"] < nodes["classify_intent"]["end"]
+    assert timings["critical_path"] == [
+        "embed_input", "classify_intent", "route_to_tool", "execute_tool", "generate_response"
+    ]
+    assert timings["critical_path_time"] < timings["sequential_time"] - DELAY / 2
+    assert timings["wall_time"] < timings["sequential_time"] - DELAY / 2
+
+    assert state["analysis"]["sentiment"]["sentiment"] == "positive"
+    assert workflow.llm_model.states[-1]["recalled"] == [{"input": "I drive an EV", "response": "Noted."}]
+
+def test_no_recall_without_a_user(workflow):
+    state = workflow.run("reviews of electric cars")
+    assert state["recalled"] == []
+    assert state["timings"]["nodes"]["recall_memory"]["duration"] < DELAY